@@ -0,0 +1,80 @@
+import time
+from typing import Any, Callable, Tuple
+
+from django.core.cache import cache
+
+
+class SingleFlightCache:
+    """
+    Cache com TTL curto e recomputação única ("single-flight").
+
+    Quando o valor vence, apenas o processo que obtém a trava o recalcula;
+    os demais continuam recebendo o valor anterior até a nova versão ser
+    gravada, evitando que uma rajada de requisições dispare várias
+    recomputações. A trava usa `cache.add`, atômico nos backends do
+    Django, e por isso vale entre workers com um cache compartilhado.
+    """
+
+    LOCK_TIMEOUT = 30
+    WAIT_TIMEOUT = 5
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, key: str, ttl: int, retention: int = None):
+        """
+        Args:
+            key: Chave do valor no cache.
+            ttl: Segundos até o valor precisar ser recalculado.
+            retention: Segundos em que um valor vencido ainda pode ser servido
+                enquanto outro processo o recalcula (padrão: 10 vezes o TTL).
+        """
+        self.key = key
+        self.ttl = ttl
+        self.retention = retention if retention is not None else ttl * 10
+        self.lock_key = f'{key}:lock'
+
+    def get(self, compute: Callable[[], Any]) -> Tuple[Any, float]:
+        """
+        Retorna o valor em cache, recalculando-o se necessário.
+
+        Args:
+            compute: Função que calcula o valor.
+
+        Returns:
+            tuple: Valor e instante (epoch) em que foi calculado.
+        """
+        entry = cache.get(self.key)
+        if entry is not None and time.time() - entry['computed_at'] < self.ttl:
+            return entry['value'], entry['computed_at']
+
+        if cache.add(self.lock_key, 1, timeout=self.LOCK_TIMEOUT):
+            try:
+                return self._refresh(compute)
+            finally:
+                cache.delete(self.lock_key)
+
+        # Outro processo está recalculando: serve o valor vencido, se houver
+        if entry is not None:
+            return entry['value'], entry['computed_at']
+
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            entry = cache.get(self.key)
+            if entry is not None:
+                return entry['value'], entry['computed_at']
+
+        return self._refresh(compute)
+
+    def _refresh(self, compute: Callable[[], Any]) -> Tuple[Any, float]:
+        value = compute()
+        computed_at = time.time()
+        cache.set(
+            self.key,
+            {'value': value, 'computed_at': computed_at},
+            timeout=self.ttl + self.retention
+        )
+        return value, computed_at
+
+    def invalidate(self):
+        """Descarta o valor em cache"""
+        cache.delete(self.key)
@@ -0,0 +1,153 @@
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.cache_utils import SingleFlightCache
+from partner_stores.models import PartnerStore
+from subscription_plans.models import Subscription, SubscriptionRevenueDelta
+from supplements.models import Supplement
+
+
+class AdminDashboardService:
+    """
+    Classe de serviço do resumo do painel administrativo.
+
+    Cada bloco do resumo é calculado por uma única consulta agrupada,
+    e o resultado é mantido em cache com TTL curto.
+    """
+
+    CACHE_KEY = 'core:admin_dashboard'
+
+    _cache = SingleFlightCache(
+        CACHE_KEY,
+        ttl=getattr(settings, 'ADMIN_DASHBOARD_CACHE_TTL', 60)
+    )
+
+    @staticmethod
+    def get_subscriptions_block():
+        """Assinaturas por status e plano"""
+        rows = (
+            Subscription.objects.values('status', 'plan_id', 'plan__name')
+            .annotate(count=Count('id'))
+            .order_by('status', 'plan_id')
+        )
+
+        by_status = {}
+        by_plan = {}
+        for row in rows:
+            by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+            plan = by_plan.setdefault(row['plan_id'], {
+                'plan': row['plan_id'],
+                'plan_name': row['plan__name'],
+                'total': 0,
+                'by_status': {},
+            })
+            plan['total'] += row['count']
+            plan['by_status'][row['status']] = row['count']
+
+        return {
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'by_plan': list(by_plan.values()),
+        }
+
+    @staticmethod
+    def get_revenue_block():
+        """Receita e novas assinaturas do mês corrente"""
+        month_start = timezone.localdate().replace(day=1)
+        totals = SubscriptionRevenueDelta.objects.filter(date__gte=month_start).aggregate(
+            gross_revenue=Sum('gross_revenue'),
+            new_subscriptions=Sum('new_subscriptions'),
+            renewed_subscriptions=Sum('renewed_subscriptions'),
+        )
+        return {
+            'month': month_start.strftime('%Y-%m'),
+            'gross_revenue': str(totals['gross_revenue'] or 0),
+            'new_subscriptions': totals['new_subscriptions'] or 0,
+            'renewed_subscriptions': totals['renewed_subscriptions'] or 0,
+        }
+
+    @staticmethod
+    def get_stores_block():
+        """Lojas parceiras por status e tipo"""
+        rows = PartnerStore.objects.values('status', 'store_type').annotate(
+            count=Count('id')
+        ).order_by('status', 'store_type')
+
+        by_status = {}
+        by_type = {}
+        for row in rows:
+            by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+            by_type[row['store_type']] = by_type.get(row['store_type'], 0) + row['count']
+
+        return {
+            'total': sum(by_status.values()),
+            'by_status': by_status,
+            'by_type': by_type,
+        }
+
+    @staticmethod
+    def get_supplements_block():
+        """Suplementos por disponibilidade"""
+        counts = dict(
+            Supplement.objects.values('available').annotate(count=Count('id'))
+            .order_by().values_list('available', 'count')
+        )
+        return {
+            'total': sum(counts.values()),
+            'available': counts.get(True, 0),
+            'unavailable': counts.get(False, 0),
+        }
+
+    @staticmethod
+    def compute():
+        """
+        Calcula todos os blocos do resumo.
+
+        Returns:
+            dict: Resumo do painel.
+        """
+        return {
+            'subscriptions': AdminDashboardService.get_subscriptions_block(),
+            'revenue': AdminDashboardService.get_revenue_block(),
+            'stores': AdminDashboardService.get_stores_block(),
+            'supplements': AdminDashboardService.get_supplements_block(),
+        }
+
+    @staticmethod
+    def get_summary():
+        """
+        Retorna o resumo em cache e há quanto tempo foi calculado.
+
+        Returns:
+            tuple: Resumo, instante do cálculo e idade em segundos.
+        """
+        summary, computed_at = AdminDashboardService._cache.get(AdminDashboardService.compute)
+        return summary, computed_at, max(time.time() - computed_at, 0)
+
+
+class AdminDashboardView(APIView):
+    """
+    Resumo do painel administrativo.
+
+    A resposta informa quando os valores foram calculados e sua idade
+    em segundos (também no cabeçalho `Age`).
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        summary, computed_at, age = AdminDashboardService.get_summary()
+        response = Response({
+            **summary,
+            'computed_at': datetime.fromtimestamp(computed_at, tz=timezone.get_current_timezone()),
+            'age_seconds': round(age, 3),
+        })
+        response['Age'] = str(int(age))
+        return response
@@ -0,0 +1,215 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Codifica a posição de um cursor em base64 url-safe"""
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(encoded: str) -> Dict[str, Any]:
+    """Decodifica um cursor gerado por `encode_cursor`"""
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (TypeError, ValueError, UnicodeEncodeError, binascii.Error):
+        raise NotFound('Cursor inválido')
+
+    if not isinstance(payload, dict):
+        raise NotFound('Cursor inválido')
+    return payload
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """
+    Estima o total de linhas de um queryset pelas estatísticas do planner.
+
+    Sem filtros usa `pg_class.reltuples`; com filtros usa a estimativa de
+    linhas do EXPLAIN. Retorna None fora do PostgreSQL.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            # reltuples é -1 enquanto a tabela nunca foi analisada
+            if row and row[0] >= 0:
+                return int(row[0])
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) na ordenação `-<ordering_field>, id`.
+
+    Cada página filtra a partir da última posição vista em vez de usar
+    OFFSET, e o COUNT(*) exato é substituído por uma estimativa opcional
+    (`?count=estimate`), mantendo o custo constante em páginas profundas.
+    """
+    ordering_field = 'created_at'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'KEYSET_PAGINATION_MAX_PAGE_SIZE', 500)
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_position(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        payload = decode_cursor(encoded)
+        value = parse_datetime(str(payload.get('v', '')))
+        if value is None or not isinstance(payload.get('id'), int):
+            raise NotFound('Cursor inválido')
+        return value, payload['id'], bool(payload.get('r'))
+
+    def encode_position(self, instance, reverse: bool) -> str:
+        payload = {
+            'v': getattr(instance, self.ordering_field).isoformat(),
+            'id': instance.pk,
+        }
+        if reverse:
+            payload['r'] = 1
+        return encode_cursor(payload)
+
+    def filter_page(self, queryset, position):
+        """
+        Aplica a ordenação e o filtro de posição ao queryset.
+
+        Para voltar uma página a ordenação é invertida e o resultado
+        é reordenado em memória.
+        """
+        field = self.ordering_field
+        if position is None:
+            return queryset.order_by(f'-{field}', 'id'), False
+
+        value, last_id, reverse = position
+        if reverse:
+            return queryset.filter(
+                Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__lt': last_id})
+            ).order_by(field, '-id'), True
+
+        return queryset.filter(
+            Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__gt': last_id})
+        ).order_by(f'-{field}', 'id'), False
+
+    def paginate_queryset(self, queryset, request, view=None) -> Optional[List[Any]]:
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None) -> Optional[List[Any]]:
+        """
+        Pagina a união ordenada de querysets com os mesmos campos de ordenação.
+
+        Cada queryset contribui com no máximo uma página a partir da posição
+        do cursor e as páginas são intercaladas em memória, sem UNION no banco.
+        Os IDs devem ser únicos entre os querysets.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_position(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'estimate':
+            estimates = [estimate_count(queryset) for queryset in querysets]
+            if None not in estimates:
+                self.count = sum(estimates)
+
+        results = []
+        reverse = False
+        for queryset in querysets:
+            page_queryset, reverse = self.filter_page(queryset, position)
+            results.extend(page_queryset[:self.page_size + 1])
+
+        # Ordenações estáveis: primeiro pelo desempate, depois pelo campo principal
+        results.sort(key=lambda instance: instance.pk, reverse=reverse)
+        results.sort(key=lambda instance: getattr(instance, self.ordering_field), reverse=not reverse)
+
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return results
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_position(self.page[-1], reverse=False)
+        )
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_position(self.page[0], reverse=True)
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        response_data = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.count is not None:
+            response_data['estimated_count'] = self.count
+        response_data['results'] = data
+        return Response(response_data)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'estimated_count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
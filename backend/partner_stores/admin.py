@@ -14,6 +14,9 @@ class PartnerStoreAdmin(admin.ModelAdmin):
         ('Contato', {
             'fields': ['address', 'phone', 'email']
         }),
+        ('Localização', {
+            'fields': ['latitude', 'longitude']
+        }),
         ('Detalhes', {
             'fields': ['description', 'created_at', 'updated_at']
         }),
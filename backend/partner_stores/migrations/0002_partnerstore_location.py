@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("partner_stores", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="partnerstore",
+            name="latitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                max_digits=9,
+                null=True,
+                verbose_name="Latitude",
+            ),
+        ),
+        migrations.AddField(
+            model_name="partnerstore",
+            name="longitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                max_digits=9,
+                null=True,
+                verbose_name="Longitude",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="partnerstore",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="partner_store_location_idx"
+            ),
+        ),
+    ]
@@ -83,11 +83,28 @@ class PartnerStore(models.Model):
         default=False,
         verbose_name='Suporte Prioritário'
     )
+    latitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name='Latitude'
+    )
+    longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name='Longitude'
+    )
 
     class Meta:
         verbose_name = 'Loja Parceira'
         verbose_name_plural = 'Lojas Parceiras'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='partner_store_location_idx'),
+        ]
 
     def __str__(self):
         return self.name 
\ No newline at end of file
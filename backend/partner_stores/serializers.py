@@ -14,6 +14,8 @@ class PartnerStoreSerializer(serializers.ModelSerializer):
             'email',
             'status',
             'description',
+            'latitude',
+            'longitude',
             'created_at',
             'updated_at'
         ]
@@ -1,10 +1,13 @@
 from typing import Dict, Any, List, Optional
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
 from ..models import PartnerStore
 from users.models import User
 from decimal import Decimal
 from .store_factory import StoreCreator
 from .commission_strategy import CommissionContext
+from subscription_plans.models import SupplementRedemption
 
 
 class PartnerStoreService:
@@ -76,4 +79,81 @@ class PartnerStoreService:
             store = PartnerStore.objects.get(id=store_id)
             return CommissionContext.calculate_commission(store, sale_amount)
         except PartnerStore.DoesNotExist:
-            return None 
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def dashboard_cache_key(owner_id: int) -> str:
+        """
+        Chave do painel do proprietário no cache.
+        """
+        return f'partner_stores:owner_dashboard:{owner_id}'
+
+    @staticmethod
+    def invalidate_owner_dashboard(owner_id: int) -> None:
+        """
+        Descarta o painel em cache do proprietário.
+        """
+        cache.delete(PartnerStoreService.dashboard_cache_key(owner_id))
+
+    @staticmethod
+    def invalidate_store_dashboards(store_ids) -> None:
+        """
+        Descarta os painéis em cache dos proprietários das lojas informadas.
+        """
+        owner_ids = PartnerStore.objects.filter(id__in=store_ids).values_list(
+            'owner_id', flat=True
+        ).distinct()
+        cache.delete_many([PartnerStoreService.dashboard_cache_key(owner_id) for owner_id in owner_ids])
+
+    @staticmethod
+    def get_owner_dashboard(owner_id: int) -> Dict[str, Any]:
+        """
+        Reúne as lojas do proprietário, a contagem por status e as
+        comissões do mês com duas consultas, independentemente do
+        número de lojas: uma para as lojas e outra para os resgates
+        agrupados por loja. A comissão de cada loja é calculada pela
+        sua estratégia sobre o total de resgates do mês.
+        """
+        stores = list(PartnerStoreService.get_stores_by_owner(owner_id))
+        month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        sales = {
+            row['store_id']: row
+            for row in SupplementRedemption.objects.filter(
+                store_id__in=[store.id for store in stores],
+                redeemed_at__gte=month_start
+            ).values('store_id').annotate(
+                redemptions=Count('id'),
+                sales_amount=Sum('supplement__price')
+            ).order_by()
+        }
+
+        status_counts = {key: 0 for key in dict(PartnerStore.STORE_STATUS_CHOICES)}
+        commissions = []
+        total_sales = Decimal('0')
+        total_commission = Decimal('0')
+        for store in stores:
+            status_counts[store.status] = status_counts.get(store.status, 0) + 1
+
+            row = sales.get(store.id, {})
+            sales_amount = row.get('sales_amount') or Decimal('0')
+            commission = CommissionContext.calculate_commission(store, sales_amount)
+            total_sales += sales_amount
+            total_commission += commission
+            commissions.append({
+                'store': store.id,
+                'redemptions': row.get('redemptions', 0),
+                'sales_amount': sales_amount,
+                'commission': commission,
+            })
+
+        return {
+            'stores': stores,
+            'status_counts': status_counts,
+            'commissions': {
+                'month': month_start.strftime('%Y-%m'),
+                'total_sales': total_sales,
+                'total_commission': total_commission,
+                'by_store': commissions,
+            },
+        }
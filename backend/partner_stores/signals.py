@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .models import PartnerStore
+from .services.store_service import PartnerStoreService
 
 
 @receiver(post_save, sender=PartnerStore)
@@ -16,4 +18,34 @@ def handle_store_status_change(sender, instance, created, **kwargs):
     
     if not created and instance.status == 'suspended':
         # Ações quando uma loja é suspensa
-        pass 
\ No newline at end of file
+        pass
+
+
+@receiver(pre_save, sender=PartnerStore)
+def track_previous_owner(sender, instance, **kwargs):
+    """
+    Guarda o proprietário anterior, para descartar também o painel dele
+    quando a loja muda de dono.
+    """
+    if instance.pk is None:
+        instance._previous_owner_id = None
+        return
+    instance._previous_owner_id = PartnerStore.objects.filter(pk=instance.pk).values_list(
+        'owner_id', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=PartnerStore)
+@receiver(post_delete, sender=PartnerStore)
+def invalidate_owner_dashboard(sender, instance, **kwargs):
+    """
+    Descarta o painel em cache do proprietário (e do anterior, se a loja
+    mudou de dono) quando uma de suas lojas muda.
+    """
+    owner_ids = {instance.owner_id, getattr(instance, '_previous_owner_id', None)} - {None}
+
+    def invalidate():
+        for owner_id in owner_ids:
+            PartnerStoreService.invalidate_owner_dashboard(owner_id)
+
+    transaction.on_commit(invalidate)
@@ -0,0 +1,25 @@
+from django.test import TestCase
+
+from users.models import User
+from ..models import PartnerStore
+
+
+class PartnerStoreAdminTests(TestCase):
+    """Testes para o cadastro de lojas parceiras no admin."""
+    
+    def test_change_form_includes_location(self):
+        """Teste dos campos de localização no formulário da loja."""
+        admin = User.objects.create(
+            username='admin', email='admin@example.com', is_staff=True, is_superuser=True
+        )
+        store = PartnerStore.objects.create(
+            name='Loja Paulista', cnpj='11.111.111/0001-11', owner=admin, address='São Paulo',
+            phone='11999999999', email='loja@example.com', latitude='-23.561414', longitude='-46.655881'
+        )
+        self.client.force_login(admin)
+        
+        response = self.client.get(f'/admin/partner_stores/partnerstore/{store.pk}/change/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'name="latitude"')
+        self.assertContains(response, 'name="longitude"')
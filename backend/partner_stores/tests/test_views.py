@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from subscription_plans.factories import BasicPlanFactory
+from subscription_plans.models import Subscription, SupplementRedemption
+from subscription_plans.services import RedemptionLedgerWriter
+from supplements.models import Supplement, SupplementCategory
+from users.models import User
+from ..models import PartnerStore
+
+
+class OwnerDashboardTests(TestCase):
+    """Testes para o painel do proprietário de lojas parceiras."""
+    
+    url = '/api/v1/partner-stores/stores/dashboard/'
+    
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username='lojista', email='lojista@example.com')
+        self.store = PartnerStore.objects.create(
+            name='Loja Centro', cnpj='12345678000199', owner=self.owner,
+            address='Rua A, 1', phone='11999999999', email='loja@example.com',
+            status='approved'
+        )
+        PartnerStore.objects.create(
+            name='Loja Outra', cnpj='98765432000199',
+            owner=User.objects.create(username='outro', email='outro@example.com'),
+            address='Rua B, 2', phone='11888888888', email='outra@example.com'
+        )
+        
+        plan = BasicPlanFactory()
+        subscription = Subscription.objects.create(
+            user=User.objects.create(username='cliente', email='cliente@example.com'),
+            plan=plan,
+            status=Subscription.ACTIVE,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            remaining_supplements=3,
+            price_paid=plan.price
+        )
+        supplement = Supplement.objects.create(
+            name='Whey', description='Whey protein', brand='Marca', price='100.00',
+            category=SupplementCategory.objects.create(name='Proteína')
+        )
+        self.subscription, self.supplement = subscription, supplement
+        SupplementRedemption.objects.create(
+            subscription=subscription, supplement=supplement, store=self.store,
+            redeemed_at=timezone.now()
+        )
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+    
+    def test_dashboard_returns_owner_stores_and_commissions(self):
+        """Teste do painel com apenas as lojas do proprietário."""
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([store['id'] for store in data['stores']], [self.store.pk])
+        self.assertEqual(data['status_counts']['approved'], 1)
+        by_store = data['commissions']['by_store']
+        self.assertEqual(by_store[0]['redemptions'], 1)
+        self.assertEqual(Decimal(by_store[0]['sales_amount']), Decimal('100.00'))
+    
+    def test_saving_a_store_invalidates_dashboard(self):
+        """Teste do descarte do painel em cache ao salvar uma loja."""
+        self.client.get(self.url)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.status = 'suspended'
+            self.store.save()
+        
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['status_counts']['suspended'], 1)
+        self.assertEqual(data['status_counts']['approved'], 0)
+    
+    def test_changing_owner_invalidates_previous_owner_dashboard(self):
+        """Teste do descarte do painel do proprietário anterior ao trocar o dono da loja."""
+        self.client.get(self.url)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.owner = User.objects.create(username='novo', email='novo@example.com')
+            self.store.save()
+        
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['stores'], [])
+    
+    def test_flushing_redemptions_invalidates_dashboard(self):
+        """Teste do descarte do painel quando novos resgates da loja são gravados."""
+        self.client.get(self.url)
+        
+        writer = RedemptionLedgerWriter.get_instance()
+        writer.flush()
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.record(self.subscription.pk, self.supplement.pk, self.store.pk)
+        self.assertEqual(writer.flush(), 1)
+        
+        by_store = self.client.get(self.url).json()['commissions']['by_store']
+        self.assertEqual(by_store[0]['redemptions'], 2)
+    
+    def test_owner_cannot_change_store_status(self):
+        """Teste da mudança de status restrita a administradores."""
+        url = f'/api/v1/partner-stores/stores/{self.store.pk}/change_status/'
+        response = self.client.post(url, {'status': 'suspended'}, format='json')
+        
+        self.assertEqual(response.status_code, 403)
+        self.store.refresh_from_db()
+        self.assertEqual(self.store.status, 'approved')
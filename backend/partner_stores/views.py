@@ -1,14 +1,22 @@
+import json
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from .models import PartnerStore
 from .serializers import PartnerStoreSerializer
 from .services.store_service import PartnerStoreService
 from django.http import JsonResponse
 from rest_framework.views import APIView
 from decimal import Decimal
+from django.conf import settings
+from core.cache_utils import SingleFlightCache
 from core.db_connection import DatabaseConnection
 
+def can_access_store(user, store_id):
+    """Administradores acessam qualquer loja; proprietários, apenas as suas"""
+    return user.is_staff or PartnerStore.objects.filter(pk=store_id, owner=user).exists()
+
 class PartnerStoreViewSet(viewsets.ModelViewSet):
     queryset = PartnerStore.objects.all()
     serializer_class = PartnerStoreSerializer
@@ -20,6 +28,12 @@ class PartnerStoreViewSet(viewsets.ModelViewSet):
         store = PartnerStoreService.create_store(data, self.request.user)
         return store
 
+    def get_permissions(self):
+        # Aprovar, rejeitar ou suspender lojas é uma ação administrativa
+        if self.action == 'change_status':
+            return [permissions.IsAdminUser()]
+        return super().get_permissions()
+
     def get_queryset(self):
         user = self.request.user
         if user.is_staff:
@@ -27,7 +41,7 @@ class PartnerStoreViewSet(viewsets.ModelViewSet):
         return PartnerStoreService.get_stores_by_owner(user.id)
 
     @action(detail=True, methods=['post'])
-    def change_status(self, request, pk=None):
+    def change_status(self, request, pk=None, *args, **kwargs):
         new_status = request.data.get('status')
         
         if new_status not in dict(PartnerStore.STORE_STATUS_CHOICES):
@@ -42,7 +56,30 @@ class PartnerStoreViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
-    def search(self, request):
+    def dashboard(self, request, *args, **kwargs):
+        """
+        Painel do proprietário: lojas, contagem por status e comissões do mês.
+        
+        A resposta fica em cache por proprietário e é descartada quando
+        uma de suas lojas é salva, muda de dono ou recebe novos resgates.
+        """
+        owner_id = request.user.id
+        dashboard_cache = SingleFlightCache(
+            PartnerStoreService.dashboard_cache_key(owner_id),
+            ttl=getattr(settings, 'OWNER_DASHBOARD_CACHE_TTL', 300)
+        )
+
+        def build():
+            dashboard = PartnerStoreService.get_owner_dashboard(owner_id)
+            dashboard['stores'] = self.get_serializer(dashboard['stores'], many=True).data
+            # Dados JSON puros, para poderem ser guardados em qualquer backend de cache
+            return json.loads(JSONRenderer().render(dashboard))
+
+        data, _ = dashboard_cache.get(build)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request, *args, **kwargs):
         query = request.query_params.get('q', '')
         if not query:
             return Response({'error': 'Parâmetro de pesquisa vazio'}, status=status.HTTP_400_BAD_REQUEST)
@@ -54,7 +91,7 @@ class PartnerStoreViewSet(viewsets.ModelViewSet):
 class PartnerStoreView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
-    def post(self, request):
+    def post(self, request, *args, **kwargs):
         """Cria uma nova loja parceira usando o Factory Method"""
         serializer = PartnerStoreSerializer(data=request.data)
         if serializer.is_valid():
@@ -68,9 +105,14 @@ class PartnerStoreView(APIView):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    def get(self, request, store_id=None):
+    def get(self, request, store_id=None, *args, **kwargs):
         """Lista lojas ou retorna detalhes de uma loja específica"""
         if store_id:
+            if not can_access_store(request.user, store_id):
+                return Response(
+                    {"error": "Loja não encontrada"}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
             # Usando o Singleton para estatísticas de DB
             db = DatabaseConnection.get_instance()
             store_data = db.execute_raw_sql(
@@ -92,8 +134,14 @@ class PartnerStoreView(APIView):
 class StoreCommissionView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
-    def post(self, request, store_id):
+    def post(self, request, store_id, *args, **kwargs):
         """Calcula comissão usando o padrão Strategy"""
+        if not can_access_store(request.user, store_id):
+            return Response(
+                {"error": "Loja não encontrada"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
         try:
             # Validação básica
             if 'amount' not in request.data:
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SubscriptionPlansConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'subscription_plans'
+    verbose_name = 'Planos de Assinatura'
+
+    def ready(self):
+        import subscription_plans.signals  # noqa
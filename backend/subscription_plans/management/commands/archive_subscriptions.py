@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from subscription_plans.services import SubscriptionArchiveService
+
+
+class Command(BaseCommand):
+    help = 'Move assinaturas canceladas ou expiradas há mais de N dias para o arquivo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=90,
+            help='Idade mínima, em dias, do término da assinatura (padrão: 90).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Quantidade de assinaturas arquivadas por transação (padrão: 1000).'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Intervalo, em segundos, entre os lotes (padrão: 0).'
+        )
+
+    def handle(self, *args, **options):
+        total = SubscriptionArchiveService.archive_closed_subscriptions(
+            older_than_days=options['older_than_days'],
+            batch_size=options['batch_size'],
+            pause=options['pause']
+        )
+        self.stdout.write(self.style.SUCCESS(f'{total} assinaturas arquivadas.'))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from subscription_plans.services import SubscriptionAnalyticsService
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstrói as métricas de receita a partir do histórico de assinaturas, '
+        'lendo-o em blocos. Com --snapshots-only apenas materializa os dias pendentes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Quantidade de assinaturas lidas por bloco (padrão: 2000).'
+        )
+        parser.add_argument(
+            '--snapshots-only',
+            action='store_true',
+            help='Apenas materializa as fotografias diárias a partir das variações.'
+        )
+
+    def handle(self, *args, **options):
+        if options['snapshots_only']:
+            created = SubscriptionAnalyticsService.materialize_snapshots()
+            self.stdout.write(self.style.SUCCESS(f'{created} fotografias diárias criadas.'))
+            return
+
+        processed, deltas = SubscriptionAnalyticsService.rebuild_from_history(
+            chunk_size=options['chunk_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{processed} assinaturas processadas, {deltas} variações diárias gravadas.'
+        ))
@@ -0,0 +1,59 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from subscription_plans.services import SubscriptionExportService
+
+
+class Command(BaseCommand):
+    help = 'Exporta todas as assinaturas, com usuário e plano, em CSV, NDJSON ou Parquet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=SubscriptionExportService.FORMATS,
+            default=SubscriptionExportService.CSV,
+            help='Formato da exportação (padrão: csv).'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compacta a saída com gzip.'
+        )
+        parser.add_argument(
+            '--include-archived',
+            action='store_true',
+            help='Inclui as assinaturas arquivadas.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Quantidade de linhas lidas por vez (padrão: 2000).'
+        )
+        parser.add_argument(
+            '--output',
+            help='Arquivo de saída (padrão: saída padrão).'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            stream = SubscriptionExportService.stream(
+                export_format=options['export_format'],
+                compress=options['gzip'],
+                include_archived=options['include_archived'],
+                chunk_size=options['chunk_size']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for piece in stream:
+                    output.write(piece)
+            self.stderr.write(self.style.SUCCESS(f"Exportação gravada em {options['output']}."))
+        else:
+            for piece in stream:
+                sys.stdout.buffer.write(piece)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from subscription_plans.models import SubscriptionPlan
+from subscription_plans.services import PlanMigrationService
+
+
+class Command(BaseCommand):
+    help = (
+        'Migra os assinantes ativos e pendentes de um plano para outro, em lotes. '
+        'Uma migração interrompida é retomada ao executar o comando novamente.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('from_plan', type=int, help='ID do plano de origem.')
+        parser.add_argument('to_plan', type=int, help='ID do plano de destino.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Quantidade de assinaturas migradas por transação (padrão: 1000).'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Intervalo, em segundos, entre os lotes (padrão: 0).'
+        )
+        parser.add_argument(
+            '--deactivate-source',
+            action='store_true',
+            help='Desativa o plano de origem ao final da migração.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from_plan = SubscriptionPlan.objects.get(pk=options['from_plan'])
+            to_plan = SubscriptionPlan.objects.get(pk=options['to_plan'])
+        except SubscriptionPlan.DoesNotExist:
+            raise CommandError('Plano de assinatura não encontrado.')
+
+        try:
+            job = PlanMigrationService.migrate_subscribers(
+                from_plan,
+                to_plan,
+                batch_size=options['batch_size'],
+                pause=options['pause'],
+                deactivate_source=options['deactivate_source'],
+                stdout=self.stdout
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f'{job.migrated_count} assinaturas migradas.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from subscription_plans.services import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = 'Remove as chaves de idempotência expiradas.'
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} chaves de idempotência removidas.'))
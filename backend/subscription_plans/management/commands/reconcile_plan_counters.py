@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from subscription_plans.services import PlanCounterService
+
+
+class Command(BaseCommand):
+    help = 'Corrige os contadores de assinantes ativos por plano a partir da contagem real.'
+
+    def handle(self, *args, **options):
+        corrected = PlanCounterService.reconcile()
+        self.stdout.write(self.style.SUCCESS(f'{corrected} planos corrigidos.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from subscription_plans.services import RedemptionLedgerWriter, RedemptionRollupService
+
+
+class Command(BaseCommand):
+    help = (
+        'Consolida por hora e por dia os resgates de suplementos. '
+        'Apenas os períodos fechados desde a última execução são processados.'
+    )
+
+    def handle(self, *args, **options):
+        RedemptionLedgerWriter.get_instance().flush()
+        hourly, daily = RedemptionRollupService.rollup()
+        self.stdout.write(self.style.SUCCESS(
+            f'{hourly} consolidações horárias e {daily} diárias gravadas.'
+        ))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from subscription_plans.services import SubscriptionSchedulerService
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa o agendador de avisos, renovações e expirações de assinaturas. '
+        'Dorme até o próximo balde diário vencer, sem depender de fila externa.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Quantidade máxima de eventos despachados por lote (padrão: 500).'
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=300,
+            help='Tempo máximo de espera entre verificações, em segundos (padrão: 300).'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Despacha os eventos vencidos e encerra (útil em cron).'
+        )
+        parser.add_argument(
+            '--schedule-existing',
+            action='store_true',
+            help='Agenda os eventos de todas as assinaturas ativas antes de iniciar.'
+        )
+
+    def handle(self, *args, **options):
+        if options['schedule_existing']:
+            total = SubscriptionSchedulerService.schedule_existing()
+            self.stdout.write(self.style.SUCCESS(f'{total} assinaturas agendadas.'))
+
+        SubscriptionSchedulerService.run_forever(
+            batch_size=options['batch_size'],
+            max_sleep=options['max_sleep'],
+            once=options['once'],
+            stdout=self.stdout
+        )
@@ -1,2 +1,9 @@
 from .subscription_plan import SubscriptionPlan
-from .subscription import Subscription 
\ No newline at end of file
+from .subscription import Subscription
+from .subscription_archive import SubscriptionArchive
+from .subscription_revenue import SubscriptionRevenueDelta, SubscriptionRevenueSnapshot
+from .scheduled_event import ScheduledSubscriptionEvent
+from .idempotency_key import IdempotencyKey
+from .plan_migration_job import PlanMigrationJob
+from .subscription_plan_counter import SubscriptionPlanCounter
+from .supplement_redemption import SupplementRedemption, SupplementUsageRollup, RedemptionRollupWatermark
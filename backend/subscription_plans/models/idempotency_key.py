@@ -0,0 +1,83 @@
+from django.db import models
+from django.conf import settings
+
+
+class IdempotencyKey(models.Model):
+    """
+    Registro de uma requisição identificada pelo cabeçalho Idempotency-Key.
+    
+    Guarda a resposta da primeira execução para que novas tentativas com a
+    mesma chave sejam respondidas sem executar a regra de negócio de novo.
+    """
+    
+    IN_PROGRESS = 'in_progress'
+    COMPLETED = 'completed'
+    
+    STATUS_CHOICES = [
+        (IN_PROGRESS, 'Em Andamento'),
+        (COMPLETED, 'Concluída'),
+    ]
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys',
+        verbose_name='Usuário'
+    )
+    
+    scope = models.CharField(
+        max_length=100,
+        verbose_name='Escopo'
+    )
+    
+    key = models.CharField(
+        max_length=255,
+        verbose_name='Chave'
+    )
+    
+    request_hash = models.CharField(
+        max_length=64,
+        verbose_name='Hash da Requisição'
+    )
+    
+    status = models.CharField(
+        max_length=11,
+        choices=STATUS_CHOICES,
+        default=IN_PROGRESS,
+        verbose_name='Status'
+    )
+    
+    response_status = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Status da Resposta'
+    )
+    
+    response_body = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='Corpo da Resposta'
+    )
+    
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Criado em'
+    )
+    
+    expires_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Expira em'
+    )
+    
+    def __str__(self):
+        return f"{self.scope} - {self.key} ({self.get_status_display()})"
+    
+    class Meta:
+        verbose_name = 'Chave de Idempotência'
+        verbose_name_plural = 'Chaves de Idempotência'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'scope', 'key'],
+                name='unique_idempotency_key_per_user_scope'
+            ),
+        ]
@@ -0,0 +1,81 @@
+from django.db import models
+from django.db.models import Q
+
+
+class PlanMigrationJob(models.Model):
+    """
+    Progresso da migração dos assinantes de um plano para outro.
+    
+    Guarda o último ID processado, de modo que uma migração
+    interrompida seja retomada de onde parou.
+    """
+    
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    
+    STATUS_CHOICES = [
+        (RUNNING, 'Em Andamento'),
+        (COMPLETED, 'Concluída'),
+    ]
+    
+    from_plan = models.ForeignKey(
+        'subscription_plans.SubscriptionPlan',
+        on_delete=models.CASCADE,
+        related_name='migrations_out',
+        verbose_name='Plano de Origem'
+    )
+    
+    to_plan = models.ForeignKey(
+        'subscription_plans.SubscriptionPlan',
+        on_delete=models.PROTECT,
+        related_name='migrations_in',
+        verbose_name='Plano de Destino'
+    )
+    
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=RUNNING,
+        verbose_name='Status'
+    )
+    
+    last_subscription_id = models.BigIntegerField(
+        default=0,
+        verbose_name='Última Assinatura Migrada'
+    )
+    
+    migrated_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Assinaturas Migradas'
+    )
+    
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Criado em'
+    )
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Atualizado em'
+    )
+    
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Concluída em'
+    )
+    
+    def __str__(self):
+        return f"{self.from_plan_id} -> {self.to_plan_id} ({self.get_status_display()})"
+    
+    class Meta:
+        verbose_name = 'Migração de Plano'
+        verbose_name_plural = 'Migrações de Plano'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['from_plan', 'to_plan'],
+                condition=Q(status='running'),
+                name='unique_running_plan_migration'
+            ),
+        ]
@@ -0,0 +1,101 @@
+from django.db import models
+from django.db.models import Q
+
+
+class ScheduledSubscriptionEvent(models.Model):
+    """
+    Evento agendado para uma assinatura (aviso, renovação ou expiração).
+    
+    Os eventos são indexados pelo dia em que vencem, de modo que o
+    agendador consulte apenas os baldes vencidos em vez de varrer
+    todas as assinaturas.
+    """
+    
+    NOTIFY = 'notify'
+    RENEW = 'renew'
+    EXPIRE = 'expire'
+    
+    ACTION_CHOICES = [
+        (NOTIFY, 'Aviso de Vencimento'),
+        (RENEW, 'Renovação'),
+        (EXPIRE, 'Expiração'),
+    ]
+    
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    
+    STATUS_CHOICES = [
+        (PENDING, 'Pendente'),
+        (PROCESSING, 'Em Processamento'),
+        (DONE, 'Concluído'),
+        (FAILED, 'Falhou'),
+    ]
+    
+    subscription = models.ForeignKey(
+        'subscription_plans.Subscription',
+        on_delete=models.CASCADE,
+        related_name='scheduled_events',
+        verbose_name='Assinatura'
+    )
+    
+    action = models.CharField(
+        max_length=10,
+        choices=ACTION_CHOICES,
+        verbose_name='Ação'
+    )
+    
+    due_date = models.DateField(
+        verbose_name='Data de Execução'
+    )
+    
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Status'
+    )
+    
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Tentativas'
+    )
+    
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Reservado até'
+    )
+    
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Processado em'
+    )
+    
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Criado em'
+    )
+    
+    def __str__(self):
+        return f"{self.get_action_display()} - {self.subscription_id} ({self.due_date})"
+    
+    class Meta:
+        verbose_name = 'Evento Agendado de Assinatura'
+        verbose_name_plural = 'Eventos Agendados de Assinatura'
+        ordering = ['due_date', 'id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['subscription', 'action'],
+                name='unique_scheduled_event_per_action'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['due_date', 'id'],
+                condition=Q(status__in=['pending', 'processing']),
+                name='sched_event_open_due_idx'
+            ),
+        ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 
 
@@ -82,4 +83,15 @@ class Subscription(models.Model):
     class Meta:
         verbose_name = 'Assinatura'
         verbose_name_plural = 'Assinaturas'
-        ordering = ['-created_at'] 
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='subscription_created_id_idx'),
+        ]
+        constraints = [
+            # Cada usuário pode ter no máximo uma assinatura ativa
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=Q(status='active'),
+                name='unique_active_subscription_per_user'
+            ),
+        ] 
\ No newline at end of file
@@ -0,0 +1,84 @@
+from django.db import models
+from django.conf import settings
+
+from .subscription import Subscription
+
+
+class SubscriptionArchive(models.Model):
+    """
+    Assinatura encerrada (cancelada ou expirada) movida para o arquivo.
+    
+    Mantém os mesmos campos e o mesmo ID da assinatura original, para que
+    a tabela principal guarde apenas o histórico recente.
+    """
+    
+    id = models.BigIntegerField(
+        primary_key=True,
+        verbose_name='ID'
+    )
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_subscriptions',
+        verbose_name='Usuário'
+    )
+    
+    plan = models.ForeignKey(
+        'subscription_plans.SubscriptionPlan',
+        on_delete=models.PROTECT,
+        related_name='archived_subscriptions',
+        verbose_name='Plano'
+    )
+    
+    status = models.CharField(
+        max_length=10,
+        choices=Subscription.STATUS_CHOICES,
+        verbose_name='Status'
+    )
+    
+    start_date = models.DateField(
+        verbose_name='Data de Início'
+    )
+    
+    end_date = models.DateField(
+        verbose_name='Data de Término'
+    )
+    
+    remaining_supplements = models.PositiveIntegerField(
+        verbose_name='Suplementos Restantes'
+    )
+    
+    renewal_enabled = models.BooleanField(
+        verbose_name='Renovação Automática'
+    )
+    
+    price_paid = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name='Valor Pago (R$)'
+    )
+    
+    created_at = models.DateTimeField(
+        verbose_name='Criado em'
+    )
+    
+    updated_at = models.DateTimeField(
+        verbose_name='Atualizado em'
+    )
+    
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Arquivado em'
+    )
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.plan_id} ({self.get_status_display()})"
+    
+    class Meta:
+        verbose_name = 'Assinatura Arquivada'
+        verbose_name_plural = 'Assinaturas Arquivadas'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='sub_archive_created_id_idx'),
+        ]
@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class SubscriptionPlanCounter(models.Model):
+    """
+    Fração (shard) do contador de assinantes ativos de um plano.
+    
+    Cada transição de assinatura incrementa uma fração sorteada, para que
+    criações simultâneas no mesmo plano não disputem a mesma linha. O total
+    do plano é a soma de suas frações.
+    """
+    
+    plan = models.ForeignKey(
+        'subscription_plans.SubscriptionPlan',
+        on_delete=models.CASCADE,
+        related_name='counter_shards',
+        verbose_name='Plano'
+    )
+    
+    shard = models.PositiveSmallIntegerField(
+        verbose_name='Fração'
+    )
+    
+    active_subscribers = models.IntegerField(
+        default=0,
+        verbose_name='Assinantes Ativos'
+    )
+    
+    def __str__(self):
+        return f"{self.plan_id}/{self.shard}: {self.active_subscribers}"
+    
+    class Meta:
+        verbose_name = 'Contador de Assinantes do Plano'
+        verbose_name_plural = 'Contadores de Assinantes dos Planos'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['plan', 'shard'],
+                name='unique_plan_counter_shard'
+            ),
+        ]
@@ -0,0 +1,122 @@
+from django.db import models
+
+
+class SubscriptionRevenueDelta(models.Model):
+    """
+    Variação diária de assinaturas e receita por plano.
+    
+    Atualizada incrementalmente a cada evento do ciclo de vida da
+    assinatura (criação, renovação, cancelamento e expiração).
+    """
+    
+    date = models.DateField(
+        verbose_name='Data'
+    )
+    
+    plan = models.ForeignKey(
+        'subscription_plans.SubscriptionPlan',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='revenue_deltas',
+        verbose_name='Plano'
+    )
+    
+    new_subscriptions = models.IntegerField(
+        default=0,
+        verbose_name='Novas Assinaturas'
+    )
+    
+    renewed_subscriptions = models.IntegerField(
+        default=0,
+        verbose_name='Assinaturas Renovadas'
+    )
+    
+    cancelled_subscriptions = models.IntegerField(
+        default=0,
+        verbose_name='Assinaturas Canceladas'
+    )
+    
+    expired_subscriptions = models.IntegerField(
+        default=0,
+        verbose_name='Assinaturas Expiradas'
+    )
+    
+    active_delta = models.IntegerField(
+        default=0,
+        verbose_name='Variação de Assinaturas Ativas'
+    )
+    
+    mrr_delta = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='Variação do MRR (R$)'
+    )
+    
+    gross_revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='Receita Bruta (R$)'
+    )
+    
+    def __str__(self):
+        return f"{self.date} - {self.plan_id}"
+    
+    class Meta:
+        verbose_name = 'Variação Diária de Receita'
+        verbose_name_plural = 'Variações Diárias de Receita'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'plan'],
+                name='unique_revenue_delta_per_day_plan'
+            ),
+        ]
+
+
+class SubscriptionRevenueSnapshot(models.Model):
+    """
+    Fotografia diária das assinaturas ativas e do MRR por plano.
+    
+    Cada dia materializado contém uma linha por plano, obtida somando
+    a variação do dia à fotografia do dia anterior.
+    """
+    
+    date = models.DateField(
+        verbose_name='Data'
+    )
+    
+    plan = models.ForeignKey(
+        'subscription_plans.SubscriptionPlan',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='revenue_snapshots',
+        verbose_name='Plano'
+    )
+    
+    active_subscriptions = models.IntegerField(
+        default=0,
+        verbose_name='Assinaturas Ativas'
+    )
+    
+    mrr = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='MRR (R$)'
+    )
+    
+    def __str__(self):
+        return f"{self.date} - {self.plan_id}: R$ {self.mrr}"
+    
+    class Meta:
+        verbose_name = 'Fotografia Diária de Receita'
+        verbose_name_plural = 'Fotografias Diárias de Receita'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'plan'],
+                name='unique_revenue_snapshot_per_day_plan'
+            ),
+        ]
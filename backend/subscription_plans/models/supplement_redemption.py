@@ -0,0 +1,139 @@
+from django.db import models
+
+
+class SupplementRedemption(models.Model):
+    """
+    Registro imutável do resgate de um suplemento por uma assinatura.
+    
+    As referências não usam chave estrangeira no banco para que o
+    histórico sobreviva ao arquivamento das assinaturas.
+    """
+    
+    subscription = models.ForeignKey(
+        'subscription_plans.Subscription',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='redemptions',
+        verbose_name='Assinatura'
+    )
+    
+    supplement = models.ForeignKey(
+        'supplements.Supplement',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='redemptions',
+        verbose_name='Suplemento'
+    )
+    
+    store = models.ForeignKey(
+        'partner_stores.PartnerStore',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='redemptions',
+        verbose_name='Loja Parceira'
+    )
+    
+    redeemed_at = models.DateTimeField(
+        db_index=True,
+        verbose_name='Resgatado em'
+    )
+    
+    def __str__(self):
+        return f"{self.subscription_id} - {self.supplement_id} ({self.redeemed_at})"
+    
+    class Meta:
+        verbose_name = 'Resgate de Suplemento'
+        verbose_name_plural = 'Resgates de Suplementos'
+        ordering = ['redeemed_at', 'id']
+
+
+class SupplementUsageRollup(models.Model):
+    """
+    Total de resgates por suplemento e loja em uma hora ou em um dia.
+    
+    Consolidado a partir do registro de resgates, para que o
+    planejamento de estoque não precise varrer os eventos.
+    """
+    
+    HOUR = 'hour'
+    DAY = 'day'
+    
+    GRANULARITY_CHOICES = [
+        (HOUR, 'Hora'),
+        (DAY, 'Dia'),
+    ]
+    
+    granularity = models.CharField(
+        max_length=4,
+        choices=GRANULARITY_CHOICES,
+        verbose_name='Granularidade'
+    )
+    
+    period_start = models.DateTimeField(
+        verbose_name='Início do Período'
+    )
+    
+    supplement = models.ForeignKey(
+        'supplements.Supplement',
+        on_delete=models.CASCADE,
+        related_name='usage_rollups',
+        verbose_name='Suplemento'
+    )
+    
+    store = models.ForeignKey(
+        'partner_stores.PartnerStore',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='usage_rollups',
+        verbose_name='Loja Parceira'
+    )
+    
+    redemptions = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Resgates'
+    )
+    
+    def __str__(self):
+        return f"{self.supplement_id}/{self.store_id} {self.period_start}: {self.redemptions}"
+    
+    class Meta:
+        verbose_name = 'Consolidação de Resgates'
+        verbose_name_plural = 'Consolidações de Resgates'
+        ordering = ['granularity', 'period_start']
+        indexes = [
+            models.Index(
+                fields=['granularity', 'supplement', 'period_start'],
+                name='usage_rollup_supplement_idx'
+            ),
+            models.Index(
+                fields=['granularity', 'store', 'period_start'],
+                name='usage_rollup_store_idx'
+            ),
+        ]
+
+
+class RedemptionRollupWatermark(models.Model):
+    """
+    Marca até onde os resgates já foram consolidados.
+    """
+    
+    granularity = models.CharField(
+        max_length=4,
+        choices=SupplementUsageRollup.GRANULARITY_CHOICES,
+        unique=True,
+        verbose_name='Granularidade'
+    )
+    
+    processed_until = models.DateTimeField(
+        verbose_name='Consolidado até'
+    )
+    
+    def __str__(self):
+        return f"{self.granularity}: {self.processed_until}"
+    
+    class Meta:
+        verbose_name = 'Marca de Consolidação de Resgates'
+        verbose_name_plural = 'Marcas de Consolidação de Resgates'
@@ -1 +1,12 @@
-from .subscription_plans_serializers import SubscriptionPlanSerializer, SubscriptionSerializer 
\ No newline at end of file
+from .subscription_plans_serializers import SubscriptionPlanSerializer, SubscriptionSerializer
+from .subscription_analytics_serializers import (
+    AnalyticsRangeSerializer,
+    RevenueSeriesSerializer,
+    ChurnSerializer,
+    PlanMixSerializer,
+)
+from .redemption_serializers import (
+    RedemptionRequestSerializer,
+    RedemptionUsageQuerySerializer,
+    RedemptionUsageSerializer,
+)
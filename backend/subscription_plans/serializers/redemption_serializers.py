@@ -0,0 +1,46 @@
+from rest_framework import serializers
+
+from partner_stores.models import PartnerStore
+from subscription_plans.models import SupplementUsageRollup
+from subscription_plans.serializers.subscription_analytics_serializers import AnalyticsRangeSerializer
+from supplements.models import Supplement
+
+
+class RedemptionRequestSerializer(serializers.Serializer):
+    """
+    Valida o resgate de um suplemento por uma assinatura.
+    """
+    
+    supplement = serializers.PrimaryKeyRelatedField(
+        queryset=Supplement.objects.filter(available=True)
+    )
+    store = serializers.PrimaryKeyRelatedField(
+        queryset=PartnerStore.objects.filter(status='approved'),
+        required=False,
+        allow_null=True
+    )
+
+
+class RedemptionUsageQuerySerializer(AnalyticsRangeSerializer):
+    """
+    Valida os parâmetros da consulta de resgates consolidados.
+    """
+    
+    plan = None
+    granularity = serializers.ChoiceField(
+        choices=SupplementUsageRollup.GRANULARITY_CHOICES,
+        default=SupplementUsageRollup.DAY
+    )
+    supplement = serializers.IntegerField(required=False, min_value=1)
+    store = serializers.IntegerField(required=False, min_value=1)
+
+
+class RedemptionUsageSerializer(serializers.Serializer):
+    """
+    Serializer dos resgates consolidados de um suplemento em uma loja e período.
+    """
+    
+    period_start = serializers.DateTimeField()
+    supplement = serializers.IntegerField(source='supplement_id')
+    store = serializers.IntegerField(source='store_id', allow_null=True)
+    redemptions = serializers.IntegerField()
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class AnalyticsRangeSerializer(serializers.Serializer):
+    """
+    Valida os parâmetros de intervalo das consultas de métricas.
+    
+    Sem datas informadas, considera os últimos 30 dias.
+    """
+    
+    MAX_RANGE_DAYS = 731
+    
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    plan = serializers.IntegerField(required=False, min_value=1)
+    
+    def validate(self, attrs):
+        """
+        Preenche as datas padrão e valida o intervalo.
+        
+        Args:
+            attrs: Atributos a serem validados.
+            
+        Returns:
+            dict: Atributos validados.
+            
+        Raises:
+            ValidationError: Se o intervalo for inválido.
+        """
+        attrs.setdefault('end', timezone.localdate())
+        attrs.setdefault('start', attrs['end'] - timedelta(days=29))
+        
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError({
+                'start': 'A data inicial deve ser anterior ou igual à data final.'
+            })
+        
+        if (attrs['end'] - attrs['start']).days >= self.MAX_RANGE_DAYS:
+            raise serializers.ValidationError({
+                'start': f'O intervalo deve ter no máximo {self.MAX_RANGE_DAYS} dias.'
+            })
+            
+        return attrs
+
+
+class RevenueSeriesSerializer(serializers.Serializer):
+    """
+    Serializer de um dia da série de receita das assinaturas.
+    """
+    
+    date = serializers.DateField()
+    active_subscriptions = serializers.IntegerField()
+    mrr = serializers.DecimalField(max_digits=12, decimal_places=2)
+    new_subscriptions = serializers.IntegerField()
+    renewed_subscriptions = serializers.IntegerField()
+    cancelled_subscriptions = serializers.IntegerField()
+    expired_subscriptions = serializers.IntegerField()
+    gross_revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class ChurnSerializer(serializers.Serializer):
+    """
+    Serializer do churn líquido de um intervalo.
+    """
+    
+    start = serializers.DateField()
+    end = serializers.DateField()
+    opening_subscriptions = serializers.IntegerField()
+    closing_subscriptions = serializers.IntegerField()
+    cancelled_subscriptions = serializers.IntegerField()
+    expired_subscriptions = serializers.IntegerField()
+    renewed_subscriptions = serializers.IntegerField()
+    churned_subscriptions = serializers.IntegerField()
+    churn_rate = serializers.DecimalField(max_digits=7, decimal_places=4, allow_null=True)
+
+
+class PlanMixSerializer(serializers.Serializer):
+    """
+    Serializer da participação de um plano nas assinaturas ativas.
+    """
+    
+    plan = serializers.IntegerField(allow_null=True)
+    plan_name = serializers.CharField(allow_null=True)
+    active_subscriptions = serializers.IntegerField()
+    mrr = serializers.DecimalField(max_digits=12, decimal_places=2)
+    share = serializers.DecimalField(max_digits=5, decimal_places=4, allow_null=True)
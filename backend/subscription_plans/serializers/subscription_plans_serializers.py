@@ -83,5 +83,18 @@ class SubscriptionSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({
                     'end_date': 'A data de término deve ser posterior à data de início.'
                 })
+        
+        # Na criação, uma nova assinatura ativa substitui a atual (troca de plano);
+        # na atualização, não pode haver outra assinatura ativa do usuário
+        if self.instance is not None and attrs.get('status') == Subscription.ACTIVE:
+            user = attrs.get('user', self.instance.user)
+            other_active = Subscription.objects.filter(
+                user=user,
+                status=Subscription.ACTIVE
+            ).exclude(pk=self.instance.pk)
+            if other_active.exists():
+                raise serializers.ValidationError({
+                    'status': 'O usuário já possui outra assinatura ativa.'
+                })
                 
         return attrs 
\ No newline at end of file
@@ -1 +1,10 @@
-from .subscription_service import SubscriptionService 
\ No newline at end of file
+from .subscription_service import SubscriptionService
+from .analytics_service import SubscriptionAnalyticsService
+from .plan_counter_service import PlanCounterService
+from .archive_service import SubscriptionArchiveService
+from .scheduler_service import SubscriptionSchedulerService
+from .idempotency_service import IdempotencyService, idempotent
+from .plan_catalog_service import PlanCatalogCache, PlanCatalogSnapshot
+from .plan_migration_service import PlanMigrationService
+from .redemption_service import RedemptionLedgerWriter, RedemptionRollupService
+from .export_service import SubscriptionExportService
@@ -0,0 +1,507 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Min, Sum
+from django.utils import timezone
+
+from subscription_plans.models import (
+    Subscription,
+    SubscriptionArchive,
+    SubscriptionPlan,
+    SubscriptionRevenueDelta,
+    SubscriptionRevenueSnapshot,
+)
+from subscription_plans.services.plan_counter_service import PlanCounterService
+
+
+class SubscriptionAnalyticsService:
+    """
+    Classe de serviço para as métricas de receita das assinaturas.
+
+    Mantém as tabelas de variação e fotografia diárias, atualizadas
+    incrementalmente pelos eventos de assinatura, e responde às consultas
+    de MRR, churn e mix de planos a partir delas.
+    """
+
+    COUNTER_FIELDS = (
+        'new_subscriptions',
+        'renewed_subscriptions',
+        'cancelled_subscriptions',
+        'expired_subscriptions',
+        'active_delta',
+        'mrr_delta',
+        'gross_revenue',
+    )
+
+    @staticmethod
+    def record_created(subscription):
+        """
+        Registra a criação de uma assinatura ativa.
+
+        Args:
+            subscription (Subscription): Assinatura criada.
+        """
+        if subscription.status != Subscription.ACTIVE:
+            return
+
+        SubscriptionAnalyticsService.apply_delta(
+            timezone.localdate(),
+            subscription.plan_id,
+            new_subscriptions=1,
+            active_delta=1,
+            mrr_delta=subscription.price_paid,
+            gross_revenue=subscription.price_paid,
+        )
+
+    @staticmethod
+    def record_renewed(subscription):
+        """
+        Registra a assinatura criada por uma renovação.
+
+        Args:
+            subscription (Subscription): Nova assinatura gerada pela renovação.
+        """
+        SubscriptionAnalyticsService.apply_delta(
+            timezone.localdate(),
+            subscription.plan_id,
+            renewed_subscriptions=1,
+            active_delta=1,
+            mrr_delta=subscription.price_paid,
+            gross_revenue=subscription.price_paid,
+        )
+
+    @staticmethod
+    def record_plan_changed(previous_plan_id, previous_price, subscription):
+        """
+        Registra a troca de plano da assinatura ativa de um usuário.
+
+        Args:
+            previous_plan_id (int): ID do plano substituído.
+            previous_price (Decimal): Valor pago no plano substituído.
+            subscription (Subscription): Assinatura já no novo plano.
+        """
+        today = timezone.localdate()
+        SubscriptionAnalyticsService.apply_delta(
+            today,
+            previous_plan_id,
+            active_delta=-1,
+            mrr_delta=-previous_price,
+        )
+        SubscriptionAnalyticsService.apply_delta(
+            today,
+            subscription.plan_id,
+            active_delta=1,
+            mrr_delta=subscription.price_paid,
+            gross_revenue=subscription.price_paid,
+        )
+
+    @staticmethod
+    def record_plan_migration(previous_plan_id, plan_id, count, previous_mrr, mrr):
+        """
+        Registra a migração em lote de assinaturas ativas entre planos.
+
+        Args:
+            previous_plan_id (int): ID do plano de origem.
+            plan_id (int): ID do plano de destino.
+            count (int): Número de assinaturas ativas migradas.
+            previous_mrr (Decimal): Soma dos valores pagos antes da migração.
+            mrr (Decimal): Soma dos valores pagos após a migração.
+        """
+        if not count:
+            return
+
+        today = timezone.localdate()
+        SubscriptionAnalyticsService.apply_delta(
+            today,
+            previous_plan_id,
+            active_delta=-count,
+            mrr_delta=-previous_mrr,
+        )
+        SubscriptionAnalyticsService.apply_delta(
+            today,
+            plan_id,
+            active_delta=count,
+            mrr_delta=mrr,
+        )
+
+    @staticmethod
+    def record_cancelled(subscription, previous_status):
+        """
+        Registra o cancelamento de uma assinatura.
+
+        Args:
+            subscription (Subscription): Assinatura cancelada.
+            previous_status (str): Status anterior ao cancelamento.
+        """
+        if previous_status != Subscription.ACTIVE:
+            return
+
+        SubscriptionAnalyticsService.apply_delta(
+            timezone.localdate(),
+            subscription.plan_id,
+            cancelled_subscriptions=1,
+            active_delta=-1,
+            mrr_delta=-subscription.price_paid,
+        )
+
+    @staticmethod
+    def record_expired(expired_rows):
+        """
+        Registra a expiração de um lote de assinaturas ativas.
+
+        Args:
+            expired_rows: Iterável de tuplas (plan_id, price_paid).
+        """
+        totals = defaultdict(lambda: [0, Decimal('0')])
+        for plan_id, price_paid in expired_rows:
+            totals[plan_id][0] += 1
+            totals[plan_id][1] += price_paid
+
+        today = timezone.localdate()
+        for plan_id, (count, mrr) in totals.items():
+            SubscriptionAnalyticsService.apply_delta(
+                today,
+                plan_id,
+                expired_subscriptions=count,
+                active_delta=-count,
+                mrr_delta=-mrr,
+            )
+
+    @staticmethod
+    def apply_delta(day, plan_id, **increments):
+        """
+        Soma os incrementos à linha de variação do dia e plano,
+        criando-a quando ainda não existir.
+
+        A variação de assinaturas ativas também é aplicada ao contador
+        de assinantes do plano.
+
+        Args:
+            day (date): Dia do evento.
+            plan_id (int): ID do plano.
+            **increments: Valores a somar em cada contador.
+        """
+        PlanCounterService.increment(plan_id, increments.get('active_delta', 0))
+
+        queryset = SubscriptionRevenueDelta.objects.filter(date=day, plan_id=plan_id)
+        updates = {field: F(field) + value for field, value in increments.items()}
+
+        if queryset.update(**updates):
+            return
+
+        try:
+            with transaction.atomic():
+                SubscriptionRevenueDelta.objects.create(date=day, plan_id=plan_id, **increments)
+        except IntegrityError:
+            # Outro processo criou a linha entre o update e o insert
+            queryset.update(**updates)
+
+    @staticmethod
+    @transaction.atomic
+    def materialize_snapshots(until=None):
+        """
+        Materializa as fotografias diárias que ainda não existem.
+
+        Cada dia é obtido somando as variações do dia à fotografia do
+        dia anterior, sem reler o histórico de assinaturas.
+
+        Args:
+            until (date, opcional): Último dia a materializar. Por padrão, ontem.
+
+        Returns:
+            int: Número de fotografias criadas.
+        """
+        until = until or timezone.localdate() - timedelta(days=1)
+        last_date = SubscriptionRevenueSnapshot.objects.aggregate(last=Max('date'))['last']
+
+        if last_date is None:
+            day = SubscriptionRevenueDelta.objects.aggregate(first=Min('date'))['first']
+            if day is None:
+                return 0
+            positions = {}
+        else:
+            day = last_date + timedelta(days=1)
+            positions = {
+                row['plan_id']: [row['active_subscriptions'], row['mrr']]
+                for row in SubscriptionRevenueSnapshot.objects.filter(date=last_date).values(
+                    'plan_id', 'active_subscriptions', 'mrr'
+                )
+            }
+
+        deltas_by_day = defaultdict(list)
+        for row in SubscriptionRevenueDelta.objects.filter(date__gte=day, date__lte=until).values(
+            'date', 'plan_id', 'active_delta', 'mrr_delta'
+        ):
+            deltas_by_day[row['date']].append(row)
+
+        snapshots = []
+        while day <= until:
+            for row in deltas_by_day.get(day, []):
+                position = positions.setdefault(row['plan_id'], [0, Decimal('0')])
+                position[0] += row['active_delta']
+                position[1] += row['mrr_delta']
+
+            snapshots.extend(
+                SubscriptionRevenueSnapshot(
+                    date=day,
+                    plan_id=plan_id,
+                    active_subscriptions=active,
+                    mrr=mrr
+                )
+                for plan_id, (active, mrr) in positions.items()
+            )
+            day += timedelta(days=1)
+
+        SubscriptionRevenueSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+        return len(snapshots)
+
+    @staticmethod
+    def _base_snapshot_date(before, plan_id=None):
+        """
+        Retorna o dia da última fotografia anterior a `before`.
+        """
+        snapshots = SubscriptionRevenueSnapshot.objects.filter(date__lt=before)
+        if plan_id is not None:
+            snapshots = snapshots.filter(plan_id=plan_id)
+        return snapshots.aggregate(last=Max('date'))['last']
+
+    @staticmethod
+    def get_daily_series(start, end, plan_id=None):
+        """
+        Retorna a série diária de assinaturas ativas, MRR e eventos.
+
+        Parte da última fotografia anterior ao intervalo e acumula as
+        variações diárias até o fim do intervalo.
+
+        Args:
+            start (date): Primeiro dia do intervalo.
+            end (date): Último dia do intervalo.
+            plan_id (int, opcional): Restringe a série a um plano.
+
+        Returns:
+            list: Lista de dicionários, um por dia do intervalo.
+        """
+        base_date = SubscriptionAnalyticsService._base_snapshot_date(start, plan_id)
+
+        active = 0
+        mrr = Decimal('0')
+        if base_date is not None:
+            snapshots = SubscriptionRevenueSnapshot.objects.filter(date=base_date)
+            if plan_id is not None:
+                snapshots = snapshots.filter(plan_id=plan_id)
+            base = snapshots.aggregate(active=Sum('active_subscriptions'), mrr=Sum('mrr'))
+            active = base['active'] or 0
+            mrr = base['mrr'] or Decimal('0')
+
+        deltas = SubscriptionRevenueDelta.objects.filter(date__lte=end)
+        if base_date is not None:
+            deltas = deltas.filter(date__gt=base_date)
+        if plan_id is not None:
+            deltas = deltas.filter(plan_id=plan_id)
+
+        deltas_by_day = {
+            row['date']: row
+            for row in deltas.values('date').annotate(
+                **{field: Sum(field) for field in SubscriptionAnalyticsService.COUNTER_FIELDS}
+            ).order_by('date')
+        }
+
+        # Variações anteriores ao intervalo só alteram o ponto de partida
+        for day, row in deltas_by_day.items():
+            if day < start:
+                active += row['active_delta']
+                mrr += row['mrr_delta']
+
+        series = []
+        day = start
+        while day <= end:
+            row = deltas_by_day.get(day)
+            counters = {
+                field: row[field] if row else 0
+                for field in SubscriptionAnalyticsService.COUNTER_FIELDS
+            }
+            active += counters['active_delta']
+            mrr += counters['mrr_delta']
+            series.append({
+                'date': day,
+                'active_subscriptions': active,
+                'mrr': mrr,
+                **counters,
+            })
+            day += timedelta(days=1)
+
+        return series
+
+    @staticmethod
+    def get_churn(start, end, plan_id=None):
+        """
+        Calcula o churn líquido do intervalo.
+
+        Cancelamentos e expirações compensados por renovações não contam
+        como perda, já que a renovação encerra a assinatura anterior.
+
+        Args:
+            start (date): Primeiro dia do intervalo.
+            end (date): Último dia do intervalo.
+            plan_id (int, opcional): Restringe o cálculo a um plano.
+
+        Returns:
+            dict: Assinaturas no início e fim, perdas e taxa de churn.
+        """
+        series = SubscriptionAnalyticsService.get_daily_series(start, end, plan_id)
+
+        opening = series[0]['active_subscriptions'] - series[0]['active_delta']
+        cancelled = sum(row['cancelled_subscriptions'] for row in series)
+        expired = sum(row['expired_subscriptions'] for row in series)
+        renewed = sum(row['renewed_subscriptions'] for row in series)
+        churned = max(cancelled + expired - renewed, 0)
+
+        return {
+            'start': start,
+            'end': end,
+            'opening_subscriptions': opening,
+            'closing_subscriptions': series[-1]['active_subscriptions'],
+            'cancelled_subscriptions': cancelled,
+            'expired_subscriptions': expired,
+            'renewed_subscriptions': renewed,
+            'churned_subscriptions': churned,
+            'churn_rate': (
+                (Decimal(churned) / opening).quantize(Decimal('0.0001')) if opening else None
+            ),
+        }
+
+    @staticmethod
+    def get_plan_mix(day):
+        """
+        Retorna a distribuição de assinaturas ativas e MRR por plano.
+
+        Args:
+            day (date): Dia de referência.
+
+        Returns:
+            list: Lista de dicionários, um por plano, ordenada pelo MRR.
+        """
+        base_date = SubscriptionAnalyticsService._base_snapshot_date(day + timedelta(days=1))
+
+        positions = defaultdict(lambda: [0, Decimal('0')])
+        deltas = SubscriptionRevenueDelta.objects.filter(date__lte=day)
+        if base_date is not None:
+            for row in SubscriptionRevenueSnapshot.objects.filter(date=base_date).values(
+                'plan_id', 'active_subscriptions', 'mrr'
+            ):
+                positions[row['plan_id']] = [row['active_subscriptions'], row['mrr']]
+            deltas = deltas.filter(date__gt=base_date)
+
+        for row in deltas.values('plan_id').annotate(
+            active=Sum('active_delta'), mrr=Sum('mrr_delta')
+        ).order_by():
+            positions[row['plan_id']][0] += row['active']
+            positions[row['plan_id']][1] += row['mrr']
+
+        plan_names = dict(
+            SubscriptionPlan.objects.filter(id__in=positions.keys()).values_list('id', 'name')
+        )
+        total_mrr = sum(mrr for _, mrr in positions.values())
+
+        mix = [
+            {
+                'plan': plan_id,
+                'plan_name': plan_names.get(plan_id),
+                'active_subscriptions': active,
+                'mrr': mrr,
+                'share': (mrr / total_mrr).quantize(Decimal('0.0001')) if total_mrr else None,
+            }
+            for plan_id, (active, mrr) in positions.items()
+        ]
+        return sorted(mix, key=lambda row: row['mrr'], reverse=True)
+
+    @staticmethod
+    def _iter_history(chunk_size):
+        """
+        Percorre assinaturas e assinaturas arquivadas em ordem de ID.
+
+        Cada rodada lê um bloco de cada tabela e só entrega as linhas até
+        o menor ID final entre os blocos completos; o restante é relido
+        na rodada seguinte.
+        """
+        fields = ('id', 'user_id', 'plan_id', 'status', 'price_paid', 'created_at', 'updated_at')
+        last_id = 0
+
+        while True:
+            rows = []
+            bound = None
+            for model in (Subscription, SubscriptionArchive):
+                chunk = list(
+                    model.objects.filter(id__gt=last_id).order_by('id').values(*fields)[:chunk_size]
+                )
+                if len(chunk) == chunk_size:
+                    bound = chunk[-1]['id'] if bound is None else min(bound, chunk[-1]['id'])
+                rows.extend(chunk)
+
+            if not rows:
+                return
+
+            rows.sort(key=lambda row: row['id'])
+            if bound is not None:
+                rows = [row for row in rows if row['id'] <= bound]
+
+            yield from rows
+            last_id = rows[-1]['id']
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_from_history(chunk_size=2000, until=None):
+        """
+        Reconstrói as variações e fotografias a partir do histórico.
+
+        As assinaturas (inclusive as arquivadas) são lidas em blocos
+        ordenados por ID, mantendo em memória apenas os totais por dia e plano.
+
+        Args:
+            chunk_size (int): Quantidade de assinaturas lidas por bloco.
+            until (date, opcional): Último dia a materializar.
+
+        Returns:
+            tuple: Número de assinaturas lidas e de variações gravadas.
+        """
+        totals = defaultdict(lambda: dict.fromkeys(SubscriptionAnalyticsService.COUNTER_FIELDS, 0))
+        seen_users = set()
+        processed = 0
+
+        for row in SubscriptionAnalyticsService._iter_history(chunk_size):
+            processed += 1
+            is_renewal = row['user_id'] in seen_users
+            seen_users.add(row['user_id'])
+
+            if row['status'] == Subscription.PENDING:
+                continue
+
+            opened = totals[(timezone.localdate(row['created_at']), row['plan_id'])]
+            opened['renewed_subscriptions' if is_renewal else 'new_subscriptions'] += 1
+            opened['active_delta'] += 1
+            opened['mrr_delta'] += row['price_paid']
+            opened['gross_revenue'] += row['price_paid']
+
+            if row['status'] in (Subscription.CANCELLED, Subscription.EXPIRED):
+                closed = totals[(timezone.localdate(row['updated_at']), row['plan_id'])]
+                closed[
+                    'cancelled_subscriptions' if row['status'] == Subscription.CANCELLED
+                    else 'expired_subscriptions'
+                ] += 1
+                closed['active_delta'] -= 1
+                closed['mrr_delta'] -= row['price_paid']
+
+        SubscriptionRevenueSnapshot.objects.all().delete()
+        SubscriptionRevenueDelta.objects.all().delete()
+        SubscriptionRevenueDelta.objects.bulk_create(
+            (
+                SubscriptionRevenueDelta(date=day, plan_id=plan_id, **counters)
+                for (day, plan_id), counters in totals.items()
+            ),
+            batch_size=1000
+        )
+        SubscriptionAnalyticsService.materialize_snapshots(until)
+
+        return processed, len(totals)
@@ -0,0 +1,108 @@
+import time
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from subscription_plans.models import Subscription, SubscriptionArchive
+
+
+class SubscriptionArchiveService:
+    """
+    Classe de serviço para o arquivamento de assinaturas encerradas.
+    
+    Move assinaturas canceladas ou expiradas há mais de N dias para a
+    tabela de arquivo, em lotes transacionais.
+    """
+    
+    ARCHIVED_FIELDS = (
+        'id', 'user_id', 'plan_id', 'status', 'start_date', 'end_date',
+        'remaining_supplements', 'renewal_enabled', 'price_paid',
+        'created_at', 'updated_at',
+    )
+    
+    CLOSED_STATUSES = (Subscription.CANCELLED, Subscription.EXPIRED)
+    
+    @staticmethod
+    def get_archivable_subscriptions(older_than_days):
+        """
+        Retorna as assinaturas encerradas antes do limite de dias.
+        
+        Args:
+            older_than_days (int): Idade mínima, em dias, do término da assinatura.
+            
+        Returns:
+            QuerySet: QuerySet de assinaturas a arquivar.
+        """
+        cutoff = date.today() - timedelta(days=older_than_days)
+        return Subscription.objects.filter(
+            status__in=SubscriptionArchiveService.CLOSED_STATUSES,
+            end_date__lt=cutoff
+        )
+    
+    @staticmethod
+    @transaction.atomic
+    def archive_batch(older_than_days, batch_size):
+        """
+        Arquiva um lote de assinaturas em uma única transação.
+        
+        As linhas são bloqueadas (ignorando as já bloqueadas por outro
+        processo), copiadas para o arquivo e removidas da tabela principal.
+        
+        Args:
+            older_than_days (int): Idade mínima, em dias, do término da assinatura.
+            batch_size (int): Quantidade máxima de assinaturas no lote.
+            
+        Returns:
+            int: Número de assinaturas arquivadas.
+        """
+        rows = list(
+            SubscriptionArchiveService.get_archivable_subscriptions(older_than_days)
+            .select_for_update(skip_locked=True)
+            .order_by('id')
+            .values(*SubscriptionArchiveService.ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        
+        SubscriptionArchive.objects.bulk_create(
+            [SubscriptionArchive(**row) for row in rows],
+            ignore_conflicts=True
+        )
+        Subscription.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        
+        return len(rows)
+    
+    @staticmethod
+    def archive_closed_subscriptions(older_than_days=90, batch_size=1000, pause=0):
+        """
+        Arquiva todas as assinaturas encerradas, lote a lote.
+        
+        Args:
+            older_than_days (int): Idade mínima, em dias, do término da assinatura.
+            batch_size (int): Quantidade de assinaturas por transação.
+            pause (float): Intervalo, em segundos, entre os lotes.
+            
+        Returns:
+            int: Número total de assinaturas arquivadas.
+        """
+        total = 0
+        while True:
+            archived = SubscriptionArchiveService.archive_batch(older_than_days, batch_size)
+            total += archived
+            if archived < batch_size:
+                return total
+            if pause:
+                time.sleep(pause)
+    
+    @staticmethod
+    def get_user_archived_subscriptions(user):
+        """
+        Retorna as assinaturas arquivadas do usuário.
+        
+        Args:
+            user: Usuário dono das assinaturas.
+            
+        Returns:
+            QuerySet: QuerySet de assinaturas arquivadas.
+        """
+        return SubscriptionArchive.objects.filter(user=user)
@@ -0,0 +1,254 @@
+import csv
+import io
+import json
+import zlib
+from itertools import chain
+
+from subscription_plans.models import Subscription, SubscriptionArchive
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - dependência opcional
+    pyarrow = None
+
+
+class SubscriptionExportService:
+    """
+    Classe de serviço para a exportação completa de assinaturas.
+    
+    As linhas são lidas em blocos por um cursor no servidor e convertidas
+    em pedaços de bytes à medida que são lidas, de modo que a memória
+    usada não dependa do número de assinaturas exportadas.
+    """
+    
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+    PARQUET = 'parquet'
+    
+    FORMATS = (CSV, NDJSON, PARQUET)
+    
+    CONTENT_TYPES = {
+        CSV: 'text/csv; charset=utf-8',
+        NDJSON: 'application/x-ndjson',
+        PARQUET: 'application/vnd.apache.parquet',
+    }
+    
+    # (coluna, campo de origem, tipo Parquet)
+    COLUMNS = (
+        ('id', 'id', 'int64'),
+        ('status', 'status', 'string'),
+        ('start_date', 'start_date', 'date32'),
+        ('end_date', 'end_date', 'date32'),
+        ('remaining_supplements', 'remaining_supplements', 'int64'),
+        ('renewal_enabled', 'renewal_enabled', 'bool'),
+        ('price_paid', 'price_paid', 'decimal'),
+        ('created_at', 'created_at', 'timestamp'),
+        ('updated_at', 'updated_at', 'timestamp'),
+        ('user_id', 'user_id', 'int64'),
+        ('user_username', 'user__username', 'string'),
+        ('user_email', 'user__email', 'string'),
+        ('plan_id', 'plan_id', 'int64'),
+        ('plan_name', 'plan__name', 'string'),
+        ('plan_type', 'plan__plan_type', 'string'),
+        ('plan_price', 'plan__price', 'decimal'),
+    )
+    
+    @staticmethod
+    def parquet_available():
+        """Indica se o pyarrow está instalado"""
+        return pyarrow is not None
+    
+    @staticmethod
+    def get_column_names(include_archived=False):
+        names = [name for name, _, _ in SubscriptionExportService.COLUMNS]
+        if include_archived:
+            names.append('archived')
+        return names
+    
+    @staticmethod
+    def iter_rows(chunk_size=2000, include_archived=False):
+        """
+        Percorre as assinaturas (e, opcionalmente, as arquivadas) em ordem de ID.
+        
+        Args:
+            chunk_size (int): Quantidade de linhas lidas do cursor por vez.
+            include_archived (bool): Se verdadeiro, inclui as assinaturas arquivadas.
+            
+        Yields:
+            tuple: Valores de uma assinatura, na ordem de `COLUMNS`.
+        """
+        lookups = [lookup for _, lookup, _ in SubscriptionExportService.COLUMNS]
+        rows = Subscription.objects.order_by('id').values_list(*lookups).iterator(
+            chunk_size=chunk_size
+        )
+        if not include_archived:
+            yield from rows
+            return
+        
+        archived = SubscriptionArchive.objects.order_by('id').values_list(*lookups).iterator(
+            chunk_size=chunk_size
+        )
+        yield from chain(
+            (row + (False,) for row in rows),
+            (row + (True,) for row in archived),
+        )
+    
+    @staticmethod
+    def _iter_chunks(rows, chunk_size):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def _stream_csv(chunks, columns):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    
+    @staticmethod
+    def _stream_ndjson(chunks, columns):
+        for chunk in chunks:
+            yield ''.join(
+                json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + '\n'
+                for row in chunk
+            ).encode('utf-8')
+    
+    @staticmethod
+    def _parquet_schema(columns):
+        types = {
+            'int64': pyarrow.int64(),
+            'string': pyarrow.string(),
+            'date32': pyarrow.date32(),
+            'bool': pyarrow.bool_(),
+            'decimal': pyarrow.decimal128(10, 2),
+            'timestamp': pyarrow.timestamp('us', tz='UTC'),
+        }
+        fields = [
+            pyarrow.field(name, types[kind])
+            for name, _, kind in SubscriptionExportService.COLUMNS
+        ]
+        if 'archived' in columns:
+            fields.append(pyarrow.field('archived', pyarrow.bool_()))
+        return pyarrow.schema(fields)
+    
+    @staticmethod
+    def _stream_parquet(chunks, columns):
+        """
+        Grava um grupo de linhas Parquet por bloco e repassa os bytes gerados.
+        """
+        schema = SubscriptionExportService._parquet_schema(columns)
+        sink = _DrainableSink()
+        writer = pyarrow.parquet.ParquetWriter(sink, schema, compression='snappy')
+        try:
+            for chunk in chunks:
+                table = pyarrow.Table.from_arrays(
+                    [pyarrow.array(values, type=field.type)
+                     for values, field in zip(zip(*chunk), schema)],
+                    schema=schema
+                )
+                writer.write_table(table)
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+    
+    @staticmethod
+    def _gzip(stream):
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        for piece in stream:
+            compressed = compressor.compress(piece)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    
+    @staticmethod
+    def stream(export_format=CSV, compress=False, include_archived=False, chunk_size=2000):
+        """
+        Gera a exportação das assinaturas em pedaços de bytes.
+        
+        Args:
+            export_format (str): 'csv', 'ndjson' ou 'parquet'.
+            compress (bool): Se verdadeiro, compacta a saída com gzip.
+            include_archived (bool): Se verdadeiro, inclui as assinaturas arquivadas.
+            chunk_size (int): Quantidade de linhas por bloco.
+            
+        Returns:
+            generator: Pedaços de bytes da exportação.
+            
+        Raises:
+            ValueError: Se o formato for inválido ou indisponível.
+        """
+        if export_format not in SubscriptionExportService.FORMATS:
+            raise ValueError(
+                f"Formato inválido. Use: {', '.join(SubscriptionExportService.FORMATS)}."
+            )
+        
+        if export_format == SubscriptionExportService.PARQUET:
+            if not SubscriptionExportService.parquet_available():
+                raise ValueError("A exportação em Parquet requer o pacote pyarrow.")
+            if compress:
+                raise ValueError("Arquivos Parquet já são compactados; não use gzip.")
+        
+        columns = SubscriptionExportService.get_column_names(include_archived)
+        chunks = SubscriptionExportService._iter_chunks(
+            SubscriptionExportService.iter_rows(chunk_size, include_archived),
+            chunk_size
+        )
+        writers = {
+            SubscriptionExportService.CSV: SubscriptionExportService._stream_csv,
+            SubscriptionExportService.NDJSON: SubscriptionExportService._stream_ndjson,
+            SubscriptionExportService.PARQUET: SubscriptionExportService._stream_parquet,
+        }
+        stream = writers[export_format](chunks, columns)
+        
+        if compress:
+            return SubscriptionExportService._gzip(stream)
+        return stream
+    
+    @staticmethod
+    def get_filename(export_format, compress=False):
+        """
+        Retorna o nome de arquivo sugerido para a exportação.
+        """
+        filename = f'subscriptions.{export_format}'
+        return f'{filename}.gz' if compress else filename
+
+
+class _DrainableSink(io.RawIOBase):
+    """
+    Arquivo somente de escrita que acumula os bytes até serem drenados.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from subscription_plans.models import IdempotencyKey
+
+
+class IdempotencyService:
+    """
+    Classe de serviço para requisições com Idempotency-Key.
+
+    A primeira requisição com uma chave reserva o registro; requisições
+    concorrentes com a mesma chave aguardam o resultado da primeira, e as
+    posteriores recebem a resposta armazenada até a chave expirar.
+    """
+
+    HEADER = 'Idempotency-Key'
+    MAX_KEY_LENGTH = 255
+    TTL = timedelta(hours=24)
+    IN_PROGRESS_TIMEOUT = timedelta(seconds=60)
+    WAIT_TIMEOUT = 10
+    POLL_INTERVAL = 0.1
+
+    @staticmethod
+    def hash_request(data):
+        """
+        Calcula a impressão digital do corpo da requisição.
+
+        Args:
+            data: Dados da requisição.
+
+        Returns:
+            str: Hash SHA-256 do corpo normalizado.
+        """
+        payload = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def acquire(user, scope, key, request_hash):
+        """
+        Tenta reservar a chave para a requisição atual.
+
+        Registros expirados, ou em andamento há mais tempo que o limite
+        (processo que parou no meio), são descartados antes da reserva.
+
+        Args:
+            user: Usuário autenticado.
+            scope (str): Operação protegida pela chave.
+            key (str): Valor do cabeçalho Idempotency-Key.
+            request_hash (str): Hash do corpo da requisição.
+
+        Returns:
+            tuple: Registro da chave e se foi criado por esta requisição.
+        """
+        now = timezone.now()
+        records = IdempotencyKey.objects.filter(user=user, scope=scope, key=key)
+        records.filter(
+            Q(expires_at__lt=now) | Q(
+                status=IdempotencyKey.IN_PROGRESS,
+                created_at__lt=now - IdempotencyService.IN_PROGRESS_TIMEOUT
+            )
+        ).delete()
+
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user,
+                    scope=scope,
+                    key=key,
+                    request_hash=request_hash,
+                    expires_at=now + IdempotencyService.TTL
+                )
+            return record, True
+        except IntegrityError:
+            return records.filter(expires_at__gte=now).first(), False
+
+    @staticmethod
+    def wait_for_completion(record):
+        """
+        Aguarda a conclusão de um registro em andamento.
+
+        Args:
+            record (IdempotencyKey): Registro reservado por outra requisição.
+
+        Returns:
+            IdempotencyKey: Registro concluído, ou None se a primeira
+            requisição falhou ou não terminou dentro do tempo limite.
+        """
+        deadline = time.monotonic() + IdempotencyService.WAIT_TIMEOUT
+        while record is not None and record.status != IdempotencyKey.COMPLETED:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(IdempotencyService.POLL_INTERVAL)
+            record = IdempotencyKey.objects.filter(pk=record.pk).first()
+        return record
+
+    @staticmethod
+    def complete(record, response):
+        """
+        Armazena a resposta da requisição e conclui o registro.
+
+        Args:
+            record (IdempotencyKey): Registro reservado.
+            response (Response): Resposta a ser reproduzida nas novas tentativas.
+        """
+        body = json.loads(JSONRenderer().render(response.data) or b'null')
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            status=IdempotencyKey.COMPLETED,
+            response_status=response.status_code,
+            response_body=body
+        )
+
+    @staticmethod
+    def release(record):
+        """
+        Libera a chave para que a requisição possa ser repetida.
+
+        Args:
+            record (IdempotencyKey): Registro reservado.
+        """
+        IdempotencyKey.objects.filter(pk=record.pk).delete()
+
+    @staticmethod
+    def purge_expired():
+        """
+        Remove os registros expirados.
+
+        Returns:
+            int: Número de registros removidos.
+        """
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lt=timezone.now()).delete()
+        return deleted
+
+
+def idempotent(scope):
+    """
+    Decorador de ações de ViewSet que aceita o cabeçalho Idempotency-Key.
+
+    Sem o cabeçalho a ação é executada normalmente. Apenas respostas 2xx
+    são armazenadas; erros liberam a chave para uma nova tentativa.
+    Deve envolver a ação por fora de `transaction.atomic`, para que a
+    reserva fique visível às requisições concorrentes.
+
+    Args:
+        scope (str): Nome da operação protegida.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(IdempotencyService.HEADER)
+            if not key:
+                return view_method(self, request, *args, **kwargs)
+
+            if len(key) > IdempotencyService.MAX_KEY_LENGTH:
+                return Response({
+                    'error': f'{IdempotencyService.HEADER} deve ter no máximo '
+                             f'{IdempotencyService.MAX_KEY_LENGTH} caracteres.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            full_scope = scope if 'pk' not in kwargs else f"{scope}:{kwargs['pk']}"
+            request_hash = IdempotencyService.hash_request(request.data)
+            record, created = IdempotencyService.acquire(
+                request.user, full_scope, key, request_hash
+            )
+
+            if not created:
+                if record is not None and record.request_hash != request_hash:
+                    return Response({
+                        'error': f'{IdempotencyService.HEADER} já utilizada com outro corpo de requisição.'
+                    }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+                record = IdempotencyService.wait_for_completion(record)
+                if record is None:
+                    return Response({
+                        'error': 'Uma requisição com a mesma chave ainda está em andamento.'
+                    }, status=status.HTTP_409_CONFLICT)
+
+                response = Response(record.response_body, status=record.response_status)
+                response['Idempotent-Replayed'] = 'true'
+                return response
+
+            try:
+                response = view_method(self, request, *args, **kwargs)
+            except Exception:
+                IdempotencyService.release(record)
+                raise
+
+            if status.is_success(response.status_code):
+                IdempotencyService.complete(record, response)
+            else:
+                IdempotencyService.release(record)
+            return response
+
+        return wrapper
+    return decorator
@@ -0,0 +1,135 @@
+import hashlib
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from subscription_plans.models import SubscriptionPlan
+from subscription_plans.serializers import SubscriptionPlanSerializer
+
+
+@dataclass(frozen=True)
+class PlanCatalogSnapshot:
+    """
+    Snapshot imutável do catálogo de planos, já serializado em JSON.
+    """
+    version: str
+    active_body: bytes
+    active_etag: str
+    list_body: Optional[bytes]
+    list_etag: Optional[str]
+
+
+class PlanCatalogCache:
+    """
+    Singleton que mantém em memória o catálogo de planos pré-serializado.
+
+    O snapshot é versionado por um token guardado no cache do Django.
+    Com um backend compartilhado (ex.: Redis), a invalidação feita por
+    um worker é percebida pelos demais na próxima leitura.
+    """
+    VERSION_CACHE_KEY = 'subscription_plans:catalog_version'
+
+    _instance: Optional['PlanCatalogCache'] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(PlanCatalogCache, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._snapshot: Optional[PlanCatalogSnapshot] = None
+        self._build_lock = threading.Lock()
+
+    def get_snapshot(self) -> PlanCatalogSnapshot:
+        """
+        Retorna o snapshot atual, reconstruindo-o se a versão mudou.
+        """
+        version = self._current_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._build_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = self._build(version)
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        """
+        Descarta o snapshot após o commit da transação corrente, para que
+        nenhum worker reconstrua o catálogo a partir de dados não commitados.
+        """
+        transaction.on_commit(self._invalidate_now)
+
+    def _invalidate_now(self):
+        cache.set(self.VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        self._snapshot = None
+
+    def _current_version(self) -> str:
+        version = cache.get(self.VERSION_CACHE_KEY)
+        if version is None:
+            # Um token novo garante que snapshots antigos nunca voltem a ser
+            # considerados válidos caso a chave seja removida do cache.
+            cache.add(self.VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.VERSION_CACHE_KEY)
+        return version
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+    def _build(self, version: str) -> PlanCatalogSnapshot:
+        plans = list(SubscriptionPlan.objects.all())
+        renderer = JSONRenderer()
+
+        all_data = SubscriptionPlanSerializer(plans, many=True).data
+        active_data = [
+            data for plan, data in zip(plans, all_data) if plan.is_active
+        ]
+        active_body = renderer.render(active_data)
+
+        # A listagem é paginada; só é servida do snapshot quando cabe
+        # inteira na primeira página.
+        list_body = None
+        list_etag = None
+        page_size = api_settings.PAGE_SIZE
+        if page_size is None or len(plans) <= page_size:
+            list_body = renderer.render(
+                all_data if page_size is None else {
+                    'count': len(plans),
+                    'next': None,
+                    'previous': None,
+                    'results': all_data,
+                }
+            )
+            list_etag = self._etag(list_body)
+
+        return PlanCatalogSnapshot(
+            version=version,
+            active_body=active_body,
+            active_etag=self._etag(active_body),
+            list_body=list_body,
+            list_etag=list_etag,
+        )
+
+    @classmethod
+    def get_instance(cls) -> 'PlanCatalogCache':
+        """Método para obter a instância do Singleton"""
+        if cls._instance is None:
+            return cls()
+        return cls._instance
@@ -0,0 +1,111 @@
+import random
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from subscription_plans.models import Subscription, SubscriptionPlan, SubscriptionPlanCounter
+
+
+class PlanCounterService:
+    """
+    Classe de serviço dos contadores de assinantes ativos por plano.
+    
+    Os contadores são atualizados junto com as métricas de receita a cada
+    transição de assinatura e corrigidos periodicamente por `reconcile`,
+    de modo que a leitura não precise contar a tabela de assinaturas.
+    """
+    
+    SHARDS = 8
+    
+    @staticmethod
+    def increment(plan_id, delta):
+        """
+        Soma a variação a uma fração sorteada do contador do plano.
+        
+        Args:
+            plan_id (int): ID do plano.
+            delta (int): Variação de assinantes ativos.
+        """
+        if not delta or plan_id is None:
+            return
+        
+        shard = random.randrange(PlanCounterService.SHARDS)
+        queryset = SubscriptionPlanCounter.objects.filter(plan_id=plan_id, shard=shard)
+        
+        if queryset.update(active_subscribers=F('active_subscribers') + delta):
+            return
+        
+        try:
+            with transaction.atomic():
+                SubscriptionPlanCounter.objects.create(
+                    plan_id=plan_id,
+                    shard=shard,
+                    active_subscribers=delta
+                )
+        except IntegrityError:
+            # Outro processo criou a fração entre o update e o insert
+            queryset.update(active_subscribers=F('active_subscribers') + delta)
+    
+    @staticmethod
+    def get_active_subscribers():
+        """
+        Retorna o número de assinantes ativos de cada plano.
+        
+        Returns:
+            dict: Mapeamento de ID do plano para assinantes ativos.
+        """
+        return dict(
+            SubscriptionPlanCounter.objects.values('plan_id')
+            .annotate(total=Sum('active_subscribers'))
+            .values_list('plan_id', 'total')
+        )
+    
+    @staticmethod
+    def get_plan_summaries():
+        """
+        Retorna os planos com seus números de assinantes ativos.
+        
+        Returns:
+            list: Dicionários com ID, nome, situação e assinantes ativos do plano.
+        """
+        counts = PlanCounterService.get_active_subscribers()
+        return [
+            {**plan, 'active_subscribers': counts.get(plan['id'], 0)}
+            for plan in SubscriptionPlan.objects.values('id', 'name', 'is_active')
+        ]
+    
+    @staticmethod
+    @transaction.atomic
+    def reconcile():
+        """
+        Corrige a diferença entre os contadores e a contagem real.
+        
+        As frações são bloqueadas antes da contagem, para que transações
+        em andamento que alteraram os contadores sejam incluídas nela.
+        A correção é somada à fração 0 de cada plano divergente.
+        
+        Returns:
+            int: Número de planos corrigidos.
+        """
+        list(SubscriptionPlanCounter.objects.select_for_update().values_list('id', flat=True))
+        
+        counted = dict(
+            Subscription.objects.filter(status=Subscription.ACTIVE)
+            .values('plan_id')
+            .annotate(total=Count('id'))
+            .values_list('plan_id', 'total')
+        )
+        stored = PlanCounterService.get_active_subscribers()
+        
+        corrected = 0
+        for plan_id in SubscriptionPlan.objects.values_list('id', flat=True):
+            drift = counted.get(plan_id, 0) - stored.get(plan_id, 0)
+            if not drift:
+                continue
+            
+            counter, _ = SubscriptionPlanCounter.objects.get_or_create(plan_id=plan_id, shard=0)
+            counter.active_subscribers = F('active_subscribers') + drift
+            counter.save(update_fields=['active_subscribers'])
+            corrected += 1
+        
+        return corrected
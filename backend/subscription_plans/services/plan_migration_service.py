@@ -0,0 +1,173 @@
+import time
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from subscription_plans.models import PlanMigrationJob, Subscription
+from subscription_plans.services.analytics_service import SubscriptionAnalyticsService
+
+
+class PlanMigrationService:
+    """
+    Classe de serviço para a migração de assinantes entre planos.
+    
+    As assinaturas abertas (ativas e pendentes) do plano de origem são
+    percorridas por ID em lotes, cada lote atualizado com um UPDATE em uma
+    transação curta. O progresso fica em `PlanMigrationJob`, permitindo
+    retomar a migração. Assinaturas encerradas e arquivadas permanecem no
+    plano em que foram cobradas, preservando o histórico de receita.
+    """
+    
+    OPEN_STATUSES = (Subscription.ACTIVE, Subscription.PENDING)
+    
+    @staticmethod
+    def start_or_resume(from_plan, to_plan):
+        """
+        Retorna a migração em andamento entre os planos ou inicia uma nova.
+        
+        Args:
+            from_plan (SubscriptionPlan): Plano de origem.
+            to_plan (SubscriptionPlan): Plano de destino.
+            
+        Returns:
+            PlanMigrationJob: Migração a executar.
+            
+        Raises:
+            ValueError: Se os planos forem iguais ou o destino estiver inativo.
+        """
+        if from_plan.pk == to_plan.pk:
+            raise ValueError("Os planos de origem e destino devem ser diferentes.")
+        
+        if not to_plan.is_active:
+            raise ValueError("O plano de destino não está ativo.")
+        
+        job, _ = PlanMigrationJob.objects.get_or_create(
+            from_plan=from_plan,
+            to_plan=to_plan,
+            status=PlanMigrationJob.RUNNING
+        )
+        return job
+    
+    @staticmethod
+    def get_remaining_count(job):
+        """
+        Conta as assinaturas abertas ainda não migradas.
+        
+        Args:
+            job (PlanMigrationJob): Migração em andamento.
+            
+        Returns:
+            int: Assinaturas restantes.
+        """
+        return Subscription.objects.filter(
+            plan_id=job.from_plan_id,
+            status__in=PlanMigrationService.OPEN_STATUSES,
+            id__gt=job.last_subscription_id
+        ).count()
+    
+    @staticmethod
+    @transaction.atomic
+    def migrate_batch(job, batch_size):
+        """
+        Migra um lote de assinaturas abertas.
+        
+        As assinaturas passam a pagar o preço do novo plano e mantêm os
+        suplementos já utilizados no período.
+        
+        Args:
+            job (PlanMigrationJob): Migração em andamento.
+            batch_size (int): Quantidade máxima de assinaturas no lote.
+            
+        Returns:
+            int: Número de assinaturas migradas.
+        """
+        from_plan, to_plan = job.from_plan, job.to_plan
+        rows = list(
+            Subscription.objects.select_for_update()
+            .filter(
+                plan_id=from_plan.id,
+                status__in=PlanMigrationService.OPEN_STATUSES,
+                id__gt=job.last_subscription_id
+            )
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not rows:
+            return 0
+        
+        batch = Subscription.objects.filter(id__in=rows)
+        active = batch.filter(status=Subscription.ACTIVE).aggregate(
+            count=Count('id'),
+            mrr=Sum('price_paid')
+        )
+        
+        batch.update(
+            plan_id=to_plan.id,
+            price_paid=to_plan.price,
+            remaining_supplements=Greatest(
+                F('remaining_supplements')
+                + (to_plan.supplements_per_month - from_plan.supplements_per_month),
+                Value(0),
+                output_field=IntegerField()
+            ),
+            updated_at=timezone.now()
+        )
+        
+        SubscriptionAnalyticsService.record_plan_migration(
+            from_plan.id,
+            to_plan.id,
+            active['count'],
+            active['mrr'],
+            to_plan.price * active['count']
+        )
+        
+        job.last_subscription_id = rows[-1]
+        job.migrated_count += len(rows)
+        job.save(update_fields=['last_subscription_id', 'migrated_count', 'updated_at'])
+        
+        return len(rows)
+    
+    @staticmethod
+    def migrate_subscribers(from_plan, to_plan, batch_size=1000, pause=0,
+                            deactivate_source=False, stdout=None):
+        """
+        Migra os assinantes ativos e pendentes de um plano para outro, lote a lote.
+        
+        Uma migração interrompida é retomada do último lote concluído.
+        
+        Args:
+            from_plan (SubscriptionPlan): Plano de origem.
+            to_plan (SubscriptionPlan): Plano de destino.
+            batch_size (int): Quantidade de assinaturas por transação.
+            pause (float): Intervalo, em segundos, entre os lotes.
+            deactivate_source (bool): Se verdadeiro, desativa o plano de origem ao final.
+            stdout: Saída opcional para mensagens de progresso.
+            
+        Returns:
+            PlanMigrationJob: Migração concluída.
+        """
+        job = PlanMigrationService.start_or_resume(from_plan, to_plan)
+        done = job.migrated_count
+        total = done + PlanMigrationService.get_remaining_count(job)
+        
+        while True:
+            migrated = PlanMigrationService.migrate_batch(job, batch_size)
+            done += migrated
+            if stdout is not None and migrated:
+                stdout.write(f'{done}/{total} assinaturas migradas.')
+            if migrated < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+        
+        job.status = PlanMigrationJob.COMPLETED
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+        
+        if deactivate_source and from_plan.is_active:
+            from_plan.is_active = False
+            from_plan.save(update_fields=['is_active', 'updated_at'])
+        
+        return job
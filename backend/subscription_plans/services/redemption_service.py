@@ -0,0 +1,376 @@
+import atexit
+import threading
+from datetime import timedelta
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from core.db_connection import LoggerManager
+from subscription_plans.models import (
+    RedemptionRollupWatermark,
+    SupplementRedemption,
+    SupplementUsageRollup,
+)
+
+
+class RedemptionLedgerWriter:
+    """
+    Singleton que grava o registro de resgates em lotes.
+
+    Os resgates são acumulados em memória após o commit da transação que
+    os originou e gravados com um único INSERT quando o lote enche ou
+    fica mais velho que `MAX_AGE` segundos, além de na saída do processo.
+
+    Um lote que falha volta para o buffer e é tentado de novo no próximo
+    ciclo; após `MAX_ATTEMPTS` falhas seguidas os resgates são gravados um
+    a um, e apenas os que ainda falharem são descartados, com os dados de
+    cada um no log de erros.
+    """
+    BATCH_SIZE = 500
+    MAX_AGE = 2.0
+    MAX_ATTEMPTS = 5
+
+    _instance: Optional['RedemptionLedgerWriter'] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(RedemptionLedgerWriter, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._buffer: List[SupplementRedemption] = []
+        self._buffer_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._failures = 0
+        atexit.register(self.flush)
+
+    @classmethod
+    def get_instance(cls) -> 'RedemptionLedgerWriter':
+        """Retorna a instância única do gravador"""
+        return cls()
+
+    def record(self, subscription_id, supplement_id, store_id=None, redeemed_at=None):
+        """
+        Agenda o registro de um resgate para depois do commit da transação corrente.
+        """
+        redemption = SupplementRedemption(
+            subscription_id=subscription_id,
+            supplement_id=supplement_id,
+            store_id=store_id,
+            redeemed_at=redeemed_at or timezone.now()
+        )
+        transaction.on_commit(lambda: self._append(redemption))
+
+    def _schedule(self):
+        # Chamado com `_buffer_lock` adquirido
+        if self._timer is None:
+            self._timer = threading.Timer(self.MAX_AGE, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _append(self, redemption: SupplementRedemption):
+        with self._buffer_lock:
+            self._buffer.append(redemption)
+            full = len(self._buffer) >= self.BATCH_SIZE
+            if not full:
+                self._schedule()
+
+        if full:
+            self.flush()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # A conexão pertence à thread do timer e não seria reaproveitada
+            connection.close()
+
+    def flush(self) -> int:
+        """
+        Grava os resgates acumulados.
+
+        Returns:
+            int: Número de resgates gravados.
+        """
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not batch:
+            return 0
+
+        try:
+            # Lotes acima de BATCH_SIZE viram vários INSERTs: todos ou nenhum
+            with transaction.atomic():
+                SupplementRedemption.objects.bulk_create(batch, batch_size=self.BATCH_SIZE)
+        except Exception as e:
+            return self._handle_failure(batch, e)
+
+        self._failures = 0
+        self._invalidate_dashboards(batch)
+        return len(batch)
+
+    @staticmethod
+    def _invalidate_dashboards(redemptions):
+        """
+        Descarta os painéis dos proprietários das lojas dos resgates gravados,
+        cujas comissões do mês mudaram.
+        """
+        # Importação local: o app de lojas parceiras depende deste app
+        from partner_stores.services.store_service import PartnerStoreService
+
+        store_ids = {redemption.store_id for redemption in redemptions} - {None}
+        if not store_ids:
+            return
+        try:
+            PartnerStoreService.invalidate_store_dashboards(store_ids)
+        except Exception as e:
+            # Os painéis ainda vencem pelo TTL
+            LoggerManager.get_instance().error(f"Erro ao descartar os painéis das lojas: {e}")
+
+    def _handle_failure(self, batch, error):
+        """
+        Devolve o lote ao buffer para uma nova tentativa ou, esgotadas as
+        tentativas, grava os resgates individualmente.
+
+        Returns:
+            int: Número de resgates gravados.
+        """
+        self._failures += 1
+        LoggerManager.get_instance().error(
+            f"Erro ao gravar {len(batch)} resgates de suplementos "
+            f"(tentativa {self._failures}/{self.MAX_ATTEMPTS}): {error}"
+        )
+
+        if self._failures < self.MAX_ATTEMPTS:
+            with self._buffer_lock:
+                self._buffer = batch + self._buffer
+                self._schedule()
+            return 0
+
+        self._failures = 0
+        written = 0
+        for redemption in batch:
+            try:
+                with transaction.atomic():
+                    redemption.save(force_insert=True)
+                written += 1
+            except Exception as e:
+                LoggerManager.get_instance().error(
+                    f"Resgate descartado: assinatura {redemption.subscription_id}, "
+                    f"suplemento {redemption.supplement_id}, loja {redemption.store_id}, "
+                    f"em {redemption.redeemed_at.isoformat()}: {e}"
+                )
+        self._invalidate_dashboards(batch)
+        return written
+
+
+class RedemptionRollupService:
+    """
+    Classe de serviço das consolidações horárias e diárias de resgates.
+
+    Cada execução consolida apenas os períodos fechados após a última
+    marca. Horas são fechadas com `SETTLE_DELAY` de atraso, margem para
+    os lotes ainda em memória no gravador.
+    """
+
+    SETTLE_DELAY = timedelta(minutes=5)
+    MAX_WINDOW = timedelta(days=7)
+
+    @staticmethod
+    def _floor_hour(moment):
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _floor_day(moment):
+        return timezone.localtime(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _get_watermark(granularity, default):
+        watermark, _ = RedemptionRollupWatermark.objects.select_for_update().get_or_create(
+            granularity=granularity,
+            defaults={'processed_until': default}
+        )
+        return watermark
+
+    @staticmethod
+    @transaction.atomic
+    def rollup_hours(now=None):
+        """
+        Consolida por hora os resgates das horas fechadas ainda não consolidadas.
+
+        Args:
+            now (datetime, opcional): Momento de referência. Por padrão, agora.
+
+        Returns:
+            int: Número de linhas de consolidação gravadas, ou None se não
+            havia hora fechada a consolidar.
+        """
+        now = now or timezone.now()
+        end = RedemptionRollupService._floor_hour(now - RedemptionRollupService.SETTLE_DELAY)
+
+        first = SupplementRedemption.objects.order_by('redeemed_at').values_list(
+            'redeemed_at', flat=True
+        ).first()
+        if first is None:
+            return None
+
+        watermark = RedemptionRollupService._get_watermark(
+            SupplementUsageRollup.HOUR, RedemptionRollupService._floor_hour(first)
+        )
+        start = watermark.processed_until
+        end = min(end, start + RedemptionRollupService.MAX_WINDOW)
+        if start >= end:
+            return None
+
+        rows = (
+            SupplementRedemption.objects.filter(redeemed_at__gte=start, redeemed_at__lt=end)
+            .annotate(period_start=TruncHour('redeemed_at'))
+            .values('period_start', 'supplement_id', 'store_id')
+            .annotate(redemptions=Count('id'))
+            .order_by()
+        )
+        created = RedemptionRollupService._replace_rollups(
+            SupplementUsageRollup.HOUR, start, end, rows
+        )
+
+        watermark.processed_until = end
+        watermark.save(update_fields=['processed_until'])
+        return created
+
+    @staticmethod
+    @transaction.atomic
+    def rollup_days():
+        """
+        Consolida por dia as horas de dias inteiros já consolidados.
+
+        Returns:
+            int: Número de linhas de consolidação gravadas.
+        """
+        hours = RedemptionRollupWatermark.objects.filter(
+            granularity=SupplementUsageRollup.HOUR
+        ).first()
+        if hours is None:
+            return 0
+
+        first = SupplementUsageRollup.objects.filter(
+            granularity=SupplementUsageRollup.HOUR
+        ).order_by('period_start').values_list('period_start', flat=True).first()
+        if first is None:
+            return 0
+
+        watermark = RedemptionRollupService._get_watermark(
+            SupplementUsageRollup.DAY, RedemptionRollupService._floor_day(first)
+        )
+        start = watermark.processed_until
+        end = RedemptionRollupService._floor_day(hours.processed_until)
+        if start >= end:
+            return 0
+
+        rows = (
+            SupplementUsageRollup.objects.filter(
+                granularity=SupplementUsageRollup.HOUR,
+                period_start__gte=start,
+                period_start__lt=end
+            )
+            .annotate(day=TruncDay('period_start'))
+            .values('day', 'supplement_id', 'store_id')
+            .annotate(total=Sum('redemptions'))
+            .order_by()
+        )
+        created = RedemptionRollupService._replace_rollups(
+            SupplementUsageRollup.DAY,
+            start,
+            end,
+            (
+                {
+                    'period_start': row['day'],
+                    'supplement_id': row['supplement_id'],
+                    'store_id': row['store_id'],
+                    'redemptions': row['total'],
+                }
+                for row in rows
+            )
+        )
+
+        watermark.processed_until = end
+        watermark.save(update_fields=['processed_until'])
+        return created
+
+    @staticmethod
+    def _replace_rollups(granularity, start, end, rows):
+        """
+        Substitui as consolidações do intervalo, tornando a execução repetível.
+        """
+        SupplementUsageRollup.objects.filter(
+            granularity=granularity,
+            period_start__gte=start,
+            period_start__lt=end
+        ).delete()
+        rollups = SupplementUsageRollup.objects.bulk_create(
+            [SupplementUsageRollup(granularity=granularity, **row) for row in rows],
+            batch_size=1000
+        )
+        return len(rollups)
+
+    @staticmethod
+    def rollup(now=None):
+        """
+        Consolida todas as horas e dias pendentes.
+
+        Args:
+            now (datetime, opcional): Momento de referência. Por padrão, agora.
+
+        Returns:
+            tuple: Linhas horárias e diárias gravadas.
+        """
+        hourly = 0
+        while True:
+            created = RedemptionRollupService.rollup_hours(now)
+            if created is None:
+                break
+            hourly += created
+
+        return hourly, RedemptionRollupService.rollup_days()
+
+    @staticmethod
+    def get_usage(start, end, granularity=SupplementUsageRollup.DAY,
+                  supplement_id=None, store_id=None):
+        """
+        Retorna os resgates consolidados do intervalo.
+
+        Args:
+            start (datetime): Início do intervalo.
+            end (datetime): Fim (exclusivo) do intervalo.
+            granularity (str): 'hour' ou 'day'.
+            supplement_id (int, opcional): Filtra por suplemento.
+            store_id (int, opcional): Filtra por loja parceira.
+
+        Returns:
+            QuerySet: Dicionários com período, suplemento, loja e resgates.
+        """
+        rollups = SupplementUsageRollup.objects.filter(
+            granularity=granularity,
+            period_start__gte=start,
+            period_start__lt=end
+        )
+        if supplement_id is not None:
+            rollups = rollups.filter(supplement_id=supplement_id)
+        if store_id is not None:
+            rollups = rollups.filter(store_id=store_id)
+
+        return rollups.order_by('period_start', 'supplement_id', 'store_id').values(
+            'period_start', 'supplement_id', 'store_id', 'redemptions'
+        )
@@ -0,0 +1,386 @@
+import time
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from core.db_connection import LoggerManager
+from subscription_plans.models import Subscription, ScheduledSubscriptionEvent
+from subscription_plans.services.analytics_service import SubscriptionAnalyticsService
+
+
+class SubscriptionSchedulerService:
+    """
+    Classe de serviço do agendador de eventos de assinatura.
+
+    Mantém os eventos de aviso, renovação e expiração em baldes diários
+    e os despacha em lotes quando o balde vence. O trabalho de cada dia é
+    proporcional ao número de eventos vencidos, não ao tamanho da tabela.
+
+    A entrega é "ao menos uma vez": um evento reservado por um processo
+    que parou volta a ser elegível quando a reserva expira. Um evento cujo
+    despacho falhou volta a pendente com `locked_until` no horário da nova
+    tentativa, com espera exponencial entre as tentativas.
+    """
+
+    NOTIFY_DAYS_BEFORE = 7
+    LEASE_SECONDS = 300
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_SECONDS = 30
+
+    @staticmethod
+    def build_events(subscription):
+        """
+        Monta os eventos de uma assinatura ativa a partir da data de término.
+
+        Args:
+            subscription (Subscription): Assinatura a agendar.
+
+        Returns:
+            list: Eventos (não salvos) da assinatura.
+        """
+        today = date.today()
+        notify_date = subscription.end_date - timedelta(
+            days=SubscriptionSchedulerService.NOTIFY_DAYS_BEFORE
+        )
+
+        events = [
+            ScheduledSubscriptionEvent(
+                subscription=subscription,
+                action=ScheduledSubscriptionEvent.NOTIFY,
+                due_date=max(notify_date, today)
+            ),
+            ScheduledSubscriptionEvent(
+                subscription=subscription,
+                action=ScheduledSubscriptionEvent.EXPIRE,
+                due_date=subscription.end_date + timedelta(days=1)
+            ),
+        ]
+        if subscription.renewal_enabled:
+            events.append(ScheduledSubscriptionEvent(
+                subscription=subscription,
+                action=ScheduledSubscriptionEvent.RENEW,
+                due_date=subscription.end_date
+            ))
+        return events
+
+    @staticmethod
+    def schedule_subscription(subscription):
+        """
+        Agenda (ou reagenda) os eventos de uma assinatura ativa.
+
+        Args:
+            subscription (Subscription): Assinatura a agendar.
+        """
+        if subscription.status != Subscription.ACTIVE:
+            return
+
+        SubscriptionSchedulerService.schedule_many([subscription])
+
+    @staticmethod
+    def schedule_many(subscriptions):
+        """
+        Agenda os eventos de várias assinaturas em um único comando.
+
+        Eventos já existentes para a mesma ação são reagendados.
+
+        Args:
+            subscriptions: Iterável de assinaturas ativas.
+        """
+        events = [
+            event
+            for subscription in subscriptions
+            for event in SubscriptionSchedulerService.build_events(subscription)
+        ]
+        ScheduledSubscriptionEvent.objects.bulk_create(
+            events,
+            update_conflicts=True,
+            unique_fields=['subscription', 'action'],
+            update_fields=['due_date', 'status', 'attempts', 'locked_until', 'processed_at'],
+        )
+
+    @staticmethod
+    def cancel_events(subscription):
+        """
+        Remove os eventos ainda não executados de uma assinatura.
+
+        Args:
+            subscription (Subscription): Assinatura encerrada.
+        """
+        ScheduledSubscriptionEvent.objects.filter(
+            subscription=subscription,
+            status=ScheduledSubscriptionEvent.PENDING
+        ).delete()
+
+    @staticmethod
+    def _due_filter(now):
+        # Pendentes sem espera de nova tentativa, ou reservas expiradas
+        return Q(status=ScheduledSubscriptionEvent.PENDING, locked_until__isnull=True) | Q(
+            status__in=[ScheduledSubscriptionEvent.PENDING, ScheduledSubscriptionEvent.PROCESSING],
+            locked_until__lt=now
+        )
+
+    @staticmethod
+    def claim_due_events(batch_size):
+        """
+        Reserva um lote de eventos vencidos.
+
+        Linhas já reservadas por outro processo são ignoradas, o que
+        permite executar mais de um agendador ao mesmo tempo.
+
+        Args:
+            batch_size (int): Quantidade máxima de eventos reservados.
+
+        Returns:
+            list: Eventos reservados.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            events = list(
+                ScheduledSubscriptionEvent.objects.select_for_update(skip_locked=True)
+                .filter(SubscriptionSchedulerService._due_filter(now), due_date__lte=date.today())
+                .order_by('due_date', 'id')[:batch_size]
+            )
+            ScheduledSubscriptionEvent.objects.filter(
+                id__in=[event.id for event in events]
+            ).update(
+                status=ScheduledSubscriptionEvent.PROCESSING,
+                locked_until=now + timedelta(seconds=SubscriptionSchedulerService.LEASE_SECONDS),
+                attempts=F('attempts') + 1
+            )
+        return events
+
+    @staticmethod
+    def _mark_done(event_ids):
+        ScheduledSubscriptionEvent.objects.filter(id__in=event_ids).update(
+            status=ScheduledSubscriptionEvent.DONE,
+            locked_until=None,
+            processed_at=timezone.now()
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def _dispatch_expire(events):
+        """
+        Expira em um único UPDATE as assinaturas do lote ainda ativas.
+        """
+        expired = list(
+            Subscription.objects.select_for_update().filter(
+                id__in=[event.subscription_id for event in events],
+                status=Subscription.ACTIVE,
+                end_date__lt=date.today()
+            ).values_list('id', 'plan_id', 'price_paid')
+        )
+        Subscription.objects.filter(
+            id__in=[subscription_id for subscription_id, _, _ in expired]
+        ).update(status=Subscription.EXPIRED, updated_at=timezone.now())
+
+        SubscriptionAnalyticsService.record_expired(
+            (plan_id, price_paid) for _, plan_id, price_paid in expired
+        )
+        SubscriptionSchedulerService._mark_done([event.id for event in events])
+
+    @staticmethod
+    @transaction.atomic
+    def _dispatch_notify(events):
+        """
+        Avisa os usuários das assinaturas do lote que estão para vencer.
+        """
+        subscriptions = Subscription.objects.filter(
+            id__in=[event.subscription_id for event in events],
+            status=Subscription.ACTIVE
+        ).select_related('user')
+
+        logger = LoggerManager.get_instance()
+        for subscription in subscriptions:
+            # Aqui seria implementado o envio do e-mail de aviso
+            logger.info(
+                f"Assinatura {subscription.id} de {subscription.user.email} "
+                f"vence em {subscription.end_date}"
+            )
+        SubscriptionSchedulerService._mark_done([event.id for event in events])
+
+    @staticmethod
+    @transaction.atomic
+    def _dispatch_renew(event):
+        """
+        Renova a assinatura do evento, se ainda estiver ativa e com
+        renovação automática habilitada.
+        """
+        # Importação local: SubscriptionService agenda eventos deste serviço
+        from subscription_plans.services.subscription_service import SubscriptionService
+
+        subscription = Subscription.objects.select_for_update().filter(
+            id=event.subscription_id,
+            status=Subscription.ACTIVE,
+            renewal_enabled=True
+        ).first()
+        if subscription is not None:
+            SubscriptionService.renew_subscription(subscription)
+        SubscriptionSchedulerService._mark_done([event.id])
+
+    @staticmethod
+    def _release_failed(events, error):
+        """
+        Registra a falha de um lote; eventos que esgotaram as tentativas
+        são marcados como falhos e os demais voltam a pendentes, com a
+        próxima tentativa após uma espera exponencial.
+        """
+        service = SubscriptionSchedulerService
+        LoggerManager.get_instance().error(
+            f"Erro ao despachar eventos de assinatura: {error}",
+            extra={'event_ids': [event.id for event in events]}
+        )
+        event_ids = [event.id for event in events]
+        ScheduledSubscriptionEvent.objects.filter(
+            id__in=event_ids,
+            attempts__gte=service.MAX_ATTEMPTS
+        ).update(status=ScheduledSubscriptionEvent.FAILED, locked_until=None)
+
+        now = timezone.now()
+        retries = ScheduledSubscriptionEvent.objects.filter(
+            id__in=event_ids,
+            status=ScheduledSubscriptionEvent.PROCESSING
+        )
+        # `attempts` já inclui a tentativa que falhou
+        for attempts in set(retries.values_list('attempts', flat=True)):
+            retries.filter(attempts=attempts).update(
+                status=ScheduledSubscriptionEvent.PENDING,
+                locked_until=now + timedelta(seconds=service.RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+            )
+
+    @staticmethod
+    def dispatch_due_events(batch_size=500):
+        """
+        Reserva e despacha um lote de eventos vencidos.
+
+        Avisos e expirações são processados em lote; renovações, que
+        criam novas assinaturas, uma a uma.
+
+        Args:
+            batch_size (int): Quantidade máxima de eventos do lote.
+
+        Returns:
+            int: Número de eventos reservados.
+        """
+        events = SubscriptionSchedulerService.claim_due_events(batch_size)
+
+        by_action = {}
+        for event in events:
+            by_action.setdefault(event.action, []).append(event)
+
+        # Renovações antes das expirações, para que a assinatura renovada
+        # ainda esteja ativa quando for avaliada
+        for event in by_action.get(ScheduledSubscriptionEvent.RENEW, []):
+            try:
+                SubscriptionSchedulerService._dispatch_renew(event)
+            except Exception as e:
+                SubscriptionSchedulerService._release_failed([event], e)
+
+        for action, dispatch in (
+            (ScheduledSubscriptionEvent.NOTIFY, SubscriptionSchedulerService._dispatch_notify),
+            (ScheduledSubscriptionEvent.EXPIRE, SubscriptionSchedulerService._dispatch_expire),
+        ):
+            batch = by_action.get(action)
+            if not batch:
+                continue
+            try:
+                dispatch(batch)
+            except Exception as e:
+                SubscriptionSchedulerService._release_failed(batch, e)
+
+        return len(events)
+
+    @staticmethod
+    def seconds_until_next_bucket(max_sleep, poll_interval):
+        """
+        Calcula quanto o agendador pode dormir até o próximo evento elegível.
+
+        Eventos vencidos reservados por outro processo ou aguardando nova
+        tentativa só acordam o agendador quando a reserva ou a espera termina.
+
+        Args:
+            max_sleep (float): Tempo máximo de espera, em segundos.
+            poll_interval (float): Espera quando há eventos vencidos elegíveis
+                (reservados por outro processo entre a consulta e o despacho).
+
+        Returns:
+            float: Segundos até o próximo despacho.
+        """
+        now = timezone.now()
+        today = date.today()
+        waiting = ScheduledSubscriptionEvent.objects.filter(
+            status__in=[ScheduledSubscriptionEvent.PENDING, ScheduledSubscriptionEvent.PROCESSING]
+        )
+        if waiting.filter(SubscriptionSchedulerService._due_filter(now), due_date__lte=today).exists():
+            return poll_interval
+
+        wake_times = []
+        next_unlock = waiting.filter(due_date__lte=today).aggregate(
+            next_unlock=Min('locked_until')
+        )['next_unlock']
+        if next_unlock is not None:
+            wake_times.append(next_unlock)
+
+        next_due = waiting.filter(due_date__gt=today).aggregate(next_due=Min('due_date'))['next_due']
+        if next_due is not None:
+            wake_times.append(timezone.make_aware(datetime.combine(next_due, datetime.min.time())))
+
+        if not wake_times:
+            return max_sleep
+        return min(max((min(wake_times) - now).total_seconds(), 0), max_sleep)
+
+    @staticmethod
+    def schedule_existing(chunk_size=1000):
+        """
+        Agenda os eventos de todas as assinaturas ativas, lendo-as em blocos.
+
+        Usado uma única vez para popular o índice de eventos.
+
+        Args:
+            chunk_size (int): Quantidade de assinaturas por bloco.
+
+        Returns:
+            int: Número de assinaturas agendadas.
+        """
+        total = 0
+        last_id = 0
+        while True:
+            chunk = list(
+                Subscription.objects.filter(status=Subscription.ACTIVE, id__gt=last_id)
+                .order_by('id')[:chunk_size]
+            )
+            if not chunk:
+                return total
+            SubscriptionSchedulerService.schedule_many(chunk)
+            total += len(chunk)
+            last_id = chunk[-1].id
+
+    @staticmethod
+    def run_forever(batch_size=500, max_sleep=300, poll_interval=5, once=False, stdout=None):
+        """
+        Laço principal do agendador.
+
+        Despacha lotes enquanto houver eventos vencidos e então dorme até
+        o próximo balde (limitado a `max_sleep`, para perceber eventos
+        agendados depois que o laço adormeceu).
+
+        Args:
+            batch_size (int): Quantidade máxima de eventos por lote.
+            max_sleep (float): Tempo máximo de espera, em segundos.
+            poll_interval (float): Espera quando há eventos vencidos elegíveis não despachados.
+            once (bool): Se verdadeiro, despacha os eventos vencidos e retorna.
+            stdout: Saída opcional para mensagens de progresso.
+        """
+        while True:
+            dispatched = SubscriptionSchedulerService.dispatch_due_events(batch_size)
+            if stdout is not None and dispatched:
+                stdout.write(f'{dispatched} eventos despachados.')
+            if dispatched == batch_size:
+                continue
+            if once:
+                return
+            time.sleep(
+                SubscriptionSchedulerService.seconds_until_next_bucket(max_sleep, poll_interval)
+            )
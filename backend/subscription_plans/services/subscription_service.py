@@ -1,6 +1,12 @@
 from datetime import date, timedelta
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
 from subscription_plans.models import Subscription
+from subscription_plans.services.analytics_service import SubscriptionAnalyticsService
+from subscription_plans.services.redemption_service import RedemptionLedgerWriter
+from subscription_plans.services.scheduler_service import SubscriptionSchedulerService
+from supplements.services import StoreInventoryService
 
 
 class SubscriptionService:
@@ -22,10 +28,14 @@ class SubscriptionService:
         Returns:
             Subscription: Assinatura cancelada.
         """
+        previous_status = subscription.status
         subscription.status = Subscription.CANCELLED
         subscription.renewal_enabled = False
         subscription.save()
         
+        SubscriptionAnalyticsService.record_cancelled(subscription, previous_status)
+        SubscriptionSchedulerService.cancel_events(subscription)
+        
         return subscription
     
     @staticmethod
@@ -34,12 +44,23 @@ class SubscriptionService:
         """
         Renova uma assinatura criando uma nova.
         
+        Como o usuário só pode ter uma assinatura ativa, a assinatura
+        renovada é encerrada antes da criação da nova; os suplementos
+        ainda não utilizados de um período em curso passam para a nova
+        assinatura e o saldo da renovada é zerado. A linha renovada fica
+        travada até o fim da transação, então um resgate simultâneo não
+        é contado nas duas assinaturas.
+        
         Args:
             subscription (Subscription): Assinatura a ser renovada.
             
         Returns:
             Subscription: Nova assinatura criada.
         """
+        subscription = Subscription.objects.select_for_update().select_related(
+            'plan'
+        ).get(pk=subscription.pk)
+        
         # Verificar se a assinatura pode ser renovada
         if not subscription.renewal_enabled:
             raise ValueError("Esta assinatura não está habilitada para renovação automática.")
@@ -48,6 +69,22 @@ class SubscriptionService:
         start_date = max(subscription.end_date, date.today())
         end_date = start_date + timedelta(days=30)
         
+        remaining_supplements = subscription.plan.supplements_per_month
+        
+        # Encerrar a assinatura atual, liberando a vaga de assinatura ativa
+        if subscription.status == Subscription.ACTIVE:
+            if subscription.end_date >= date.today():
+                remaining_supplements += subscription.remaining_supplements
+            
+            subscription.status = Subscription.EXPIRED
+            subscription.remaining_supplements = 0
+            subscription.save(update_fields=['status', 'remaining_supplements', 'updated_at'])
+            
+            SubscriptionAnalyticsService.record_expired(
+                [(subscription.plan_id, subscription.price_paid)]
+            )
+            SubscriptionSchedulerService.cancel_events(subscription)
+        
         # Criar nova assinatura
         new_subscription = Subscription.objects.create(
             user=subscription.user,
@@ -55,13 +92,136 @@ class SubscriptionService:
             status=Subscription.ACTIVE,
             start_date=start_date,
             end_date=end_date,
-            remaining_supplements=subscription.plan.supplements_per_month,
+            remaining_supplements=remaining_supplements,
             renewal_enabled=True,
             price_paid=subscription.plan.price
         )
         
+        SubscriptionAnalyticsService.record_renewed(new_subscription)
+        SubscriptionSchedulerService.schedule_subscription(new_subscription)
+        
         return new_subscription
     
+    @staticmethod
+    @transaction.atomic
+    def activate_subscription(user, plan, start_date, end_date,
+                              remaining_supplements=None, price_paid=None,
+                              renewal_enabled=True):
+        """
+        Cria a assinatura ativa do usuário ou troca o plano da atual.
+        
+        No PostgreSQL usa um único INSERT ... ON CONFLICT sobre o índice
+        único parcial de assinaturas ativas, sem a sequência
+        ler-verificar-gravar sujeita a condições de corrida.
+        
+        Args:
+            user: Usuário assinante.
+            plan (SubscriptionPlan): Plano da assinatura.
+            start_date (date): Data de início.
+            end_date (date): Data de término.
+            remaining_supplements (int, opcional): Suplementos disponíveis.
+                Por padrão, os do plano.
+            price_paid (Decimal, opcional): Valor pago. Por padrão, o preço do plano.
+            renewal_enabled (bool): Se a renovação automática está habilitada.
+            
+        Returns:
+            Subscription: Assinatura ativa do usuário.
+        """
+        values = {
+            'user_id': user.pk,
+            'plan_id': plan.pk,
+            'status': Subscription.ACTIVE,
+            'start_date': start_date,
+            'end_date': end_date,
+            'remaining_supplements': (
+                plan.supplements_per_month if remaining_supplements is None
+                else remaining_supplements
+            ),
+            'renewal_enabled': renewal_enabled,
+            'price_paid': plan.price if price_paid is None else price_paid,
+        }
+        
+        if connection.vendor == 'postgresql':
+            subscription_id, previous_plan_id, previous_price = (
+                SubscriptionService._upsert_active_subscription(values)
+            )
+        else:
+            subscription_id, previous_plan_id, previous_price = (
+                SubscriptionService._update_or_create_active_subscription(values)
+            )
+        
+        subscription = Subscription.objects.get(pk=subscription_id)
+        
+        if previous_plan_id is None:
+            SubscriptionAnalyticsService.record_created(subscription)
+        else:
+            SubscriptionAnalyticsService.record_plan_changed(
+                previous_plan_id, previous_price, subscription
+            )
+        SubscriptionSchedulerService.schedule_subscription(subscription)
+        
+        return subscription
+    
+    @staticmethod
+    def _upsert_active_subscription(values):
+        """
+        Executa o INSERT ... ON CONFLICT da assinatura ativa.
+        
+        A CTE bloqueia e lê a assinatura ativa anterior para que o
+        plano substituído seja conhecido sem uma consulta extra.
+        
+        Returns:
+            tuple: ID da assinatura e plano e valor anteriores (None se inserida).
+        """
+        opts = Subscription._meta
+        now = timezone.now()
+        values = {**values, 'created_at': now, 'updated_at': now}
+        columns = [opts.get_field(name).column for name in values]
+        updated = [
+            column for column in columns
+            if column not in ('user_id', 'status', 'created_at')
+        ]
+        
+        sql = f"""
+            WITH previous AS (
+                SELECT plan_id, price_paid FROM {opts.db_table}
+                WHERE user_id = %s AND status = %s
+                FOR UPDATE
+            )
+            INSERT INTO {opts.db_table} ({', '.join(columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+            ON CONFLICT (user_id) WHERE status = '{Subscription.ACTIVE}'
+            DO UPDATE SET {', '.join(f'{column} = EXCLUDED.{column}' for column in updated)}
+            RETURNING id, (SELECT plan_id FROM previous), (SELECT price_paid FROM previous)
+        """
+        params = [values['user_id'], Subscription.ACTIVE, *values.values()]
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()
+    
+    @staticmethod
+    def _update_or_create_active_subscription(values):
+        """
+        Alternativa ao upsert para bancos sem ON CONFLICT com predicado.
+        
+        Returns:
+            tuple: ID da assinatura e plano e valor anteriores (None se inserida).
+        """
+        current = Subscription.objects.select_for_update().filter(
+            user_id=values['user_id'],
+            status=Subscription.ACTIVE
+        ).first()
+        
+        if current is None:
+            return Subscription.objects.create(**values).pk, None, None
+        
+        previous_plan_id, previous_price = current.plan_id, current.price_paid
+        for attr, value in values.items():
+            setattr(current, attr, value)
+        current.save()
+        return current.pk, previous_plan_id, previous_price
+    
     @staticmethod
     def get_active_subscriptions():
         """
@@ -83,49 +243,94 @@ class SubscriptionService:
         Returns:
             Subscription: Assinatura ativa do usuário ou None.
         """
-        try:
-            return Subscription.objects.filter(
-                user=user,
-                status=Subscription.ACTIVE,
-                end_date__gte=date.today()
-            ).latest('created_at')
-        except Subscription.DoesNotExist:
-            return None
+        # O índice único parcial garante no máximo uma assinatura ativa
+        return Subscription.objects.filter(
+            user=user,
+            status=Subscription.ACTIVE,
+            end_date__gte=date.today()
+        ).first()
     
     @staticmethod
-    def use_supplement(subscription):
+    def use_supplement(subscription, supplement=None, store=None):
         """
         Utiliza um suplemento da assinatura.
         
+        O saldo de uma assinatura ativa e vigente é decrementado por um
+        UPDATE condicional, sem a leitura prévia sujeita a resgates
+        simultâneos; o resgate é registrado no histórico de resgates
+        quando o suplemento é informado. Com a loja e o suplemento, uma
+        unidade sai do estoque da loja na mesma transação, se a loja
+        controlar o estoque desse suplemento, ou da reserva que a
+        assinatura tiver nessa loja.
+        
         Args:
             subscription (Subscription): Assinatura a ser atualizada.
+            supplement (Supplement, opcional): Suplemento resgatado.
+            store (PartnerStore, opcional): Loja parceira do resgate.
             
         Returns:
             Subscription: Assinatura atualizada.
             
         Raises:
-            ValueError: Se não houver suplementos disponíveis.
+            ValueError: Se a assinatura não estiver ativa e vigente ou se não
+                houver suplementos disponíveis na assinatura ou no estoque da loja.
         """
-        if subscription.remaining_supplements <= 0:
-            raise ValueError("Não há suplementos disponíveis na assinatura.")
+        with transaction.atomic():
+            updated = Subscription.objects.filter(
+                pk=subscription.pk,
+                status=Subscription.ACTIVE,
+                end_date__gte=date.today(),
+                remaining_supplements__gt=0
+            ).update(
+                remaining_supplements=F('remaining_supplements') - 1,
+                updated_at=timezone.now()
+            )
+            if not updated:
+                if not SubscriptionService.get_active_subscriptions().filter(
+                    pk=subscription.pk,
+                    end_date__gte=date.today()
+                ).exists():
+                    raise ValueError("A assinatura não está ativa.")
+                raise ValueError("Não há suplementos disponíveis na assinatura.")
             
-        subscription.remaining_supplements -= 1
-        subscription.save()
+            if supplement is not None and store is not None:
+                StoreInventoryService.consume_for_redemption(store.pk, supplement.pk, subscription.pk)
+        
+        subscription.refresh_from_db(fields=['remaining_supplements', 'updated_at'])
+        
+        if supplement is not None:
+            RedemptionLedgerWriter.get_instance().record(
+                subscription.pk,
+                supplement.pk,
+                store.pk if store is not None else None
+            )
         
         return subscription
     
     @staticmethod
+    @transaction.atomic
     def check_subscriptions_to_expire():
         """
         Verifica assinaturas prestes a expirar e notifica usuários.
         
         Marca como expiradas assinaturas cuja data de término já passou.
+        Varre toda a tabela; o fluxo regular é o SubscriptionSchedulerService,
+        que despacha apenas os eventos vencidos.
         """
         # Marcar como expiradas
+        expired = list(
+            Subscription.objects.select_for_update().filter(
+                status=Subscription.ACTIVE,
+                end_date__lt=date.today()
+            ).values_list('id', 'plan_id', 'price_paid')
+        )
         Subscription.objects.filter(
-            status=Subscription.ACTIVE,
-            end_date__lt=date.today()
-        ).update(status=Subscription.EXPIRED)
+            id__in=[subscription_id for subscription_id, _, _ in expired]
+        ).update(status=Subscription.EXPIRED, updated_at=timezone.now())
+        
+        SubscriptionAnalyticsService.record_expired(
+            (plan_id, price_paid) for _, plan_id, price_paid in expired
+        )
         
         # Identificar assinaturas prestes a expirar (7 dias)
         soon_to_expire = Subscription.objects.filter(
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from subscription_plans.models import SubscriptionPlan
+from subscription_plans.services.plan_catalog_service import PlanCatalogCache
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def invalidate_plan_catalog(sender, instance, **kwargs):
+    """
+    Invalida o catálogo de planos em memória sempre que um plano
+    é criado, alterado ou removido.
+    """
+    PlanCatalogCache.get_instance().invalidate()
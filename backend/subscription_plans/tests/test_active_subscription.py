@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..factories import BasicPlanFactory, ProPlanFactory
+from ..models import Subscription, SubscriptionRevenueDelta
+from ..services import SubscriptionService
+
+
+class ActiveSubscriptionTests(TestCase):
+    """Testes para a restrição de uma assinatura ativa por usuário."""
+    
+    def setUp(self):
+        self.user = User.objects.create(username='cliente', email='cliente@example.com')
+        self.basic = BasicPlanFactory()
+        self.pro = ProPlanFactory()
+        self.pro.refresh_from_db()
+    
+    def _activate(self, plan):
+        return SubscriptionService.activate_subscription(
+            user=self.user,
+            plan=plan,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30)
+        )
+    
+    def test_database_rejects_second_active_subscription(self):
+        """Teste do índice único parcial de assinaturas ativas."""
+        self._activate(self.basic)
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Subscription.objects.create(
+                user=self.user,
+                plan=self.pro,
+                status=Subscription.ACTIVE,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                remaining_supplements=0,
+                price_paid=self.pro.price
+            )
+    
+    def test_activate_swaps_plan_of_active_subscription(self):
+        """Teste da troca de plano sobre a assinatura ativa existente."""
+        first = self._activate(self.basic)
+        upgraded = self._activate(self.pro)
+        
+        self.assertEqual(first.pk, upgraded.pk)
+        self.assertEqual(upgraded.plan, self.pro)
+        self.assertEqual(upgraded.price_paid, self.pro.price)
+        self.assertEqual(
+            Subscription.objects.filter(user=self.user, status=Subscription.ACTIVE).count(), 1
+        )
+        deltas = dict(SubscriptionRevenueDelta.objects.values_list('plan_id', 'active_delta'))
+        self.assertEqual(deltas, {self.basic.pk: 0, self.pro.pk: 1})
+    
+    def test_renew_replaces_active_subscription(self):
+        """Teste da renovação encerrando a assinatura renovada."""
+        current = self._activate(self.basic)
+        
+        renewed = SubscriptionService.renew_subscription(current)
+        current.refresh_from_db()
+        
+        self.assertEqual(current.status, Subscription.EXPIRED)
+        self.assertEqual(SubscriptionService.get_user_active_subscription(self.user), renewed)
+        # O saldo passa para a nova assinatura e não pode ser resgatado duas vezes
+        self.assertEqual(current.remaining_supplements, 0)
+        self.assertEqual(renewed.remaining_supplements, 2 * self.basic.supplements_per_month)
+    
+    def test_user_cannot_activate_subscription_for_another_user(self):
+        """Teste da criação de assinatura ativa em nome de outro usuário."""
+        current = self._activate(self.basic)
+        intruder = User.objects.create(username='intruso', email='intruso@example.com')
+        client = APIClient()
+        client.force_authenticate(intruder)
+        
+        response = client.post('/api/v1/subscription/subscriptions/', {
+            'user': self.user.pk,
+            'plan': self.pro.pk,
+            'status': Subscription.ACTIVE,
+            'start_date': str(date.today()),
+            'end_date': str(date.today() + timedelta(days=30)),
+            'remaining_supplements': self.pro.supplements_per_month,
+            'price_paid': str(self.pro.price),
+        }, format='json')
+        
+        self.assertEqual(response.status_code, 403)
+        current.refresh_from_db()
+        self.assertEqual(current.status, Subscription.ACTIVE)
+        self.assertEqual(current.plan, self.basic)
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription
+from ..services import SubscriptionService
+
+
+class AdminDashboardTests(TestCase):
+    """Testes para o resumo do painel administrativo."""
+    
+    url = '/api/v1/dashboard/'
+    
+    def setUp(self):
+        cache.clear()
+        self.plan = BasicPlanFactory()
+        self.admin = User.objects.create(
+            username='admin', email='admin@example.com', is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        
+        for index, status in enumerate([Subscription.ACTIVE, Subscription.CANCELLED]):
+            user = User.objects.create(username=f'cliente{index}', email=f'cliente{index}@example.com')
+            subscription = SubscriptionService.activate_subscription(
+                user=user,
+                plan=self.plan,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30)
+            )
+            if status == Subscription.CANCELLED:
+                SubscriptionService.cancel_subscription(subscription)
+    
+    def test_summary_groups_subscriptions_and_revenue(self):
+        """Teste dos blocos agrupados do resumo."""
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['subscriptions']['total'], 2)
+        self.assertEqual(
+            data['subscriptions']['by_status'],
+            {Subscription.ACTIVE: 1, Subscription.CANCELLED: 1}
+        )
+        self.assertEqual(data['subscriptions']['by_plan'][0]['plan'], self.plan.pk)
+        self.assertEqual(data['revenue']['new_subscriptions'], 2)
+        self.assertEqual(data['stores']['total'], 0)
+        self.assertIn('Age', response)
+    
+    def test_summary_is_cached(self):
+        """Teste do resumo servido do cache dentro do TTL."""
+        first = self.client.get(self.url).json()
+        Subscription.objects.all().delete()
+        second = self.client.get(self.url).json()
+        
+        self.assertEqual(second['subscriptions']['total'], 2)
+        self.assertEqual(second['computed_at'], first['computed_at'])
+    
+    def test_requires_admin(self):
+        """Teste do acesso restrito a administradores."""
+        self.client.force_authenticate(User.objects.get(username='cliente0'))
+        
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import ScheduledSubscriptionEvent, Subscription
+from ..services import PlanCounterService, SubscriptionService, SubscriptionAnalyticsService
+
+
+class SubscriptionAnalyticsServiceTests(TestCase):
+    """Testes para as métricas incrementais de receita."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user('cliente', 'cliente@example.com', 'senha123')
+        self.plan = BasicPlanFactory()
+        self.subscription = Subscription.objects.create(
+            user=self.user,
+            plan=self.plan,
+            status=Subscription.ACTIVE,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            remaining_supplements=self.plan.supplements_per_month,
+            price_paid=self.plan.price
+        )
+        SubscriptionAnalyticsService.record_created(self.subscription)
+        self.today = timezone.localdate()
+    
+    def test_events_update_daily_series(self):
+        """Teste de atualização da série diária pelos eventos."""
+        SubscriptionService.cancel_subscription(self.subscription)
+        
+        series = SubscriptionAnalyticsService.get_daily_series(self.today, self.today)
+        self.assertEqual(series[0]['active_subscriptions'], 0)
+        self.assertEqual(series[0]['mrr'], Decimal('0'))
+        self.assertEqual(series[0]['new_subscriptions'], 1)
+        self.assertEqual(series[0]['cancelled_subscriptions'], 1)
+    
+    def test_rebuild_from_history_matches_incremental_rollup(self):
+        """Teste de equivalência entre a reconstrução e os eventos incrementais."""
+        incremental = SubscriptionAnalyticsService.get_daily_series(self.today, self.today)
+        
+        SubscriptionAnalyticsService.rebuild_from_history(chunk_size=1)
+        rebuilt = SubscriptionAnalyticsService.get_daily_series(self.today, self.today)
+        
+        self.assertEqual(incremental, rebuilt)
+    
+    def test_bulk_expiry_dated_on_expiration_day(self):
+        """Teste da data de encerramento das assinaturas expiradas em lote."""
+        Subscription.objects.filter(pk=self.subscription.pk).update(
+            start_date=date.today() - timedelta(days=40),
+            end_date=date.today() - timedelta(days=10),
+            updated_at=timezone.now() - timedelta(days=10)
+        )
+        
+        SubscriptionService.check_subscriptions_to_expire()
+        SubscriptionAnalyticsService.rebuild_from_history()
+        
+        series = SubscriptionAnalyticsService.get_daily_series(self.today, self.today)
+        self.assertEqual(series[0]['expired_subscriptions'], 1)
+        self.assertEqual(series[0]['active_subscriptions'], 0)
+    
+    def test_status_patch_updates_metrics(self):
+        """Teste das métricas e contadores atualizados por mudanças de status via PATCH."""
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username='admin', email='admin@example.com', is_staff=True))
+        other = Subscription.objects.create(
+            user=User.objects.create(username='outro', email='outro@example.com'),
+            plan=self.plan,
+            status=Subscription.PENDING,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            remaining_supplements=self.plan.supplements_per_month,
+            price_paid=self.plan.price
+        )
+        
+        def patch(subscription, status):
+            response = client.patch(
+                f'/api/v1/subscription/subscriptions/{subscription.pk}/', {'status': status}, format='json'
+            )
+            self.assertEqual(response.status_code, 200)
+        
+        def today():
+            return SubscriptionAnalyticsService.get_daily_series(self.today, self.today)[0]
+        
+        self.plan.refresh_from_db()
+        patch(other, Subscription.ACTIVE)
+        self.assertEqual(today()['active_subscriptions'], 2)
+        self.assertEqual(today()['mrr'], self.plan.price * 2)
+        self.assertEqual(PlanCounterService.get_active_subscribers()[self.plan.pk], 2)
+        self.assertTrue(ScheduledSubscriptionEvent.objects.filter(subscription=other).exists())
+        
+        patch(other, Subscription.CANCELLED)
+        patch(self.subscription, Subscription.EXPIRED)
+        series = today()
+        self.assertEqual(
+            (series['active_subscriptions'], series['mrr'], series['cancelled_subscriptions'], series['expired_subscriptions']),
+            (0, Decimal('0'), 1, 1)
+        )
+        self.assertEqual(PlanCounterService.get_active_subscribers().get(self.plan.pk, 0), 0)
+        self.assertFalse(ScheduledSubscriptionEvent.objects.filter(subscription=other).exists())
+        
+        # A reconstrução a partir do histórico chega aos mesmos totais
+        SubscriptionAnalyticsService.rebuild_from_history()
+        self.assertEqual(today(), series)
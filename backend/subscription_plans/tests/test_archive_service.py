@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription, SubscriptionArchive
+from ..services import SubscriptionArchiveService
+
+
+class SubscriptionArchiveServiceTests(TestCase):
+    """Testes para o arquivamento de assinaturas encerradas."""
+    
+    def setUp(self):
+        self.user = User.objects.create(username='cliente', email='cliente@example.com')
+        self.plan = BasicPlanFactory()
+        self.old = self._create(Subscription.EXPIRED, date.today() - timedelta(days=200))
+        self.recent = self._create(Subscription.CANCELLED, date.today() - timedelta(days=5))
+        self.active = self._create(Subscription.ACTIVE, date.today() + timedelta(days=20))
+    
+    def _create(self, status, end_date):
+        return Subscription.objects.create(
+            user=self.user,
+            plan=self.plan,
+            status=status,
+            start_date=end_date - timedelta(days=30),
+            end_date=end_date,
+            remaining_supplements=0,
+            price_paid=self.plan.price
+        )
+    
+    def test_archives_only_old_closed_subscriptions(self):
+        """Teste de arquivamento apenas das assinaturas encerradas antigas."""
+        archived = SubscriptionArchiveService.archive_closed_subscriptions(
+            older_than_days=90, batch_size=1
+        )
+        
+        self.assertEqual(archived, 1)
+        self.assertFalse(Subscription.objects.filter(id=self.old.id).exists())
+        self.assertTrue(SubscriptionArchive.objects.filter(id=self.old.id).exists())
+        self.assertEqual(Subscription.objects.count(), 2)
+    
+    def test_my_subscriptions_includes_archive_only_when_asked(self):
+        """Teste da listagem com e sem assinaturas arquivadas."""
+        SubscriptionArchiveService.archive_closed_subscriptions(older_than_days=90)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = '/api/v1/subscription/subscriptions/my_subscriptions/'
+        
+        live = client.get(url).json()
+        everything = client.get(url, {'include_archived': 'true'}).json()
+        
+        self.assertEqual(len(live), 2)
+        self.assertEqual(len(everything), 3)
+        self.assertIn(self.old.id, [item['id'] for item in everything])
@@ -0,0 +1,48 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription
+from ..services import SubscriptionExportService
+
+
+class SubscriptionExportServiceTests(TestCase):
+    """Testes para a exportação de assinaturas em streaming."""
+    
+    def setUp(self):
+        plan = BasicPlanFactory()
+        for index in range(5):
+            Subscription.objects.create(
+                user=User.objects.create(username=f'cliente{index}', email=f'cliente{index}@example.com'),
+                plan=plan,
+                status=Subscription.EXPIRED,
+                start_date=date.today() - timedelta(days=60),
+                end_date=date.today() - timedelta(days=30),
+                remaining_supplements=0,
+                price_paid=plan.price
+            )
+    
+    def test_csv_export_is_streamed_in_chunks(self):
+        """Teste da exportação CSV compactada em blocos."""
+        stream = SubscriptionExportService.stream(compress=True, chunk_size=2)
+        content = gzip.decompress(b''.join(stream)).decode('utf-8')
+        
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['user_username'], 'cliente0')
+    
+    def test_ndjson_export(self):
+        """Teste da exportação NDJSON."""
+        stream = SubscriptionExportService.stream(
+            export_format=SubscriptionExportService.NDJSON, chunk_size=2
+        )
+        lines = b''.join(stream).decode('utf-8').splitlines()
+        
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['status'], Subscription.EXPIRED)
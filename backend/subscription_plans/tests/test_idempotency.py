@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription
+
+
+class IdempotencyKeyTests(TestCase):
+    """Testes para o cabeçalho Idempotency-Key na criação de assinaturas."""
+    
+    url = '/api/v1/subscription/subscriptions/'
+    
+    def setUp(self):
+        self.user = User.objects.create(username='cliente', email='cliente@example.com')
+        self.plan = BasicPlanFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.payload = {
+            'plan': self.plan.id,
+            'status': Subscription.ACTIVE,
+            'start_date': str(date.today()),
+            'end_date': str(date.today() + timedelta(days=30)),
+            'remaining_supplements': self.plan.supplements_per_month,
+            'price_paid': str(self.plan.price),
+        }
+    
+    def test_retry_with_same_key_replays_response(self):
+        """Teste de reprodução da resposta para a mesma chave."""
+        first = self.client.post(self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        retry = self.client.post(self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json()['id'], first.json()['id'])
+        self.assertEqual(Subscription.objects.count(), 1)
+    
+    def test_same_key_with_different_body_is_rejected(self):
+        """Teste de rejeição da mesma chave com outro corpo."""
+        self.client.post(self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.payload['remaining_supplements'] = 1
+        response = self.client.post(self.url, self.payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Subscription.objects.count(), 1)
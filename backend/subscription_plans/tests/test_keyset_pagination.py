@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription
+
+
+class KeysetPaginationTests(TestCase):
+    """Testes para a paginação por cursor da listagem de assinaturas."""
+    
+    url = '/api/v1/subscription/subscriptions/'
+    
+    def setUp(self):
+        self.admin = User.objects.create(
+            username='admin', email='admin@example.com', is_staff=True
+        )
+        plan = BasicPlanFactory()
+        for index in range(5):
+            user = User.objects.create(username=f'cliente{index}', email=f'cliente{index}@example.com')
+            Subscription.objects.create(
+                user=user,
+                plan=plan,
+                status=Subscription.EXPIRED,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                remaining_supplements=0,
+                price_paid=plan.price
+            )
+        # Empate em created_at para exercitar o desempate por id
+        Subscription.objects.update(created_at=timezone.now())
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+    
+    def test_pages_cover_all_rows_without_repetition(self):
+        """Teste de navegação completa pelas páginas."""
+        ids = []
+        url = f'{self.url}?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        
+        self.assertEqual(ids, sorted(Subscription.objects.values_list('id', flat=True)))
+    
+    def test_previous_link_returns_previous_page(self):
+        """Teste do link para a página anterior."""
+        first = self.client.get(f'{self.url}?page_size=2')
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+        
+        self.assertEqual(previous.data['results'], first.data['results'])
+        self.assertIsNone(previous.data['previous'])
+    
+    def test_invalid_cursor_returns_not_found(self):
+        """Teste de cursor inválido."""
+        response = self.client.get(f'{self.url}?cursor=invalido')
+        self.assertEqual(response.status_code, 404)
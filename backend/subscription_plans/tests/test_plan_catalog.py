@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..factories import BasicPlanFactory
+
+
+class PlanCatalogTests(TestCase):
+    """Testes para o catálogo de planos em memória."""
+    
+    url = '/api/v1/subscription/plans/active/'
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.plan = BasicPlanFactory(name='Plano Ativo')
+        BasicPlanFactory(name='Plano Inativo', is_active=False)
+    
+    def test_active_returns_only_active_plans_with_etag(self):
+        """Teste do retorno dos planos ativos com ETag."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        names = [plan['name'] for plan in response.json()]
+        self.assertEqual(names, ['Plano Ativo'])
+    
+    def test_if_none_match_returns_not_modified(self):
+        """Teste de resposta 304 para ETag já conhecido."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+    
+    def test_plan_save_invalidates_snapshot(self):
+        """Teste de invalidação do catálogo ao salvar um plano."""
+        etag = self.client.get(self.url)['ETag']
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plan.name = 'Plano Renomeado'
+            self.plan.save()
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()[0]['name'], 'Plano Renomeado')
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription, SubscriptionPlanCounter
+from ..services import PlanCounterService, SubscriptionService
+
+
+class PlanCounterServiceTests(TestCase):
+    """Testes para os contadores de assinantes ativos por plano."""
+    
+    def setUp(self):
+        self.plan = BasicPlanFactory()
+        self.subscriptions = [
+            SubscriptionService.activate_subscription(
+                user=User.objects.create(username=f'cliente{index}', email=f'cliente{index}@example.com'),
+                plan=self.plan,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30)
+            )
+            for index in range(3)
+        ]
+    
+    def test_transitions_update_counter(self):
+        """Teste da atualização do contador nas transições de assinatura."""
+        SubscriptionService.cancel_subscription(self.subscriptions[0])
+        
+        counts = PlanCounterService.get_active_subscribers()
+        self.assertEqual(counts[self.plan.pk], 2)
+    
+    def test_reconcile_corrects_drift(self):
+        """Teste da correção de contadores divergentes."""
+        Subscription.objects.filter(pk=self.subscriptions[0].pk).update(
+            status=Subscription.CANCELLED
+        )
+        SubscriptionPlanCounter.objects.filter(plan=self.plan).update(active_subscribers=0)
+        
+        self.assertEqual(PlanCounterService.reconcile(), 1)
+        self.assertEqual(PlanCounterService.get_active_subscribers()[self.plan.pk], 2)
+        self.assertEqual(PlanCounterService.reconcile(), 0)
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from users.models import User
+from ..factories import BasicPlanFactory, ProPlanFactory
+from ..models import PlanMigrationJob, Subscription
+from ..services import PlanMigrationService
+
+
+class PlanMigrationServiceTests(TestCase):
+    """Testes para a migração de assinantes entre planos."""
+    
+    def setUp(self):
+        self.basic = BasicPlanFactory()
+        self.pro = ProPlanFactory()
+        self.basic.refresh_from_db()
+        self.pro.refresh_from_db()
+        
+        for index, status in enumerate([
+            Subscription.ACTIVE, Subscription.ACTIVE, Subscription.EXPIRED
+        ]):
+            user = User.objects.create(username=f'cliente{index}', email=f'cliente{index}@example.com')
+            Subscription.objects.create(
+                user=user,
+                plan=self.basic,
+                status=status,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                remaining_supplements=1,
+                price_paid=self.basic.price
+            )
+    
+    def test_migrates_subscribers_in_batches(self):
+        """Teste da migração em lotes com recálculo dos valores."""
+        job = PlanMigrationService.migrate_subscribers(self.basic, self.pro, batch_size=2)
+        
+        self.assertEqual(job.status, PlanMigrationJob.COMPLETED)
+        self.assertEqual(job.migrated_count, 2)
+        
+        used = self.basic.supplements_per_month - 1
+        active = Subscription.objects.filter(status=Subscription.ACTIVE)
+        for subscription in active:
+            self.assertEqual(subscription.plan, self.pro)
+            self.assertEqual(subscription.price_paid, self.pro.price)
+            self.assertEqual(
+                subscription.remaining_supplements,
+                self.pro.supplements_per_month - used
+            )
+        # Assinaturas encerradas continuam no plano em que foram cobradas
+        expired = Subscription.objects.get(status=Subscription.EXPIRED)
+        self.assertEqual(expired.plan, self.basic)
+        self.assertEqual(expired.price_paid, self.basic.price)
+    
+    def test_resumes_from_last_batch(self):
+        """Teste da retomada de uma migração interrompida."""
+        job = PlanMigrationService.start_or_resume(self.basic, self.pro)
+        PlanMigrationService.migrate_batch(job, batch_size=1)
+        
+        resumed = PlanMigrationService.migrate_subscribers(self.basic, self.pro, batch_size=1)
+        
+        self.assertEqual(resumed.pk, job.pk)
+        self.assertEqual(resumed.migrated_count, 2)
@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from partner_stores.models import PartnerStore
+from supplements.models import Supplement, SupplementCategory, StoreInventory
+from supplements.services import StoreInventoryService
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription, SupplementRedemption, SupplementUsageRollup
+from ..services import RedemptionLedgerWriter, RedemptionRollupService, SubscriptionService
+
+
+class RedemptionLedgerTests(TestCase):
+    """Testes para o registro e a consolidação de resgates."""
+    
+    def setUp(self):
+        plan = BasicPlanFactory()
+        self.subscription = Subscription.objects.create(
+            user=User.objects.create(username='cliente', email='cliente@example.com'),
+            plan=plan,
+            status=Subscription.ACTIVE,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            remaining_supplements=2,
+            price_paid=plan.price
+        )
+        category = SupplementCategory.objects.create(name='Proteína')
+        self.supplement = Supplement.objects.create(
+            name='Whey', description='Whey protein', brand='Marca',
+            price='99.90', category=category
+        )
+    
+    def test_redemption_is_written_after_commit(self):
+        """Teste do decremento condicional e do registro em lote."""
+        with self.captureOnCommitCallbacks(execute=True):
+            SubscriptionService.use_supplement(self.subscription, supplement=self.supplement)
+            SubscriptionService.use_supplement(self.subscription, supplement=self.supplement)
+        
+        self.assertEqual(RedemptionLedgerWriter.get_instance().flush(), 2)
+        self.assertEqual(self.subscription.remaining_supplements, 0)
+        self.assertEqual(SupplementRedemption.objects.count(), 2)
+        
+        with self.assertRaises(ValueError):
+            SubscriptionService.use_supplement(self.subscription, supplement=self.supplement)
+    
+    def test_closed_subscription_cannot_redeem(self):
+        """Teste do resgate em assinaturas canceladas e vencidas."""
+        client = APIClient()
+        client.force_authenticate(self.subscription.user)
+        url = f'/api/v1/subscription/subscriptions/{self.subscription.pk}/redeem/'
+        
+        for changes in (
+            {'status': Subscription.CANCELLED},
+            {'status': Subscription.EXPIRED},
+            {'end_date': date.today() - timedelta(days=1)},
+        ):
+            Subscription.objects.filter(pk=self.subscription.pk).update(**{
+                'status': Subscription.ACTIVE,
+                'end_date': date.today() + timedelta(days=30),
+                **changes
+            })
+            response = client.post(url, {'supplement': self.supplement.pk}, format='json')
+            self.assertEqual(response.status_code, 400)
+        
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.remaining_supplements, 2)
+    
+    def test_failed_batch_is_retried(self):
+        """Teste da nova tentativa de um lote que falhou ao ser gravado."""
+        writer = RedemptionLedgerWriter.get_instance()
+        with self.captureOnCommitCallbacks(execute=True):
+            SubscriptionService.use_supplement(self.subscription, supplement=self.supplement)
+        
+        with mock.patch.object(
+            SupplementRedemption.objects, 'bulk_create', side_effect=DatabaseError('falha')
+        ):
+            self.assertEqual(writer.flush(), 0)
+        
+        # O lote volta para o buffer e é gravado na próxima tentativa
+        self.assertEqual(writer.flush(), 1)
+        self.assertEqual(SupplementRedemption.objects.count(), 1)
+    
+    def test_redemption_consumes_store_inventory(self):
+        """Teste da baixa no estoque da loja e do bloqueio sem estoque."""
+        store = PartnerStore.objects.create(
+            name='Loja Centro', cnpj='12345678000199', owner=self.subscription.user,
+            address='Rua A, 1', phone='11999999999', email='loja@example.com', status='approved'
+        )
+        StoreInventoryService.set_quantity(store.pk, self.supplement.pk, 1)
+        
+        SubscriptionService.use_supplement(self.subscription, supplement=self.supplement, store=store)
+        self.assertEqual(StoreInventory.objects.get(store=store).quantity, 0)
+        
+        with self.assertRaises(ValueError):
+            SubscriptionService.use_supplement(self.subscription, supplement=self.supplement, store=store)
+        # O saldo da assinatura não é consumido quando a loja está sem estoque
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.remaining_supplements, 1)
+    
+    def test_rollups_count_closed_periods(self):
+        """Teste das consolidações horária e diária."""
+        redeemed_at = timezone.now() - timedelta(days=2)
+        SupplementRedemption.objects.bulk_create([
+            SupplementRedemption(
+                subscription=self.subscription,
+                supplement=self.supplement,
+                redeemed_at=redeemed_at
+            )
+            for _ in range(3)
+        ])
+        
+        RedemptionRollupService.rollup()
+        RedemptionRollupService.rollup()
+        
+        for granularity in (SupplementUsageRollup.HOUR, SupplementUsageRollup.DAY):
+            usage = list(RedemptionRollupService.get_usage(
+                redeemed_at - timedelta(days=1),
+                timezone.now(),
+                granularity=granularity,
+                supplement_id=self.supplement.pk
+            ))
+            self.assertEqual([row['redemptions'] for row in usage], [3])
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from users.models import User
+from ..factories import BasicPlanFactory
+from ..models import Subscription, ScheduledSubscriptionEvent
+from ..services import SubscriptionSchedulerService
+
+
+class SubscriptionSchedulerServiceTests(TestCase):
+    """Testes para o agendador de eventos de assinatura."""
+    
+    def setUp(self):
+        user = User.objects.create(username='cliente', email='cliente@example.com')
+        other_user = User.objects.create(username='outro', email='outro@example.com')
+        plan = BasicPlanFactory()
+        self.ended = Subscription.objects.create(
+            user=other_user,
+            plan=plan,
+            status=Subscription.ACTIVE,
+            start_date=date.today() - timedelta(days=31),
+            end_date=date.today() - timedelta(days=1),
+            remaining_supplements=0,
+            renewal_enabled=False,
+            price_paid=plan.price
+        )
+        self.running = Subscription.objects.create(
+            user=user,
+            plan=plan,
+            status=Subscription.ACTIVE,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            remaining_supplements=plan.supplements_per_month,
+            renewal_enabled=False,
+            price_paid=plan.price
+        )
+        SubscriptionSchedulerService.schedule_many([self.ended, self.running])
+    
+    def test_dispatches_only_due_events(self):
+        """Teste de despacho apenas dos eventos vencidos."""
+        SubscriptionSchedulerService.run_forever(once=True)
+        
+        self.ended.refresh_from_db()
+        self.running.refresh_from_db()
+        self.assertEqual(self.ended.status, Subscription.EXPIRED)
+        self.assertEqual(self.running.status, Subscription.ACTIVE)
+        self.assertFalse(
+            ScheduledSubscriptionEvent.objects.filter(
+                subscription=self.running,
+                status=ScheduledSubscriptionEvent.DONE
+            ).exists()
+        )
+    
+    def test_expired_lease_makes_event_due_again(self):
+        """Teste de nova entrega de evento cuja reserva expirou."""
+        claimed = SubscriptionSchedulerService.claim_due_events(batch_size=10)
+        self.assertTrue(claimed)
+        self.assertEqual(SubscriptionSchedulerService.claim_due_events(batch_size=10), [])
+        
+        ScheduledSubscriptionEvent.objects.filter(id__in=[e.id for e in claimed]).update(
+            locked_until=timezone.now() - timedelta(minutes=1)
+        )
+        reclaimed = SubscriptionSchedulerService.claim_due_events(batch_size=10)
+        self.assertEqual({e.id for e in reclaimed}, {e.id for e in claimed})
+    
+    def test_expire_stamps_updated_at(self):
+        """Teste da data de atualização das assinaturas expiradas pelo agendador."""
+        Subscription.objects.filter(pk=self.ended.pk).update(updated_at=timezone.now() - timedelta(days=5))
+        
+        SubscriptionSchedulerService.run_forever(once=True)
+        
+        self.ended.refresh_from_db()
+        self.assertEqual(self.ended.updated_at.date(), timezone.now().date())
+    
+    @mock.patch.object(SubscriptionSchedulerService, '_dispatch_expire', side_effect=RuntimeError('falha'))
+    def test_failed_event_retried_after_backoff(self, dispatch):
+        """Teste da nova tentativa com espera exponencial após uma falha."""
+        service = SubscriptionSchedulerService
+        event = ScheduledSubscriptionEvent.objects.get(
+            subscription=self.ended, action=ScheduledSubscriptionEvent.EXPIRE
+        )
+        ScheduledSubscriptionEvent.objects.exclude(pk=event.pk).update(status=ScheduledSubscriptionEvent.DONE)
+        
+        service.dispatch_due_events()
+        event.refresh_from_db()
+        self.assertEqual(event.status, ScheduledSubscriptionEvent.PENDING)
+        self.assertGreater(event.locked_until, timezone.now())
+        self.assertEqual(service.claim_due_events(batch_size=10), [])
+        
+        # O agendador dorme até a nova tentativa em vez de consultar a cada poll_interval
+        sleep = service.seconds_until_next_bucket(max_sleep=300, poll_interval=5)
+        self.assertAlmostEqual(sleep, service.RETRY_BASE_SECONDS, delta=2)
+        
+        for attempt in range(2, service.MAX_ATTEMPTS + 1):
+            ScheduledSubscriptionEvent.objects.filter(pk=event.pk).update(
+                locked_until=timezone.now() - timedelta(seconds=1)
+            )
+            service.dispatch_due_events()
+            event.refresh_from_db()
+            self.assertEqual(event.attempts, attempt)
+        
+        self.assertEqual(event.status, ScheduledSubscriptionEvent.FAILED)
+        self.assertEqual(dispatch.call_count, service.MAX_ATTEMPTS)
@@ -1,12 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from subscription_plans.viewsets import SubscriptionPlanViewSet, SubscriptionViewSet
+from subscription_plans.viewsets import (
+    SubscriptionPlanViewSet,
+    SubscriptionViewSet,
+    SubscriptionAnalyticsViewSet,
+)
 
 app_name = 'subscription_plans'
 
 router = DefaultRouter()
 router.register(r'plans', SubscriptionPlanViewSet, basename='plans')
 router.register(r'subscriptions', SubscriptionViewSet, basename='subscriptions')
+router.register(r'analytics', SubscriptionAnalyticsViewSet, basename='analytics')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,2 +1,3 @@
 from .subscription_plan_viewset import SubscriptionPlanViewSet
-from .subscription_viewset import SubscriptionViewSet 
\ No newline at end of file
+from .subscription_viewset import SubscriptionViewSet
+from .subscription_analytics_viewset import SubscriptionAnalyticsViewSet
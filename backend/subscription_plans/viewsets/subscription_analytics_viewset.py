@@ -0,0 +1,119 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from subscription_plans.serializers import (
+    AnalyticsRangeSerializer,
+    RevenueSeriesSerializer,
+    ChurnSerializer,
+    PlanMixSerializer,
+    RedemptionUsageQuerySerializer,
+    RedemptionUsageSerializer,
+)
+from subscription_plans.services import SubscriptionAnalyticsService, RedemptionRollupService
+
+
+class SubscriptionAnalyticsViewSet(viewsets.ViewSet):
+    """
+    ViewSet com as métricas de receita das assinaturas.
+    
+    Responde consultas de MRR, churn e mix de planos a partir das
+    tabelas de variação e fotografia diárias, sem varrer as assinaturas.
+    """
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    @staticmethod
+    def _get_range(request):
+        """
+        Valida e retorna os parâmetros de intervalo da requisição.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            dict: Datas inicial e final e plano opcional.
+        """
+        serializer = AnalyticsRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+    
+    @action(detail=False, methods=['get'])
+    def mrr(self, request, *args, **kwargs):
+        """
+        Retorna a série diária de MRR e assinaturas ativas.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            Response: Resposta HTTP com a série diária.
+        """
+        params = self._get_range(request)
+        series = SubscriptionAnalyticsService.get_daily_series(
+            params['start'], params['end'], params.get('plan')
+        )
+        return Response(RevenueSeriesSerializer(series, many=True).data)
+    
+    @action(detail=False, methods=['get'])
+    def churn(self, request, *args, **kwargs):
+        """
+        Retorna o churn líquido do intervalo.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            Response: Resposta HTTP com o churn do intervalo.
+        """
+        params = self._get_range(request)
+        churn = SubscriptionAnalyticsService.get_churn(
+            params['start'], params['end'], params.get('plan')
+        )
+        return Response(ChurnSerializer(churn).data)
+    
+    @action(detail=False, methods=['get'], url_path='plan-mix')
+    def plan_mix(self, request, *args, **kwargs):
+        """
+        Retorna a distribuição de assinaturas e MRR por plano no fim do intervalo.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            Response: Resposta HTTP com o mix de planos.
+        """
+        params = self._get_range(request)
+        mix = SubscriptionAnalyticsService.get_plan_mix(params['end'])
+        return Response(PlanMixSerializer(mix, many=True).data)
+    
+    @action(detail=False, methods=['get'])
+    def redemptions(self, request, *args, **kwargs):
+        """
+        Retorna os resgates de suplementos consolidados por hora ou dia.
+        
+        Lê apenas as consolidações, sem varrer o registro de resgates.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            Response: Resposta HTTP com os resgates por período, suplemento e loja.
+        """
+        serializer = RedemptionUsageQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        
+        start = timezone.make_aware(datetime.combine(params['start'], time.min))
+        end = timezone.make_aware(datetime.combine(params['end'] + timedelta(days=1), time.min))
+        usage = RedemptionRollupService.get_usage(
+            start,
+            end,
+            granularity=params['granularity'],
+            supplement_id=params.get('supplement'),
+            store_id=params.get('store')
+        )
+        return Response(RedemptionUsageSerializer(usage, many=True).data)
@@ -1,9 +1,12 @@
+from django.http import HttpResponse
+from django.utils.http import parse_etags
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from subscription_plans.models import SubscriptionPlan
 from subscription_plans.serializers import SubscriptionPlanSerializer
+from subscription_plans.services import PlanCatalogCache, PlanCounterService
 
 
 class SubscriptionPlanViewSet(viewsets.ModelViewSet):
@@ -31,8 +34,27 @@ class SubscriptionPlanViewSet(viewsets.ModelViewSet):
             
         return [permission() for permission in permission_classes]
     
+    def list(self, request, *args, **kwargs):
+        """
+        Lista os planos a partir do catálogo em memória.
+        
+        Requisições com parâmetros (paginação, formato) ou catálogos
+        maiores que uma página seguem pelo fluxo padrão do DRF.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            HttpResponse: Resposta HTTP com os planos.
+        """
+        snapshot = PlanCatalogCache.get_instance().get_snapshot()
+        if request.query_params or snapshot.list_body is None:
+            return super().list(request, *args, **kwargs)
+        
+        return self._catalog_response(request, snapshot.list_body, snapshot.list_etag)
+    
     @action(detail=False, methods=['get'])
-    def active(self, request):
+    def active(self, request, *args, **kwargs):
         """
         Retorna apenas planos ativos.
         
@@ -40,8 +62,42 @@ class SubscriptionPlanViewSet(viewsets.ModelViewSet):
             request: Requisição HTTP.
             
         Returns:
-            Response: Resposta HTTP com planos ativos.
+            HttpResponse: Resposta HTTP com planos ativos.
+        """
+        snapshot = PlanCatalogCache.get_instance().get_snapshot()
+        return self._catalog_response(request, snapshot.active_body, snapshot.active_etag)
+    
+    @action(detail=False, methods=['get'])
+    def subscribers(self, request, *args, **kwargs):
+        """
+        Retorna o número de assinantes ativos de cada plano.
+        
+        Os números vêm dos contadores mantidos pelas transições de
+        assinatura, sem contar a tabela de assinaturas.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            Response: Resposta HTTP com os planos e seus assinantes ativos.
+        """
+        return Response(PlanCounterService.get_plan_summaries())
+    
+    @staticmethod
+    def _catalog_response(request, body, etag):
+        """
+        Monta a resposta do catálogo, respondendo 304 quando o cliente
+        já possui a versão atual (If-None-Match).
         """
-        plans = SubscriptionPlan.objects.filter(is_active=True)
-        serializer = self.get_serializer(plans, many=True)
-        return Response(serializer.data) 
\ No newline at end of file
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            client_etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+            if '*' in client_etags or etag in client_etags:
+                response = HttpResponse(status=304)
+                response['ETag'] = etag
+                return response
+        
+        response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'
+        return response 
\ No newline at end of file
@@ -1,11 +1,21 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from django.db import transaction
+from django.http import StreamingHttpResponse
 
-from subscription_plans.models import Subscription
-from subscription_plans.serializers import SubscriptionSerializer
-from subscription_plans.services import SubscriptionService
+from core.pagination import KeysetPagination
+from subscription_plans.models import Subscription, SubscriptionArchive
+from subscription_plans.serializers import SubscriptionSerializer, RedemptionRequestSerializer
+from subscription_plans.services import (
+    SubscriptionService,
+    SubscriptionAnalyticsService,
+    SubscriptionArchiveService,
+    SubscriptionSchedulerService,
+    SubscriptionExportService,
+    idempotent,
+)
 
 
 class SubscriptionViewSet(viewsets.ModelViewSet):
@@ -18,6 +28,7 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
     
     queryset = Subscription.objects.all()
     serializer_class = SubscriptionSerializer
+    pagination_class = KeysetPagination
     
     def get_permissions(self):
         """
@@ -26,7 +37,7 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         Retorna:
             list: Lista de permissões para a ação atual.
         """
-        if self.action in ['create', 'my_subscriptions']:
+        if self.action in ['create', 'my_subscriptions', 'redeem']:
             permission_classes = [permissions.IsAuthenticated]
         elif self.action in ['update', 'partial_update', 'retrieve']:
             permission_classes = [permissions.IsAuthenticated]
@@ -51,11 +62,62 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         # Usuários normais só podem ver suas próprias assinaturas
         return Subscription.objects.filter(user=user)
     
+    def get_archive_queryset(self):
+        """
+        Retorna as assinaturas arquivadas visíveis para o usuário autenticado.
+        
+        Retorna:
+            QuerySet: QuerySet de assinaturas arquivadas.
+        """
+        user = self.request.user
+        
+        if user.is_staff:
+            return SubscriptionArchive.objects.all()
+        
+        return SubscriptionArchiveService.get_user_archived_subscriptions(user)
+    
+    def include_archived(self):
+        """
+        Indica se a requisição pediu para incluir assinaturas arquivadas.
+        
+        Retorna:
+            bool: True quando `include_archived` for verdadeiro.
+        """
+        value = self.request.query_params.get('include_archived', '')
+        return value.lower() in ('1', 'true', 'yes')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Lista as assinaturas, incluindo as arquivadas quando solicitado.
+        
+        Sem `include_archived` a consulta atinge apenas a tabela principal.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            Response: Resposta HTTP paginada com as assinaturas.
+        """
+        if not self.include_archived():
+            return super().list(request, *args, **kwargs)
+        
+        querysets = [
+            self.filter_queryset(self.get_queryset()),
+            self.filter_queryset(self.get_archive_queryset()),
+        ]
+        page = self.paginator.paginate_querysets(querysets, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @idempotent('subscriptions.create')
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         """
         Cria uma nova assinatura com transação atômica.
         
+        Aceita o cabeçalho Idempotency-Key: novas tentativas com a mesma
+        chave recebem a resposta da primeira criação.
+        
         Args:
             request: Requisição HTTP.
             
@@ -68,21 +130,138 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             
         return super().create(request, *args, **kwargs)
     
+    def perform_create(self, serializer):
+        """
+        Salva a assinatura e registra o evento nas métricas de receita.
+        
+        Uma assinatura ativa substitui a assinatura ativa atual do usuário,
+        se houver (troca de plano), em um único comando no banco. Apenas
+        administradores podem criar assinaturas para outros usuários.
+        
+        Args:
+            serializer: Serializer validado da assinatura.
+            
+        Raises:
+            PermissionDenied: Se um usuário comum informar outro usuário.
+        """
+        data = serializer.validated_data
+        if not self.request.user.is_staff and data['user'] != self.request.user:
+            raise PermissionDenied('Você só pode criar assinaturas para si mesmo.')
+        
+        if data.get('status', Subscription.PENDING) == Subscription.ACTIVE:
+            serializer.instance = SubscriptionService.activate_subscription(
+                user=data['user'],
+                plan=data['plan'],
+                start_date=data['start_date'],
+                end_date=data['end_date'],
+                remaining_supplements=data.get('remaining_supplements'),
+                price_paid=data.get('price_paid'),
+                renewal_enabled=data.get('renewal_enabled', True)
+            )
+            return
+        
+        subscription = serializer.save()
+        SubscriptionAnalyticsService.record_created(subscription)
+        SubscriptionSchedulerService.schedule_subscription(subscription)
+    
+    def perform_update(self, serializer):
+        """
+        Salva a assinatura, atualiza as métricas de receita e os contadores
+        dos planos conforme a mudança de status, plano ou valor, e reagenda
+        seus eventos se o término ou o status mudou.
+        
+        Args:
+            serializer: Serializer validado da assinatura.
+        """
+        instance = serializer.instance
+        previous_status = instance.status
+        previous_end_date = instance.end_date
+        # Valores anteriores, usados ao encerrar ou trocar o plano
+        previous = Subscription(pk=instance.pk, plan_id=instance.plan_id, price_paid=instance.price_paid)
+        
+        with transaction.atomic():
+            subscription = serializer.save()
+            was_active = previous_status == Subscription.ACTIVE
+            is_active = subscription.status == Subscription.ACTIVE
+            
+            if is_active and not was_active:
+                SubscriptionAnalyticsService.record_created(subscription)
+            elif was_active and subscription.status == Subscription.CANCELLED:
+                SubscriptionAnalyticsService.record_cancelled(previous, previous_status)
+            elif was_active and not is_active:
+                SubscriptionAnalyticsService.record_expired([(previous.plan_id, previous.price_paid)])
+            elif is_active and (
+                (subscription.plan_id, subscription.price_paid) != (previous.plan_id, previous.price_paid)
+            ):
+                SubscriptionAnalyticsService.record_plan_changed(
+                    previous.plan_id, previous.price_paid, subscription
+                )
+            
+            if was_active and not is_active:
+                SubscriptionSchedulerService.cancel_events(subscription)
+            elif (subscription.end_date, subscription.status) != (previous_end_date, previous_status):
+                SubscriptionSchedulerService.schedule_subscription(subscription)
+    
     @action(detail=False, methods=['get'])
-    def my_subscriptions(self, request):
+    def my_subscriptions(self, request, *args, **kwargs):
         """
         Retorna as assinaturas do usuário autenticado.
         
+        Com `include_archived` também retorna as assinaturas arquivadas.
+        
         Args:
             request: Requisição HTTP.
             
         Returns:
             Response: Resposta HTTP com assinaturas do usuário.
         """
-        subscriptions = Subscription.objects.filter(user=request.user)
+        subscriptions = list(Subscription.objects.filter(user=request.user))
+        if self.include_archived():
+            subscriptions.extend(
+                SubscriptionArchiveService.get_user_archived_subscriptions(request.user)
+            )
+            subscriptions.sort(key=lambda subscription: subscription.created_at, reverse=True)
+        
         serializer = self.get_serializer(subscriptions, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        """
+        Exporta todas as assinaturas, com usuário e plano, em streaming.
+        
+        Parâmetros: `export_format` (csv, ndjson ou parquet), `compress=gzip`
+        e `include_archived`.
+        
+        Args:
+            request: Requisição HTTP.
+            
+        Returns:
+            StreamingHttpResponse: Arquivo de exportação gerado sob demanda.
+        """
+        export_format = request.query_params.get('export_format', SubscriptionExportService.CSV)
+        compress = request.query_params.get('compress') == 'gzip'
+        
+        try:
+            stream = SubscriptionExportService.stream(
+                export_format=export_format,
+                compress=compress,
+                include_archived=self.include_archived()
+            )
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        content_type = (
+            'application/gzip' if compress
+            else SubscriptionExportService.CONTENT_TYPES[export_format]
+        )
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        filename = SubscriptionExportService.get_filename(export_format, compress)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         """
@@ -108,10 +287,14 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
     
     @action(detail=True, methods=['post'])
-    def renew(self, request, pk=None):
+    @idempotent('subscriptions.renew')
+    def renew(self, request, pk=None, *args, **kwargs):
         """
         Renova uma assinatura.
         
+        Aceita o cabeçalho Idempotency-Key: novas tentativas com a mesma
+        chave recebem a resposta da primeira renovação.
+        
         Args:
             request: Requisição HTTP.
             pk: ID da assinatura.
@@ -128,4 +311,34 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({
                 'error': str(e)
-            }, status=status.HTTP_400_BAD_REQUEST) 
\ No newline at end of file
+            }, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=True, methods=['post'])
+    def redeem(self, request, pk=None, *args, **kwargs):
+        """
+        Resgata um suplemento da assinatura.
+        
+        Args:
+            request: Requisição HTTP com o suplemento e a loja parceira opcional.
+            pk: ID da assinatura.
+            
+        Returns:
+            Response: Resposta HTTP com os suplementos restantes.
+        """
+        subscription = self.get_object()
+        serializer = RedemptionRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            subscription = SubscriptionService.use_supplement(
+                subscription,
+                supplement=serializer.validated_data['supplement'],
+                store=serializer.validated_data.get('store')
+            )
+            return Response({
+                'remaining_supplements': subscription.remaining_supplements
+            })
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
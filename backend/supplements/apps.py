@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class SupplementsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "supplements"
\ No newline at end of file
+    name = "supplements"
+
+    def ready(self):
+        import supplements.signals  # noqa
@@ -0,0 +1,58 @@
+from django.db import connections
+from django.db.models import F
+from django.db.models.functions import Collate
+from rest_framework import filters
+
+from supplements.services import SupplementSearchService
+
+
+class SupplementFullTextSearchFilter(filters.SearchFilter):
+    """
+    Busca textual ponderada do catálogo, com relevância e destaque.
+
+    Fora do PostgreSQL recai no `SearchFilter` padrão do DRF sobre
+    `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+
+        if not SupplementSearchService.is_supported(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        return SupplementSearchService.search(queryset, term)
+
+
+class SupplementOrderingFilter(filters.OrderingFilter):
+    """
+    Ordenação da listagem igual à do modelo de leitura em memória.
+
+    `name` ordena pelo nome normalizado (`sort_name`) comparado byte a byte
+    (collation "C" no PostgreSQL, padrão no SQLite), a mesma comparação por
+    código Unicode do Python, e o ID desempata. Sem `ordering`, vale a
+    ordenação padrão do modelo.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            if queryset.query.order_by:
+                # Ordem já definida por outro filtro, como a relevância da busca
+                return queryset
+            ordering = queryset.model._meta.ordering
+
+        sort_name = F('sort_name')
+        if connections[queryset.db].vendor == 'postgresql':
+            sort_name = Collate('sort_name', 'C')
+
+        terms = []
+        for term in ordering:
+            if term.lstrip('-') != 'name':
+                terms.append(term)
+            elif term.startswith('-'):
+                terms.append(sort_name.desc())
+            else:
+                terms.append(sort_name.asc())
+        return queryset.order_by(*terms, 'id')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from supplements.services import StoreInventoryService
+
+
+class Command(BaseCommand):
+    help = 'Expira as reservas vencidas nas lojas parceiras e devolve as unidades ao estoque.'
+
+    def handle(self, *args, **options):
+        expired = StoreInventoryService.expire_reservations()
+        self.stdout.write(self.style.SUCCESS(f'{expired} reservas expiradas.'))
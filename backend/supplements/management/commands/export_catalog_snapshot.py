@@ -0,0 +1,32 @@
+import shutil
+
+from django.core.management.base import BaseCommand, CommandError
+
+from supplements.services import CatalogSnapshotService
+
+
+class Command(BaseCommand):
+    help = 'Gera (ou reaproveita) o snapshot do catálogo em NDJSON compactado da versão atual.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compress',
+            choices=tuple(CatalogSnapshotService.EXTENSIONS),
+            default=CatalogSnapshotService.GZIP,
+            help='Compactação do snapshot (padrão: gzip; zstd requer o pacote zstandard).'
+        )
+        parser.add_argument(
+            '--output',
+            help='Copia o snapshot para este arquivo.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            path, version = CatalogSnapshotService.get_snapshot(options['compress'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            shutil.copyfile(path, options['output'])
+            path = options['output']
+        self.stdout.write(self.style.SUCCESS(f'Snapshot do catálogo {version} em {path}.'))
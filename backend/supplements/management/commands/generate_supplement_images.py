@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from supplements.models import Supplement
+from supplements.services import SupplementImageService
+
+
+class Command(BaseCommand):
+    help = 'Gera as variantes de imagem dos suplementos cujas variantes estão ausentes ou desatualizadas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regera as variantes de todos os suplementos com imagem.'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        supplements = Supplement.objects.exclude(image='').exclude(image__isnull=True).order_by('id')
+        for supplement in supplements.iterator(chunk_size=200):
+            if options['all'] or SupplementImageService.needs_variants(supplement):
+                SupplementImageService.generate_variants(supplement, wait=True)
+                total += 1
+        self.stdout.write(self.style.SUCCESS(f'Variantes geradas para {total} suplementos.'))
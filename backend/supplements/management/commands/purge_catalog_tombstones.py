@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from supplements.services import CatalogSyncService
+
+
+class Command(BaseCommand):
+    help = 'Remove os registros de remoção do catálogo mais antigos que a retenção da sincronização.'
+
+    def handle(self, *args, **options):
+        deleted = CatalogSyncService.purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} registros de remoção removidos.'))
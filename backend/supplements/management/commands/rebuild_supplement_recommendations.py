@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from supplements.services import SupplementRecommendationService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as recomendações de suplementos de todos os objetivos e níveis de plano.'
+
+    def handle(self, *args, **options):
+        recommendations = SupplementRecommendationService.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(recommendations)} listas de recomendações atualizadas.'
+        ))
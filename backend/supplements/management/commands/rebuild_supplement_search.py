@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from supplements.services import SupplementSearchService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o vetor de busca textual de todos os suplementos.'
+
+    def handle(self, *args, **options):
+        updated = SupplementSearchService.update_vectors()
+        self.stdout.write(self.style.SUCCESS(f'{updated} suplementos atualizados.'))
@@ -1 +1,2 @@
-from .supplement import Supplement, SupplementCategory
\ No newline at end of file
+from .supplement import Supplement, SupplementCategory, CatalogTombstone, SupplementPriceHistory
+from .inventory import StoreInventory, StoreReservation
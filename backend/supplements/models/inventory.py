@@ -0,0 +1,111 @@
+from django.db import models
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from supplements.models.supplement import Supplement
+
+
+class StoreInventory(models.Model):
+    """Estoque de um suplemento em uma loja parceira, para retirada"""
+    store = models.ForeignKey(
+        'partner_stores.PartnerStore',
+        on_delete=models.CASCADE,
+        related_name="inventory",
+        verbose_name=_("Loja")
+    )
+    supplement = models.ForeignKey(
+        Supplement,
+        on_delete=models.CASCADE,
+        related_name="inventory",
+        verbose_name=_("Suplemento")
+    )
+    quantity = models.PositiveIntegerField(_("Quantidade"), default=0)
+    updated_at = models.DateTimeField(_("Atualizado em"), auto_now=True)
+    
+    class Meta:
+        verbose_name = _("Estoque da Loja")
+        verbose_name_plural = _("Estoques das Lojas")
+        constraints = [
+            models.UniqueConstraint(fields=["store", "supplement"], name="unique_store_supplement_inventory"),
+            models.CheckConstraint(condition=Q(quantity__gte=0), name="store_inventory_quantity_gte_0"),
+        ]
+        indexes = [
+            # Lojas com o suplemento em estoque (consulta de retirada)
+            models.Index(
+                fields=["supplement", "store"],
+                condition=Q(quantity__gt=0),
+                name="store_inventory_in_stock_idx"
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.store_id} / {self.supplement_id}: {self.quantity}"
+
+
+class StoreReservation(models.Model):
+    """
+    Unidades de um suplemento separadas em uma loja para um assinante.
+
+    As unidades saem do estoque na reserva e voltam a ele quando a reserva
+    é cancelada ou expira; o resgate na loja consome a reserva, sem retirar
+    o suplemento do estoque outra vez.
+    """
+    
+    ACTIVE = 'active'
+    CONSUMED = 'consumed'
+    RELEASED = 'released'
+    EXPIRED = 'expired'
+    
+    STATUS_CHOICES = [
+        (ACTIVE, _('Ativa')),
+        (CONSUMED, _('Resgatada')),
+        (RELEASED, _('Cancelada')),
+        (EXPIRED, _('Expirada')),
+    ]
+    
+    store = models.ForeignKey(
+        'partner_stores.PartnerStore',
+        on_delete=models.CASCADE,
+        related_name="reservations",
+        verbose_name=_("Loja")
+    )
+    supplement = models.ForeignKey(
+        Supplement,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+        verbose_name=_("Suplemento")
+    )
+    subscription = models.ForeignKey(
+        'subscription_plans.Subscription',
+        on_delete=models.CASCADE,
+        related_name="reservations",
+        verbose_name=_("Assinatura")
+    )
+    # Unidades ainda reservadas: cada resgate consome uma
+    quantity = models.PositiveIntegerField(_("Quantidade"))
+    status = models.CharField(_("Status"), max_length=20, choices=STATUS_CHOICES, default=ACTIVE)
+    expires_at = models.DateTimeField(_("Expira em"))
+    created_at = models.DateTimeField(_("Criado em"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Atualizado em"), auto_now=True)
+    
+    class Meta:
+        verbose_name = _("Reserva na Loja")
+        verbose_name_plural = _("Reservas nas Lojas")
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # Reservas ativas da assinatura (resgate e limite de reservas)
+            models.Index(
+                fields=["subscription", "store", "supplement"],
+                condition=Q(status='active'),
+                name="store_reservation_active_idx"
+            ),
+            # Reservas ativas vencidas (expiração)
+            models.Index(
+                fields=["expires_at"],
+                condition=Q(status='active'),
+                name="store_reservation_expiry_idx"
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.subscription_id} @ {self.store_id} / {self.supplement_id}: {self.quantity} ({self.status})"
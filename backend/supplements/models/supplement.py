@@ -1,7 +1,18 @@
+import unicodedata
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+def normalize_sort_name(name):
+    """Chave de ordenação do nome, sem acentos e sem diferenciar maiúsculas"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
 class SupplementCategory(models.Model):
     """Categoria de suplementos (Proteína, Pré-treino, BCAA, etc)"""
     name = models.CharField(_("Nome"), max_length=100)
@@ -13,6 +24,9 @@ class SupplementCategory(models.Model):
         verbose_name = _("Categoria de Suplemento")
         verbose_name_plural = _("Categorias de Suplementos")
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="supp_category_updated_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -30,11 +44,14 @@ class Supplement(models.Model):
         OTHER = "other", _("Outro")
     
     name = models.CharField(_("Nome"), max_length=200)
+    # Ordenação por nome da listagem, igual no banco e no modelo de leitura em memória
+    sort_name = models.CharField(_("Nome para ordenação"), max_length=200, default="", editable=False)
     description = models.TextField(_("Descrição"))
     brand = models.CharField(_("Marca"), max_length=100)
     price = models.DecimalField(_("Preço"), max_digits=10, decimal_places=2)
     available = models.BooleanField(_("Disponível"), default=True)
     image = models.ImageField(_("Imagem"), upload_to="supplements/", blank=True, null=True)
+    image_variants = models.JSONField(_("Variantes da imagem"), default=dict, blank=True, editable=False)
     category = models.ForeignKey(
         SupplementCategory, 
         on_delete=models.CASCADE, 
@@ -53,11 +70,96 @@ class Supplement(models.Model):
     usage_instructions = models.TextField(_("Instruções de uso"), blank=True)
     created_at = models.DateTimeField(_("Criado em"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Atualizado em"), auto_now=True)
+    search_vector = SearchVectorField(_("Vetor de busca"), null=True, editable=False)
+    
+    # Campos de texto que compõem `search_vector`
+    SEARCH_FIELDS = ("name", "brand", "benefits", "ingredients", "description")
     
     class Meta:
         verbose_name = _("Suplemento")
         verbose_name_plural = _("Suplementos")
         ordering = ["name"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="supplement_search_vector_idx"),
+            models.Index(fields=["updated_at", "id"], name="supplement_updated_idx"),
+            models.Index(fields=["sort_name", "id"], name="supplement_sort_name_idx"),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} - {self.brand}"
+    
+    def save(self, *args, **kwargs):
+        self.sort_name = normalize_sort_name(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "sort_name"}
+        super().save(*args, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Texto indexado como lido do banco, para saber se o vetor de busca precisa mudar
+        instance._loaded_search_text = {
+            field: value for field, value in zip(field_names, values)
+            if field in cls.SEARCH_FIELDS
+        }
+        return instance
+
+
+class CatalogTombstone(models.Model):
+    """Registro de suplemento ou categoria removido, usado na sincronização incremental"""
+    
+    SUPPLEMENT = 'supplement'
+    CATEGORY = 'category'
+    
+    ENTITY_CHOICES = [
+        (SUPPLEMENT, _('Suplemento')),
+        (CATEGORY, _('Categoria')),
+    ]
+    
+    entity = models.CharField(_("Entidade"), max_length=20, choices=ENTITY_CHOICES)
+    object_id = models.PositiveIntegerField(_("ID do objeto"))
+    deleted_at = models.DateTimeField(_("Removido em"), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _("Remoção do Catálogo")
+        verbose_name_plural = _("Remoções do Catálogo")
+        ordering = ["deleted_at", "id"]
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="catalog_tombstone_deleted_idx"),
+        ]
+    
+    def __str__(self):
+        return f"{self.entity} {self.object_id} removido em {self.deleted_at}"
+
+
+class SupplementPriceHistory(models.Model):
+    """Histórico de alterações de preço de um suplemento"""
+    supplement = models.ForeignKey(
+        Supplement,
+        on_delete=models.CASCADE,
+        related_name="price_history",
+        verbose_name=_("Suplemento")
+    )
+    old_price = models.DecimalField(_("Preço anterior"), max_digits=10, decimal_places=2)
+    new_price = models.DecimalField(_("Novo preço"), max_digits=10, decimal_places=2)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name=_("Alterado por")
+    )
+    changed_at = models.DateTimeField(_("Alterado em"), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _("Histórico de Preço")
+        verbose_name_plural = _("Históricos de Preço")
+        ordering = ["-changed_at", "-id"]
+        indexes = [
+            models.Index(fields=["supplement", "-changed_at"], name="supp_price_history_idx"),
+        ]
     
     def __str__(self):
-        return f"{self.name} - {self.brand}"
\ No newline at end of file
+        return f"{self.supplement_id}: {self.old_price} -> {self.new_price}"
@@ -1 +1,8 @@
-from .supplement_serializers import SupplementSerializer, SupplementCategorySerializer
\ No newline at end of file
+from .supplement_serializers import SupplementSerializer, SupplementCategorySerializer, SupplementSearchResultSerializer, SupplementBulkUpdateItemSerializer
+from .supplement_row_renderer import SupplementRowRenderer
+from .inventory_serializers import (
+    StoreInventorySerializer,
+    StoreReservationRequestSerializer,
+    StoreReservationSerializer,
+    PickupStoresQuerySerializer,
+)
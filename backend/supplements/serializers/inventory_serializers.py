@@ -0,0 +1,41 @@
+from rest_framework import serializers
+
+from supplements.models import StoreInventory, StoreReservation
+from supplements.services import StoreInventoryService
+
+
+class StoreInventorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StoreInventory
+        fields = ['id', 'store', 'supplement', 'quantity', 'updated_at']
+        read_only_fields = ['updated_at']
+    
+    def validate_store(self, value):
+        """Apenas o proprietário da loja (ou um administrador) altera o estoque"""
+        user = self.context['request'].user
+        if not user.is_staff and value.owner_id != user.id:
+            raise serializers.ValidationError('Você não é o proprietário desta loja.')
+        return value
+
+
+class StoreReservationRequestSerializer(serializers.Serializer):
+    """Reserva de unidades de um suplemento em uma loja"""
+    store = serializers.IntegerField(min_value=1)
+    supplement = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(
+        min_value=1, max_value=StoreInventoryService.MAX_RESERVATION_QUANTITY, default=1
+    )
+
+
+class StoreReservationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StoreReservation
+        fields = ['id', 'store', 'supplement', 'subscription', 'quantity', 'status', 'expires_at', 'created_at']
+        read_only_fields = fields
+
+
+class PickupStoresQuerySerializer(serializers.Serializer):
+    """Parâmetros da busca de lojas para retirada"""
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(min_value=0.1, required=False)
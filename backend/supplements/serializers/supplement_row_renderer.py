@@ -0,0 +1,126 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from rest_framework.utils.encoders import JSONEncoder
+
+from supplements.serializers.supplement_serializers import SupplementSerializer, variant_url_builder
+from supplements.services import SupplementImageService
+
+
+class SupplementRowRenderer:
+    """
+    Renderização rápida da listagem de suplementos a partir de linhas `.values()`.
+
+    Reaproveita os campos do `SupplementSerializer` para formatar os valores,
+    sem instanciar modelos, e guarda o JSON de cada linha em cache pela
+    chave (id, updated_at, URL base), de modo que suplementos inalterados
+    não sejam serializados novamente. A data de atualização da categoria
+    também compõe a chave, pois o nome dela é incluído na linha.
+    """
+
+    CACHE_TIMEOUT = 60 * 60 * 24
+
+    VALUE_FIELDS = (
+        'id', 'name', 'description', 'brand', 'price', 'available', 'image',
+        'image_variants', 'category_id', 'category__name', 'type', 'serving_size',
+        'ingredients', 'benefits', 'usage_instructions', 'created_at', 'updated_at',
+        'category__updated_at',
+    )
+
+    # Campos cujo valor é formatado pelo campo correspondente do serializer
+    FORMATTED_FIELDS = ('price', 'created_at', 'updated_at')
+
+    def __init__(self, request):
+        self.request = request
+        self.fields = SupplementSerializer(context={'request': request}).fields
+        self.build_variant_url = variant_url_builder(request)
+        # As URLs de imagem dependem do host e da versão da API
+        resolver_match = getattr(request, 'resolver_match', None)
+        version = resolver_match.kwargs.get('version', '') if resolver_match else ''
+        base_url = request.build_absolute_uri('/') + version
+        self.base_key = hashlib.sha256(base_url.encode('utf-8')).hexdigest()[:12]
+
+    def cache_key(self, row):
+        category_updated_at = row['category__updated_at']
+        return (
+            f"supplements:row:{self.base_key}:{row['id']}:{row['updated_at'].timestamp()}:"
+            f"{category_updated_at.timestamp() if category_updated_at else ''}"
+        )
+
+    def to_representation(self, row):
+        """
+        Converte uma linha em um dicionário igual ao do `SupplementSerializer`.
+        """
+        data = {}
+        for name in self.fields:
+            if name == 'image':
+                image = row['image']
+                data[name] = (
+                    self.request.build_absolute_uri(default_storage.url(image)) if image else None
+                )
+            elif name == 'image_srcset':
+                data[name] = SupplementImageService.build_srcsets(
+                    row['image_variants'], self.build_variant_url
+                )
+            elif name == 'category':
+                data[name] = row['category_id']
+            elif name == 'category_name':
+                data[name] = row['category__name']
+            elif name in self.FORMATTED_FIELDS:
+                value = row[name]
+                data[name] = None if value is None else self.fields[name].to_representation(value)
+            else:
+                data[name] = row[name]
+        return data
+
+    def render_rows(self, rows):
+        """
+        Retorna o JSON (bytes) de cada linha, usando o cache quando possível.
+
+        Args:
+            rows (list): Linhas obtidas com `VALUE_FIELDS`.
+
+        Returns:
+            list: JSON de cada linha, na mesma ordem.
+        """
+        keys = [self.cache_key(row) for row in rows]
+        cached = cache.get_many(keys)
+
+        rendered = []
+        missing = {}
+        for key, row in zip(keys, rows):
+            body = cached.get(key)
+            if body is None:
+                body = json.dumps(
+                    self.to_representation(row),
+                    cls=JSONEncoder,
+                    ensure_ascii=False,
+                    separators=(',', ':')
+                ).encode('utf-8')
+                missing[key] = body
+            rendered.append(body)
+
+        if missing:
+            cache.set_many(missing, timeout=self.CACHE_TIMEOUT)
+        return rendered
+
+    def render_page(self, envelope, rows):
+        """
+        Monta o corpo JSON da página, inserindo as linhas já renderizadas.
+
+        Args:
+            envelope (dict): Campos da página (count, next, previous), sem `results`.
+            rows (list): Linhas obtidas com `VALUE_FIELDS`.
+
+        Returns:
+            bytes: Corpo da resposta.
+        """
+        head = json.dumps(
+            envelope, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+        results = b'[' + b','.join(self.render_rows(rows)) + b']'
+        if head == b'{}':
+            return b'{"results":' + results + b'}'
+        return head[:-1] + b',"results":' + results + b'}'
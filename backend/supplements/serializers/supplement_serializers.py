@@ -1,5 +1,23 @@
+from decimal import Decimal
+
 from rest_framework import serializers
+from django.urls import reverse
 from supplements.models import Supplement, SupplementCategory
+from supplements.services import SupplementImageService
+
+
+def variant_url_builder(request):
+    """
+    Retorna a função que monta a URL de uma variante de imagem.
+    """
+    resolver_match = getattr(request, 'resolver_match', None)
+    version = resolver_match.kwargs.get('version', 'v1') if resolver_match else 'v1'
+    
+    def build_url(name):
+        url = reverse('supplements:supplement-image', kwargs={'version': version, 'name': name})
+        return request.build_absolute_uri(url) if request else url
+    
+    return build_url
 
 
 class SupplementCategorySerializer(serializers.ModelSerializer):
@@ -10,13 +28,41 @@ class SupplementCategorySerializer(serializers.ModelSerializer):
 
 class SupplementSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
+    image_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Supplement
         fields = [
             'id', 'name', 'description', 'brand', 'price', 'available',
-            'image', 'category', 'category_name', 'type', 'serving_size',
+            'image', 'image_srcset', 'category', 'category_name', 'type', 'serving_size',
             'ingredients', 'benefits', 'usage_instructions',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['created_at', 'updated_at']
+    
+    def get_image_srcset(self, obj):
+        """`srcset` das variantes WebP e JPEG e URL da miniatura"""
+        return SupplementImageService.build_srcsets(
+            obj.image_variants, variant_url_builder(self.context.get('request'))
+        )
+
+
+class SupplementSearchResultSerializer(SupplementSerializer):
+    """Suplemento encontrado pela busca textual, com relevância e destaque"""
+    search_rank = serializers.FloatField(read_only=True)
+    search_headline = serializers.CharField(read_only=True)
+    
+    class Meta(SupplementSerializer.Meta):
+        fields = SupplementSerializer.Meta.fields + ['search_rank', 'search_headline']
+
+
+class SupplementBulkUpdateItemSerializer(serializers.Serializer):
+    """Linha de uma atualização em lote de preço e disponibilidade"""
+    id = serializers.IntegerField(min_value=1)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'), required=False)
+    available = serializers.BooleanField(required=False)
+    
+    def validate(self, attrs):
+        if 'price' not in attrs and 'available' not in attrs:
+            raise serializers.ValidationError('Informe price e/ou available.')
+        return attrs
@@ -0,0 +1,11 @@
+from .search_service import SupplementSearchService
+from .catalog_version import CatalogVersion
+from .facet_service import SupplementFacetService
+from .image_service import SupplementImageService
+from .catalog_read_model import CatalogReadModel
+from .sync_service import CatalogSyncService
+from .recommendation_service import SupplementRecommendationService
+from .bulk_update_service import SupplementBulkUpdateService
+from .autocomplete_service import SupplementAutocompleteIndex
+from .inventory_service import StoreInventoryService
+from .snapshot_service import CatalogSnapshotService
@@ -0,0 +1,274 @@
+import bisect
+import re
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.db_connection import LoggerManager
+from supplements.models import Supplement
+from supplements.services.catalog_version import CatalogVersion
+from supplements.services.recommendation_service import normalize_text
+
+
+def normalize_words(text):
+    """Palavras do texto sem acentos, em minúsculas e sem pontuação"""
+    return re.sub(r'[\W_]+', ' ', normalize_text(text)).split()
+
+
+class SupplementAutocompleteIndex:
+    """
+    Índice em memória do autocompletar de nomes e marcas de suplementos.
+
+    Cada palavra do nome e da marca de um suplemento disponível gera uma
+    chave normalizada (sem acentos, pontuação e maiúsculas) com o texto a
+    partir dela, guardada em uma lista ordenada de pares (chave, ID). Uma consulta
+    é uma busca binária pelo prefixo seguida da leitura das chaves que o
+    compartilham; os resultados são ordenados pela popularidade (resgates
+    dos últimos `POPULARITY_DAYS` dias) e guardados até a próxima alteração.
+
+    O índice é atualizado no próprio processo quando um suplemento é salvo
+    ou removido; os demais processos aplicam as alterações pelo
+    `updated_at` quando a versão do catálogo muda.
+    """
+
+    _instance: Optional['SupplementAutocompleteIndex'] = None
+    _lock = threading.Lock()
+
+    DEFAULT_LIMIT = 10
+    MAX_LIMIT = 50
+    MAX_RESULT_CACHE = 4096
+    POPULARITY_DAYS = 30
+    POPULARITY_TTL = 60 * 60
+    SAFETY_WINDOW = timedelta(seconds=30)
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(SupplementAutocompleteIndex, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._entries = []
+        self._keys_by_id = {}
+        self._labels = {}
+        self._popularity = {}
+        self._results = {}
+        self._version = None
+        self._watermark = None
+        self._popularity_at = 0.0
+        self._update_lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls) -> 'SupplementAutocompleteIndex':
+        """Retorna a instância única do índice"""
+        return cls()
+
+    @staticmethod
+    def build_keys(name, brand):
+        """
+        Gera as chaves de um suplemento: o texto normalizado do nome e da
+        marca a partir de cada palavra.
+
+        Returns:
+            set: Chaves do suplemento.
+        """
+        keys = set()
+        for text in (name, brand):
+            words = normalize_words(text)
+            for start in range(len(words)):
+                keys.add(' '.join(words[start:]))
+        return keys
+
+    @staticmethod
+    def load_popularity(days):
+        """
+        Soma os resgates diários recentes de cada suplemento.
+
+        Returns:
+            dict: Resgates por ID de suplemento.
+        """
+        # Importação local: o app de assinaturas depende do app de suplementos
+        from subscription_plans.models import SupplementUsageRollup
+
+        since = timezone.now() - timedelta(days=days)
+        return dict(
+            SupplementUsageRollup.objects.filter(
+                granularity=SupplementUsageRollup.DAY,
+                period_start__gte=since
+            ).values('supplement_id').annotate(total=Sum('redemptions')).values_list(
+                'supplement_id', 'total'
+            )
+        )
+
+    def _remove(self, supplement_id):
+        for key in self._keys_by_id.pop(supplement_id, ()):
+            position = bisect.bisect_left(self._entries, (key, supplement_id))
+            if position < len(self._entries) and self._entries[position] == (key, supplement_id):
+                del self._entries[position]
+        self._labels.pop(supplement_id, None)
+
+    def _add(self, supplement_id, name, brand, available):
+        self._remove(supplement_id)
+        if not available:
+            return
+
+        keys = self.build_keys(name, brand)
+        for key in keys:
+            bisect.insort(self._entries, (key, supplement_id))
+        self._keys_by_id[supplement_id] = keys
+        self._labels[supplement_id] = (name, brand)
+
+    def rebuild(self):
+        """
+        Reconstrói o índice a partir de todos os suplementos disponíveis.
+        """
+        rows = Supplement.objects.filter(available=True).values_list('id', 'name', 'brand', 'updated_at')
+        entries = []
+        keys_by_id = {}
+        labels = {}
+        watermark = None
+        for supplement_id, name, brand, updated_at in rows.iterator(chunk_size=2000):
+            keys = self.build_keys(name, brand)
+            entries.extend((key, supplement_id) for key in keys)
+            keys_by_id[supplement_id] = keys
+            labels[supplement_id] = (name, brand)
+            if watermark is None or updated_at > watermark:
+                watermark = updated_at
+        entries.sort()
+
+        with self._update_lock:
+            self._entries = entries
+            self._keys_by_id = keys_by_id
+            self._labels = labels
+            self._watermark = watermark
+            self._results = {}
+
+    def update(self, supplement):
+        """
+        Atualiza as chaves de um suplemento salvo.
+
+        Args:
+            supplement (Supplement): Suplemento salvo.
+        """
+        with self._update_lock:
+            if self._version is None:
+                # Índice ainda não carregado neste processo
+                return
+            self._add(supplement.pk, supplement.name, supplement.brand, supplement.available)
+            self._results = {}
+
+    def remove(self, supplement_id):
+        """
+        Remove as chaves de um suplemento removido.
+
+        Args:
+            supplement_id (int): ID do suplemento.
+        """
+        with self._update_lock:
+            if self._version is None:
+                return
+            self._remove(supplement_id)
+            self._results = {}
+
+    def _apply_changes(self):
+        """
+        Aplica as alterações feitas por outros processos desde a última leitura.
+        """
+        if self._watermark is None:
+            self.rebuild()
+            return
+
+        changed = Supplement.objects.filter(
+            updated_at__gte=self._watermark - self.SAFETY_WINDOW
+        ).values_list('id', 'name', 'brand', 'available', 'updated_at')
+        for supplement_id, name, brand, available, updated_at in changed:
+            self._add(supplement_id, name, brand, available)
+            if updated_at > self._watermark:
+                self._watermark = updated_at
+
+        # Remoções não deixam rastro no `updated_at`: compara os totais
+        if Supplement.objects.filter(available=True).count() != len(self._keys_by_id):
+            self.rebuild()
+        self._results = {}
+
+    def ensure_current(self):
+        """
+        Carrega o índice ou aplica as alterações se a versão do catálogo mudou,
+        e renova a popularidade quando vencida.
+        """
+        version = CatalogVersion.get()
+        now = time.monotonic()
+        if version == self._version and now - self._popularity_at < self.POPULARITY_TTL:
+            return
+
+        with self._update_lock:
+            if self._version is None:
+                self.rebuild()
+            elif version != self._version:
+                self._apply_changes()
+
+            if now - self._popularity_at >= self.POPULARITY_TTL:
+                try:
+                    self._popularity = self.load_popularity(self.POPULARITY_DAYS)
+                except Exception as e:
+                    LoggerManager.get_instance().error(
+                        f"Erro ao carregar a popularidade dos suplementos: {e}"
+                    )
+                self._popularity_at = now
+                self._results = {}
+            self._version = version
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Retorna os suplementos cujo nome ou marca tem uma palavra iniciada
+        pelo texto consultado, dos mais aos menos populares.
+
+        Args:
+            query (str): Texto digitado.
+            limit (int): Quantidade máxima de resultados.
+
+        Returns:
+            list: Dicionários com `id`, `name` e `brand`.
+        """
+        prefix = ' '.join(normalize_words(query))
+        if not prefix:
+            return []
+
+        self.ensure_current()
+        cache_key = (prefix, limit)
+        results = self._results.get(cache_key)
+        if results is not None:
+            return results
+
+        with self._update_lock:
+            entries = self._entries
+            matches = set()
+            position = bisect.bisect_left(entries, (prefix,))
+            while position < len(entries) and entries[position][0].startswith(prefix):
+                matches.add(entries[position][1])
+                position += 1
+
+            popularity = self._popularity
+            labels = self._labels
+            ranked = sorted(
+                matches,
+                key=lambda supplement_id: (-popularity.get(supplement_id, 0), labels[supplement_id][0], supplement_id)
+            )[:limit]
+            results = [
+                {'id': supplement_id, 'name': labels[supplement_id][0], 'brand': labels[supplement_id][1]}
+                for supplement_id in ranked
+            ]
+
+            if len(self._results) >= self.MAX_RESULT_CACHE:
+                self._results = {}
+            self._results[cache_key] = results
+        return results
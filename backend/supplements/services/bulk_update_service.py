@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.utils import timezone
+
+from supplements.models import Supplement, SupplementPriceHistory
+from supplements.services.catalog_version import CatalogVersion
+
+
+class SupplementBulkUpdateService:
+    """
+    Classe de serviço da atualização em lote de preço e disponibilidade.
+
+    O lote é comparado aos valores atuais em uma única consulta e apenas
+    as linhas que realmente mudaram são gravadas, com `bulk_update` em
+    blocos. O histórico de preços é gravado na mesma transação e a versão
+    do catálogo muda uma única vez por lote.
+    """
+
+    CHUNK_SIZE = 500
+
+    @staticmethod
+    def apply(items, user=None, chunk_size=None):
+        """
+        Aplica um lote de alterações.
+
+        Args:
+            items (list): Dicionários validados com `id` e `price` e/ou `available`;
+                se um ID se repetir, vale a última linha.
+            user: Usuário responsável pelas alterações.
+            chunk_size (int): Linhas por comando de atualização.
+
+        Returns:
+            dict: Totais do lote e IDs não encontrados.
+        """
+        chunk_size = chunk_size or SupplementBulkUpdateService.CHUNK_SIZE
+        requested = {item['id']: item for item in items}
+
+        with transaction.atomic():
+            # Travamento sempre em ordem de ID: lotes concorrentes com IDs em
+            # comum não entram em impasse (deadlock)
+            current = list(
+                Supplement.objects.select_for_update().filter(
+                    id__in=list(requested)
+                ).order_by('id').values_list('id', 'price', 'available')
+            )
+
+            now = timezone.now()
+            changed = []
+            history = []
+            for supplement_id, price, available in current:
+                item = requested[supplement_id]
+                new_price = item.get('price', price)
+                new_available = item.get('available', available)
+                if new_price == price and new_available == available:
+                    continue
+
+                changed.append(Supplement(
+                    id=supplement_id,
+                    price=new_price,
+                    available=new_available,
+                    updated_at=now
+                ))
+                if new_price != price:
+                    history.append(SupplementPriceHistory(
+                        supplement_id=supplement_id,
+                        old_price=price,
+                        new_price=new_price,
+                        changed_by=user
+                    ))
+
+            if changed:
+                Supplement.objects.bulk_update(
+                    changed, ['price', 'available', 'updated_at'], batch_size=chunk_size
+                )
+                SupplementPriceHistory.objects.bulk_create(history, batch_size=chunk_size)
+                # `bulk_update` não dispara sinais: o catálogo é invalidado uma vez
+                CatalogVersion.bump()
+
+        return {
+            'received': len(requested),
+            'updated': len(changed),
+            'price_changes': len(history),
+            'unchanged': len(current) - len(changed),
+            'not_found': sorted(set(requested) - {supplement_id for supplement_id, _, _ in current}),
+        }
@@ -0,0 +1,354 @@
+import bisect
+import threading
+import time
+from array import array
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from supplements.models import Supplement, SupplementCategory
+from supplements.services.catalog_version import CatalogVersion
+
+
+class CatalogSnapshot:
+    """
+    Cópia colunar e imutável do catálogo de suplementos.
+
+    Cada suplemento ocupa uma posição nas colunas, em ordem de ID. Marcas e
+    tipos são guardados uma única vez e referenciados por índice, e preços
+    em centavos; as permutações de ordenação são calculadas sob demanda.
+    O nome é guardado já normalizado (`Supplement.sort_name`), a mesma
+    coluna que o banco usa para ordenar a listagem.
+    """
+
+    __slots__ = (
+        'ids', 'sort_names', 'prices', 'available', 'category_ids', 'brands', 'types',
+        'created_at', 'strings', 'string_index', 'category_set', 'watermark', '_orderings',
+    )
+
+    ORDERING_FIELDS = ('name', 'price', 'created_at')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.sort_names = []
+        self.prices = array('q')
+        self.available = bytearray()
+        self.category_ids = array('q')
+        self.brands = array('I')
+        self.types = array('I')
+        self.created_at = array('d')
+        self.strings = []
+        self.string_index = {}
+        self.category_set = frozenset()
+        self.watermark = None
+        self._orderings = {}
+
+    def copy(self):
+        """Retorna uma cópia das colunas, para receber alterações"""
+        snapshot = CatalogSnapshot()
+        snapshot.ids = array('q', self.ids)
+        snapshot.sort_names = list(self.sort_names)
+        snapshot.prices = array('q', self.prices)
+        snapshot.available = bytearray(self.available)
+        snapshot.category_ids = array('q', self.category_ids)
+        snapshot.brands = array('I', self.brands)
+        snapshot.types = array('I', self.types)
+        snapshot.created_at = array('d', self.created_at)
+        snapshot.strings = self.strings
+        snapshot.string_index = self.string_index
+        snapshot.category_set = self.category_set
+        snapshot.watermark = self.watermark
+        return snapshot
+
+    def __len__(self):
+        return len(self.ids)
+
+    def intern(self, value):
+        """Retorna o índice de uma marca ou tipo, registrando-o se for novo"""
+        index = self.string_index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self.string_index[value] = index
+        return index
+
+    def upsert(self, row):
+        """
+        Insere ou atualiza um suplemento a partir de uma linha de `Supplement.values_list`.
+        """
+        supplement_id, sort_name, price, available, category_id, brand, type_, created_at, updated_at = row
+        values = (
+            sort_name,
+            int(price.scaleb(2)),
+            1 if available else 0,
+            category_id,
+            self.intern(brand),
+            self.intern(type_),
+            created_at.timestamp(),
+        )
+        columns = (
+            self.sort_names, self.prices, self.available, self.category_ids,
+            self.brands, self.types, self.created_at,
+        )
+
+        position = bisect.bisect_left(self.ids, supplement_id)
+        if position < len(self.ids) and self.ids[position] == supplement_id:
+            for column, value in zip(columns, values):
+                column[position] = value
+        else:
+            self.ids.insert(position, supplement_id)
+            for column, value in zip(columns, values):
+                column.insert(position, value)
+
+        if self.watermark is None or updated_at > self.watermark:
+            self.watermark = updated_at
+
+    def ordering(self, fields):
+        """
+        Retorna as posições dos suplementos na ordenação pedida.
+
+        Args:
+            fields (tuple): Campos de `ORDERING_FIELDS`, com `-` para ordem decrescente.
+
+        Returns:
+            array: Posições ordenadas, com o ID como desempate.
+        """
+        permutation = self._orderings.get(fields)
+        if permutation is not None:
+            return permutation
+
+        columns = {
+            'name': self.sort_names,
+            'price': self.prices,
+            'created_at': self.created_at,
+        }
+        positions = list(range(len(self.ids)))
+        # Ordenações estáveis do último critério para o primeiro
+        for field in reversed(fields):
+            column = columns[field.lstrip('-')]
+            positions.sort(key=column.__getitem__, reverse=field.startswith('-'))
+
+        permutation = array('I', positions)
+        self._orderings[fields] = permutation
+        return permutation
+
+    def filter_ids(self, filters, ordering):
+        """
+        Retorna os IDs que atendem aos filtros, na ordenação pedida.
+
+        Args:
+            filters (dict): Valores de `available`, `category`, `type` e `brand`.
+            ordering (tuple): Campos de ordenação.
+
+        Returns:
+            list: IDs dos suplementos.
+        """
+        checks = []
+        if 'available' in filters:
+            checks.append((self.available, 1 if filters['available'] else 0))
+        if 'category' in filters:
+            checks.append((self.category_ids, filters['category']))
+        for field, column in (('type', self.types), ('brand', self.brands)):
+            if field in filters:
+                index = self.string_index.get(filters[field])
+                if index is None:
+                    return []
+                checks.append((column, index))
+
+        ids = self.ids
+        return [
+            ids[position]
+            for position in self.ordering(ordering)
+            if all(column[position] == value for column, value in checks)
+        ]
+
+
+class CatalogReadModel:
+    """
+    Modelo de leitura do catálogo de suplementos mantido em memória.
+
+    Responde à filtragem, ordenação e paginação da listagem de suplementos
+    sem consultar o banco. A cópia é atualizada de forma incremental: quando
+    a versão do catálogo muda, ou a cada `REFRESH_INTERVAL` segundos (para
+    perceber alterações feitas com `QuerySet.update`), são lidos apenas os
+    suplementos com `updated_at` posterior ao último visto; se o total não
+    bater com o do banco (remoções), a cópia é reconstruída.
+    """
+
+    _instance: Optional['CatalogReadModel'] = None
+    _lock = threading.Lock()
+
+    REFRESH_INTERVAL = getattr(settings, 'SUPPLEMENT_CATALOG_REFRESH_INTERVAL', 5)
+
+    # Margem para transações que gravaram um `updated_at` anterior ao último
+    # visto, mas fizeram commit depois da leitura
+    SAFETY_WINDOW = timedelta(seconds=30)
+
+    ROW_FIELDS = (
+        'id', 'sort_name', 'price', 'available', 'category_id', 'brand', 'type',
+        'created_at', 'updated_at',
+    )
+    FILTER_FIELDS = ('available', 'category', 'type', 'brand')
+    # Qualquer outro parâmetro (busca, page_size, etc.) segue pelo banco
+    SUPPORTED_PARAMS = FILTER_FIELDS + ('ordering', 'page')
+    BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(CatalogReadModel, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = None
+        self._checked_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'CatalogReadModel':
+        """Retorna a instância única do modelo de leitura"""
+        return cls()
+
+    def rebuild(self):
+        """
+        Reconstrói a cópia a partir de todos os suplementos.
+
+        Returns:
+            CatalogSnapshot: Nova cópia do catálogo.
+        """
+        snapshot = CatalogSnapshot()
+        rows = Supplement.objects.order_by('id').values_list(*self.ROW_FIELDS)
+        for row in rows.iterator(chunk_size=2000):
+            snapshot.upsert(row)
+        snapshot.category_set = frozenset(SupplementCategory.objects.values_list('id', flat=True))
+        return snapshot
+
+    def refresh(self, snapshot, version_changed):
+        """
+        Aplica à cópia as alterações feitas desde a última leitura.
+
+        Args:
+            snapshot (CatalogSnapshot): Cópia atual.
+            version_changed (bool): Se a versão do catálogo mudou.
+
+        Returns:
+            CatalogSnapshot: A mesma cópia, se nada mudou, ou uma nova.
+        """
+        state = Supplement.objects.aggregate(total=Count('id'), last_update=Max('updated_at'))
+        if not version_changed and state['total'] == len(snapshot) and (
+            state['last_update'] is None
+            or (snapshot.watermark is not None and state['last_update'] <= snapshot.watermark)
+        ):
+            return snapshot
+
+        updated = snapshot.copy()
+        if snapshot.watermark is not None:
+            changed = Supplement.objects.filter(
+                updated_at__gte=snapshot.watermark - self.SAFETY_WINDOW
+            ).values_list(*self.ROW_FIELDS)
+            for row in changed:
+                updated.upsert(row)
+
+        if len(updated) != state['total']:
+            return self.rebuild()
+
+        if version_changed:
+            updated.category_set = frozenset(SupplementCategory.objects.values_list('id', flat=True))
+        return updated
+
+    def get_snapshot(self):
+        """
+        Retorna a cópia atualizada do catálogo.
+
+        Returns:
+            CatalogSnapshot: Cópia do catálogo.
+        """
+        version = CatalogVersion.get()
+        now = time.monotonic()
+        if (
+            self._snapshot is not None
+            and version == self._version
+            and now - self._checked_at < self.REFRESH_INTERVAL
+        ):
+            return self._snapshot
+
+        with self._refresh_lock:
+            if self._snapshot is None:
+                self._snapshot = self.rebuild()
+            elif version != self._version or now - self._checked_at >= self.REFRESH_INTERVAL:
+                self._snapshot = self.refresh(self._snapshot, version != self._version)
+            self._version = version
+            self._checked_at = now
+            return self._snapshot
+
+    def parse_params(self, query_params, default_ordering):
+        """
+        Converte os parâmetros da listagem em filtros e ordenação.
+
+        Args:
+            query_params: Parâmetros da requisição.
+            default_ordering (tuple): Ordenação sem o parâmetro `ordering`.
+
+        Returns:
+            tuple: Filtros e ordenação, ou None se houver parâmetros que o
+            modelo de leitura não responde ou algum valor precisar da
+            validação dos filtros do banco (a listagem segue pelo banco).
+        """
+        if any(param not in self.SUPPORTED_PARAMS for param in query_params):
+            return None
+
+        filters = {}
+        for field in self.FILTER_FIELDS:
+            value = query_params.get(field, '')
+            if value == '':
+                continue
+            if field == 'available':
+                if value.lower() not in self.BOOLEAN_VALUES:
+                    return None
+                filters[field] = self.BOOLEAN_VALUES[value.lower()]
+            elif field == 'category':
+                if not value.isdigit():
+                    return None
+                filters[field] = int(value)
+            elif field == 'type':
+                if value not in Supplement.SupplementType.values:
+                    return None
+                filters[field] = value
+            else:
+                filters[field] = value
+
+        ordering = tuple(
+            term.strip() for term in query_params.get('ordering', '').split(',')
+            if term.strip().lstrip('-') in CatalogSnapshot.ORDERING_FIELDS
+        )
+        return filters, ordering or default_ordering
+
+    def list_ids(self, query_params, default_ordering=('name',)):
+        """
+        Retorna os IDs da listagem de suplementos para os parâmetros dados.
+
+        Args:
+            query_params: Parâmetros da requisição.
+            default_ordering (tuple): Ordenação sem o parâmetro `ordering`.
+
+        Returns:
+            list: IDs em ordem, ou None se a consulta deve ir ao banco.
+        """
+        parsed = self.parse_params(query_params, default_ordering)
+        if parsed is None:
+            return None
+
+        filters, ordering = parsed
+        snapshot = self.get_snapshot()
+        if 'category' in filters and filters['category'] not in snapshot.category_set:
+            # Categoria inexistente: o filtro do banco responde com o erro de validação
+            return None
+        return snapshot.filter_ids(filters, ordering)
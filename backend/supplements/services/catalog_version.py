@@ -0,0 +1,40 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class CatalogVersion:
+    """
+    Versão do catálogo de suplementos, guardada no cache do Django.
+
+    Resultados derivados do catálogo (facetas, snapshots, etc.) incluem a
+    versão em suas chaves; ao alterar um suplemento ou categoria a versão
+    muda e as entradas antigas deixam de ser consultadas.
+    """
+
+    CACHE_KEY = 'supplements:catalog_version'
+
+    @staticmethod
+    def get():
+        """
+        Retorna a versão atual, criando-a se ainda não existir.
+
+        Returns:
+            str: Versão do catálogo.
+        """
+        version = cache.get(CatalogVersion.CACHE_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(CatalogVersion.CACHE_KEY, version, timeout=None):
+                version = cache.get(CatalogVersion.CACHE_KEY, version)
+        return version
+
+    @staticmethod
+    def bump():
+        """
+        Gera uma nova versão após o commit da transação corrente.
+        """
+        transaction.on_commit(
+            lambda: cache.set(CatalogVersion.CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        )
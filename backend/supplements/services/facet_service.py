@@ -0,0 +1,156 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count
+
+from supplements.models import Supplement
+from supplements.services.catalog_version import CatalogVersion
+
+
+class SupplementFacetService:
+    """
+    Classe de serviço das contagens por faceta do catálogo.
+
+    No PostgreSQL todas as facetas são contadas por uma única consulta
+    com GROUPING SETS; nos demais bancos, por uma consulta agrupada por
+    faceta. O resultado fica em cache por combinação de filtros e versão
+    do catálogo.
+    """
+
+    CACHE_TIMEOUT = 600
+
+    # (faceta, colunas do agrupamento)
+    FACETS = (
+        ('available', ('available',)),
+        ('category', ('category_id', 'category__name')),
+        ('type', ('type',)),
+        ('brand', ('brand',)),
+    )
+
+    @staticmethod
+    def get_cache_key(params):
+        """
+        Monta a chave de cache de uma combinação de filtros.
+
+        Args:
+            params (dict): Parâmetros de filtro da requisição.
+
+        Returns:
+            str: Chave de cache.
+        """
+        payload = json.dumps(sorted(params.items()), default=str)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return f'supplements:facets:{CatalogVersion.get()}:{digest}'
+
+    @staticmethod
+    def get_facets(queryset, params):
+        """
+        Retorna as contagens por valor de cada faceta do queryset filtrado.
+
+        Args:
+            queryset (QuerySet): Suplementos já filtrados.
+            params (dict): Parâmetros de filtro que produziram o queryset.
+
+        Returns:
+            dict: Listas de {value, label, count} por faceta.
+        """
+        key = SupplementFacetService.get_cache_key(params)
+        facets = cache.get(key)
+        if facets is None:
+            facets = SupplementFacetService.count_facets(queryset)
+            cache.set(key, facets, timeout=SupplementFacetService.CACHE_TIMEOUT)
+        return facets
+
+    @staticmethod
+    def count_facets(queryset):
+        """
+        Conta os valores de cada faceta do queryset.
+
+        Args:
+            queryset (QuerySet): Suplementos já filtrados.
+
+        Returns:
+            dict: Listas de {value, label, count} por faceta.
+        """
+        queryset = queryset.order_by()
+        if connections[queryset.db].vendor == 'postgresql':
+            return SupplementFacetService._count_with_grouping_sets(queryset)
+
+        facets = {}
+        for name, columns in SupplementFacetService.FACETS:
+            rows = queryset.values(*columns).annotate(count=Count('id')).order_by(*columns)
+            facets[name] = [
+                SupplementFacetService._facet_value(name, [row[column] for column in columns], row['count'])
+                for row in rows
+            ]
+        return facets
+
+    @staticmethod
+    def _count_with_grouping_sets(queryset):
+        columns = [column for _, facet_columns in SupplementFacetService.FACETS for column in facet_columns]
+        aliases = [f'c{index}' for index in range(len(columns))]
+        sql, params = queryset.values_list(*columns).query.sql_with_params()
+
+        grouping_sets = []
+        position = 0
+        for _, facet_columns in SupplementFacetService.FACETS:
+            grouping_sets.append('(' + ', '.join(aliases[position:position + len(facet_columns)]) + ')')
+            position += len(facet_columns)
+
+        # GROUPING(...) identifica a qual conjunto cada linha pertence
+        first_aliases = []
+        position = 0
+        for _, facet_columns in SupplementFacetService.FACETS:
+            first_aliases.append(aliases[position])
+            position += len(facet_columns)
+
+        query = (
+            f"SELECT {', '.join(aliases)}, GROUPING({', '.join(first_aliases)}), COUNT(*) "
+            f"FROM ({sql}) AS filtered({', '.join(aliases)}) "
+            f"GROUP BY GROUPING SETS ({', '.join(grouping_sets)}) "
+            f"ORDER BY {', '.join(aliases)}"
+        )
+
+        facets = {name: [] for name, _ in SupplementFacetService.FACETS}
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(query, params)
+            for row in cursor.fetchall():
+                decoded = SupplementFacetService.decode_grouping_row(row)
+                if decoded is not None:
+                    facets[decoded[0]].append(decoded[1])
+        return facets
+
+    @staticmethod
+    def decode_grouping_row(row):
+        """
+        Identifica a faceta de uma linha do GROUPING SETS.
+
+        Args:
+            row (tuple): Colunas de todas as facetas, GROUPING(...) e contagem.
+
+        Returns:
+            tuple: Nome da faceta e {value, label, count}, ou None se a
+            linha não pertencer a nenhum conjunto.
+        """
+        values, grouping, count = row[:-2], row[-2], row[-1]
+        # O bit da faceta agrupada é 0; os das demais são 1
+        position = 0
+        for index, (name, facet_columns) in enumerate(SupplementFacetService.FACETS):
+            bit = 1 << (len(SupplementFacetService.FACETS) - 1 - index)
+            if not grouping & bit:
+                return name, SupplementFacetService._facet_value(
+                    name, values[position:position + len(facet_columns)], count
+                )
+            position += len(facet_columns)
+        return None
+
+    @staticmethod
+    def _facet_value(name, values, count):
+        value = values[0]
+        if name == 'type' and value in Supplement.SupplementType.values:
+            label = str(Supplement.SupplementType(value).label)
+        else:
+            label = values[-1]
+        return {'value': value, 'label': label, 'count': count}
@@ -0,0 +1,273 @@
+import hashlib
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.db_connection import LoggerManager
+from supplements.models import Supplement
+from supplements.services.catalog_version import CatalogVersion
+
+
+VARIANT_WIDTHS = (160, 320, 640, 1024)
+VARIANT_FORMATS = (('webp', 'WEBP'), ('jpeg', 'JPEG'))
+VARIANT_QUALITY = 80
+
+
+def render_variants(source: bytes) -> List[Tuple[int, int, str, bytes]]:
+    """
+    Gera as variantes redimensionadas de uma imagem.
+
+    Executada nos processos do pool, por isso recebe e devolve apenas bytes.
+
+    Returns:
+        list: Tuplas (largura, altura, formato, conteúdo).
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(source)) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+
+    widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+    if image.width not in widths and image.width < VARIANT_WIDTHS[-1]:
+        widths.append(image.width)
+
+    variants = []
+    for width in widths:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for extension, pil_format in VARIANT_FORMATS:
+            output = io.BytesIO()
+            resized.save(output, pil_format, quality=VARIANT_QUALITY, optimize=True)
+            variants.append((width, height, extension, output.getvalue()))
+    return variants
+
+
+IMAGE_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+
+class SupplementImageService:
+    """
+    Classe de serviço das variantes de imagem dos suplementos.
+
+    Após o upload, as variantes WebP e JPEG em várias larguras são geradas
+    em um pool de processos e gravadas com nomes derivados do conteúdo,
+    o que permite servi-las com cache de longa duração.
+    """
+
+    VARIANTS_DIR = 'supplements/variants'
+    ORIGINALS_DIR = 'supplements/originals'
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=getattr(settings, 'SUPPLEMENT_IMAGE_WORKERS', 2)
+                )
+        return cls._executor
+
+    @staticmethod
+    def validate_header(path: str) -> str:
+        """
+        Valida a imagem lendo apenas o cabeçalho, sem decodificá-la.
+
+        Args:
+            path (str): Caminho do arquivo enviado.
+
+        Returns:
+            str: Extensão correspondente ao formato da imagem.
+
+        Raises:
+            ValueError: Se o formato não for aceito ou as dimensões excederem o limite.
+        """
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            with Image.open(path) as image:
+                image_format, (width, height) = image.format, image.size
+        except Image.DecompressionBombError:
+            # Cabeçalhos com dimensões muito acima do limite do Pillow
+            raise ValueError("As dimensões da imagem excedem o limite permitido.")
+        except (UnidentifiedImageError, OSError):
+            raise ValueError("O arquivo enviado não é uma imagem válida.")
+
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(
+                f"Formato de imagem não suportado. Use: {', '.join(IMAGE_FORMATS)}."
+            )
+
+        max_pixels = getattr(settings, 'SUPPLEMENT_IMAGE_MAX_PIXELS', 40_000_000)
+        if width * height > max_pixels:
+            raise ValueError("As dimensões da imagem excedem o limite permitido.")
+
+        return IMAGE_FORMATS[image_format]
+
+    @staticmethod
+    def store_original(uploaded) -> str:
+        """
+        Grava a imagem enviada com nome derivado do hash do conteúdo.
+
+        Imagens idênticas já gravadas são reaproveitadas sem nova gravação.
+
+        Args:
+            uploaded (HashedUploadedFile): Arquivo recebido pelo upload em streaming.
+
+        Returns:
+            str: Nome do arquivo no storage.
+
+        Raises:
+            ValueError: Se a imagem for inválida.
+        """
+        extension = SupplementImageService.validate_header(uploaded.temporary_file_path())
+        name = f'{SupplementImageService.ORIGINALS_DIR}/{uploaded.sha256}.{extension}'
+        if default_storage.exists(name):
+            return name
+        return default_storage.save(name, uploaded)
+
+    @staticmethod
+    @transaction.atomic
+    def replace_image(supplement, uploaded):
+        """
+        Substitui a imagem do suplemento pela imagem enviada.
+
+        Args:
+            supplement (Supplement): Suplemento a atualizar.
+            uploaded (HashedUploadedFile): Arquivo recebido pelo upload em streaming.
+
+        Returns:
+            Supplement: Suplemento atualizado.
+        """
+        supplement.image.name = SupplementImageService.store_original(uploaded)
+        supplement.save(update_fields=['image', 'updated_at'])
+        return supplement
+
+    @staticmethod
+    def needs_variants(supplement) -> bool:
+        """Indica se as variantes não correspondem à imagem atual"""
+        source = supplement.image.name if supplement.image else None
+        return (supplement.image_variants or {}).get('source') != source
+
+    @staticmethod
+    def variant_name(source: bytes, width: int, extension: str) -> str:
+        digest = hashlib.sha256(source).hexdigest()[:16]
+        return f'{SupplementImageService.VARIANTS_DIR}/{digest}-{width}w.{extension}'
+
+    @staticmethod
+    def store_variants(supplement_id: int, source_name: str, source: bytes, variants) -> dict:
+        """
+        Grava as variantes e as registra no suplemento.
+
+        Variantes já existentes (mesmo conteúdo) não são regravadas.
+
+        Returns:
+            dict: Descrição das variantes gravadas.
+        """
+        stored = {'source': source_name, 'variants': []}
+        for width, height, extension, content in variants:
+            name = SupplementImageService.variant_name(source, width, extension)
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(content))
+            stored['variants'].append({
+                'name': name,
+                'width': width,
+                'height': height,
+                'format': extension,
+            })
+
+        # Só registra se a imagem não foi trocada enquanto as variantes eram geradas
+        updated = Supplement.objects.filter(pk=supplement_id, image=source_name).update(
+            image_variants=stored,
+            updated_at=timezone.now()
+        )
+        if updated:
+            # `update` não dispara sinais: os resultados em cache passam a ter o `srcset`
+            CatalogVersion.bump()
+        return stored
+
+    @staticmethod
+    def generate_variants(supplement, wait=False):
+        """
+        Gera as variantes da imagem do suplemento no pool de processos.
+
+        Args:
+            supplement (Supplement): Suplemento com imagem.
+            wait (bool): Se verdadeiro, aguarda e grava as variantes nesta thread.
+
+        Returns:
+            dict: Variantes gravadas quando `wait` é verdadeiro; caso contrário, None.
+        """
+        if not supplement.image:
+            Supplement.objects.filter(pk=supplement.pk).update(image_variants={})
+            return None
+
+        source_name = supplement.image.name
+        with supplement.image.open('rb') as image_file:
+            source = image_file.read()
+
+        future = SupplementImageService.get_executor().submit(render_variants, source)
+        if wait:
+            return SupplementImageService.store_variants(
+                supplement.pk, source_name, source, future.result()
+            )
+
+        def on_done(done):
+            try:
+                SupplementImageService.store_variants(
+                    supplement.pk, source_name, source, done.result()
+                )
+            except Exception as e:
+                LoggerManager.get_instance().error(
+                    f"Erro ao gerar variantes da imagem do suplemento {supplement.pk}: {e}"
+                )
+            finally:
+                # O callback roda em uma thread do pool, com conexão própria
+                connection.close()
+
+        future.add_done_callback(on_done)
+        return None
+
+    @staticmethod
+    def schedule_variants(supplement):
+        """
+        Agenda a geração das variantes para depois do commit, se a imagem mudou.
+        """
+        if SupplementImageService.needs_variants(supplement):
+            transaction.on_commit(lambda: SupplementImageService.generate_variants(supplement))
+
+    @staticmethod
+    def build_srcsets(image_variants, build_url) -> Optional[dict]:
+        """
+        Monta os atributos `srcset` de cada formato.
+
+        Args:
+            image_variants (dict): Variantes registradas no suplemento.
+            build_url: Função que converte o nome do arquivo em URL.
+
+        Returns:
+            dict: `srcset` por formato e a menor variante como miniatura, ou None.
+        """
+        variants = (image_variants or {}).get('variants')
+        if not variants:
+            return None
+
+        srcsets = {}
+        for extension, _ in VARIANT_FORMATS:
+            entries = sorted(
+                (variant for variant in variants if variant['format'] == extension),
+                key=lambda variant: variant['width']
+            )
+            srcsets[extension] = ', '.join(
+                f"{build_url(variant['name'])} {variant['width']}w" for variant in entries
+            )
+            srcsets.setdefault('thumbnail', build_url(entries[0]['name']) if entries else None)
+        return srcsets
@@ -0,0 +1,307 @@
+import math
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from subscription_plans.models import Subscription
+from supplements.models import StoreInventory, StoreReservation
+
+
+class StoreInventoryService:
+    """
+    Classe de serviço do estoque de suplementos nas lojas parceiras.
+
+    Reservas decrementam o estoque com UPDATEs condicionais
+    (`quantity >= n`): sem leitura prévia, duas reservas simultâneas nunca
+    vendem a mesma unidade, e cada comando trava uma única linha. Reservas
+    de vários itens travam as linhas sempre na mesma ordem, evitando
+    impasses (deadlocks) entre requisições concorrentes.
+
+    As reservas dos assinantes (`StoreReservation`) ficam limitadas ao saldo
+    da assinatura e a `MAX_RESERVATION_QUANTITY` unidades por reserva, e
+    devolvem as unidades ao estoque quando canceladas ou expiradas.
+    """
+
+    MAX_RESERVATION_QUANTITY = getattr(settings, 'STORE_RESERVATION_MAX_QUANTITY', 3)
+    RESERVATION_TTL = timedelta(hours=getattr(settings, 'STORE_RESERVATION_TTL_HOURS', 24))
+
+    EARTH_RADIUS_KM = 6371.0
+    DEFAULT_RADIUS_KM = 10.0
+    MAX_RADIUS_KM = 100.0
+    MAX_RESULTS = 50
+
+    @staticmethod
+    def set_quantity(store_id, supplement_id, quantity):
+        """
+        Define a quantidade em estoque de um suplemento em uma loja.
+
+        Returns:
+            StoreInventory: Registro de estoque.
+        """
+        inventory, _ = StoreInventory.objects.update_or_create(
+            store_id=store_id,
+            supplement_id=supplement_id,
+            defaults={'quantity': quantity}
+        )
+        return inventory
+
+    @staticmethod
+    def _decrement(store_id, supplement_id, quantity):
+        return StoreInventory.objects.filter(
+            store_id=store_id,
+            supplement_id=supplement_id,
+            quantity__gte=quantity
+        ).update(quantity=F('quantity') - quantity, updated_at=timezone.now())
+
+    @staticmethod
+    def reserve(store_id, supplement_id, quantity=1):
+        """
+        Reserva unidades de um suplemento em uma loja.
+
+        Args:
+            store_id (int): ID da loja parceira.
+            supplement_id (int): ID do suplemento.
+            quantity (int): Unidades reservadas.
+
+        Returns:
+            int: Quantidade restante em estoque.
+
+        Raises:
+            ValueError: Se a loja não tiver estoque suficiente.
+        """
+        with transaction.atomic():
+            if not StoreInventoryService._decrement(store_id, supplement_id, quantity):
+                raise ValueError("Estoque insuficiente na loja para este suplemento.")
+            # A linha continua travada por esta transação
+            return StoreInventory.objects.filter(
+                store_id=store_id, supplement_id=supplement_id
+            ).values_list('quantity', flat=True).get()
+
+    @staticmethod
+    @transaction.atomic
+    def reserve_many(items):
+        """
+        Reserva vários itens de uma vez: todos ou nenhum.
+
+        Args:
+            items (list): Tuplas (store_id, supplement_id, quantidade).
+
+        Raises:
+            ValueError: Se algum item não tiver estoque suficiente.
+        """
+        # Mesma ordem de travamento em todas as requisições
+        for store_id, supplement_id, quantity in sorted(items):
+            if not StoreInventoryService._decrement(store_id, supplement_id, quantity):
+                raise ValueError(
+                    f"Estoque insuficiente do suplemento {supplement_id} na loja {store_id}."
+                )
+
+    @staticmethod
+    def release(store_id, supplement_id, quantity=1):
+        """
+        Devolve ao estoque unidades reservadas.
+        """
+        StoreInventory.objects.filter(
+            store_id=store_id, supplement_id=supplement_id
+        ).update(quantity=F('quantity') + quantity, updated_at=timezone.now())
+
+    @staticmethod
+    @transaction.atomic
+    def create_reservation(subscription, store_id, supplement_id, quantity=1):
+        """
+        Reserva unidades de um suplemento em uma loja para um assinante.
+
+        A linha da assinatura fica travada até o fim da transação, então
+        reservas simultâneas do mesmo assinante não ultrapassam o saldo.
+
+        Args:
+            subscription (Subscription): Assinatura ativa do assinante.
+            store_id (int): ID da loja parceira.
+            supplement_id (int): ID do suplemento.
+            quantity (int): Unidades reservadas.
+
+        Returns:
+            tuple: Reserva criada e quantidade restante em estoque.
+
+        Raises:
+            ValueError: Se a quantidade passar do limite por reserva, do saldo
+                da assinatura ainda não reservado ou do estoque da loja.
+        """
+        if quantity > StoreInventoryService.MAX_RESERVATION_QUANTITY:
+            raise ValueError(
+                f"Reserve no máximo {StoreInventoryService.MAX_RESERVATION_QUANTITY} unidades por vez."
+            )
+
+        remaining_supplements = Subscription.objects.select_for_update().filter(
+            pk=subscription.pk
+        ).values_list('remaining_supplements', flat=True).get()
+        reserved = StoreReservation.objects.filter(
+            subscription_id=subscription.pk,
+            status=StoreReservation.ACTIVE
+        ).aggregate(total=Sum('quantity'))['total'] or 0
+        if reserved + quantity > remaining_supplements:
+            raise ValueError("A assinatura não tem saldo suficiente para esta reserva.")
+
+        remaining = StoreInventoryService.reserve(store_id, supplement_id, quantity)
+        reservation = StoreReservation.objects.create(
+            store_id=store_id,
+            supplement_id=supplement_id,
+            subscription_id=subscription.pk,
+            quantity=quantity,
+            expires_at=timezone.now() + StoreInventoryService.RESERVATION_TTL
+        )
+        return reservation, remaining
+
+    @staticmethod
+    @transaction.atomic
+    def release_reservation(reservation, status=StoreReservation.RELEASED):
+        """
+        Encerra uma reserva ativa e devolve as unidades ao estoque.
+
+        Args:
+            reservation (StoreReservation): Reserva a encerrar.
+            status (str): Status final (cancelada ou expirada).
+
+        Returns:
+            bool: False se a reserva já não estava ativa.
+        """
+        updated = StoreReservation.objects.filter(
+            pk=reservation.pk, status=StoreReservation.ACTIVE
+        ).update(status=status, updated_at=timezone.now())
+        if not updated:
+            return False
+
+        reservation.refresh_from_db(fields=['quantity', 'status', 'updated_at'])
+        StoreInventoryService.release(reservation.store_id, reservation.supplement_id, reservation.quantity)
+        return True
+
+    @staticmethod
+    @transaction.atomic
+    def expire_reservations(now=None):
+        """
+        Expira as reservas ativas vencidas e devolve as unidades ao estoque.
+
+        Returns:
+            int: Número de reservas expiradas.
+        """
+        expired = list(
+            StoreReservation.objects.select_for_update().filter(
+                status=StoreReservation.ACTIVE,
+                expires_at__lte=now or timezone.now()
+            ).order_by('id').values_list('id', 'store_id', 'supplement_id', 'quantity')
+        )
+        if not expired:
+            return 0
+
+        StoreReservation.objects.filter(
+            id__in=[reservation_id for reservation_id, _, _, _ in expired]
+        ).update(status=StoreReservation.EXPIRED, updated_at=timezone.now())
+
+        released = Counter()
+        for _, store_id, supplement_id, quantity in expired:
+            released[(store_id, supplement_id)] += quantity
+        # Mesma ordem de travamento das reservas de vários itens
+        for (store_id, supplement_id), quantity in sorted(released.items()):
+            StoreInventoryService.release(store_id, supplement_id, quantity)
+        return len(expired)
+
+    @staticmethod
+    def consume_for_redemption(store_id, supplement_id, subscription_id=None):
+        """
+        Retira uma unidade do estoque da loja em um resgate.
+
+        Se a assinatura tiver uma reserva ativa do suplemento nessa loja, o
+        resgate consome uma unidade da reserva, que já saiu do estoque.
+        Lojas que não controlam o estoque do suplemento (sem registro)
+        não são afetadas. Deve ser chamado dentro da transação do resgate.
+
+        Raises:
+            ValueError: Se a loja controla o estoque e ele acabou.
+        """
+        if subscription_id is not None:
+            reservation = StoreReservation.objects.select_for_update().filter(
+                subscription_id=subscription_id,
+                store_id=store_id,
+                supplement_id=supplement_id,
+                status=StoreReservation.ACTIVE
+            ).order_by('expires_at', 'id').first()
+            if reservation is not None:
+                reservation.quantity -= 1
+                if not reservation.quantity:
+                    reservation.status = StoreReservation.CONSUMED
+                reservation.save(update_fields=['quantity', 'status', 'updated_at'])
+                return
+
+        if StoreInventoryService._decrement(store_id, supplement_id, 1):
+            return
+        if StoreInventory.objects.filter(store_id=store_id, supplement_id=supplement_id).exists():
+            raise ValueError("Suplemento sem estoque nesta loja.")
+
+    @staticmethod
+    def haversine_km(lat1, lng1, lat2, lng2):
+        """Distância em quilômetros entre dois pontos"""
+        lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+        a = (
+            math.sin((lat2 - lat1) / 2) ** 2
+            + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        )
+        return 2 * StoreInventoryService.EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+    @staticmethod
+    def find_pickup_stores(supplement_id, latitude, longitude, radius_km=DEFAULT_RADIUS_KM, limit=MAX_RESULTS):
+        """
+        Lojas aprovadas próximas com o suplemento em estoque.
+
+        A consulta parte do índice parcial (suplemento, loja) das linhas
+        com estoque e filtra as lojas por um retângulo em volta do ponto;
+        a distância exata é calculada apenas para as lojas do retângulo.
+
+        Args:
+            supplement_id (int): ID do suplemento.
+            latitude (float): Latitude do usuário.
+            longitude (float): Longitude do usuário.
+            radius_km (float): Raio de busca em quilômetros.
+            limit (int): Quantidade máxima de lojas.
+
+        Returns:
+            list: Lojas com quantidade e distância, da mais próxima à mais distante.
+        """
+        lat_delta = math.degrees(radius_km / StoreInventoryService.EARTH_RADIUS_KM)
+        # Perto dos polos o retângulo cobre todas as longitudes
+        cos_lat = math.cos(math.radians(latitude))
+        lng_delta = 180.0 if cos_lat < 1e-6 else min(180.0, lat_delta / cos_lat)
+
+        rows = StoreInventory.objects.filter(
+            supplement_id=supplement_id,
+            quantity__gt=0,
+            store__status='approved',
+            store__latitude__range=(latitude - lat_delta, latitude + lat_delta),
+            store__longitude__range=(longitude - lng_delta, longitude + lng_delta),
+        ).values(
+            'quantity', 'store_id', 'store__name', 'store__address',
+            'store__phone', 'store__latitude', 'store__longitude'
+        )
+
+        stores = []
+        for row in rows:
+            distance = StoreInventoryService.haversine_km(
+                latitude, longitude, float(row['store__latitude']), float(row['store__longitude'])
+            )
+            if distance <= radius_km:
+                stores.append({
+                    'id': row['store_id'],
+                    'name': row['store__name'],
+                    'address': row['store__address'],
+                    'phone': row['store__phone'],
+                    'latitude': row['store__latitude'],
+                    'longitude': row['store__longitude'],
+                    'quantity': row['quantity'],
+                    'distance_km': round(distance, 2),
+                })
+
+        stores.sort(key=lambda store: store['distance_km'])
+        return stores[:limit]
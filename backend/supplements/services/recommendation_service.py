@@ -0,0 +1,369 @@
+import threading
+import unicodedata
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from core.db_connection import LoggerManager
+from supplements.models import Supplement, SupplementCategory
+from supplements.services.catalog_version import CatalogVersion
+
+
+def normalize_text(text):
+    """Remove acentos e diferenças de maiúsculas de um texto"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+class SupplementRecommendationService:
+    """
+    Classe de serviço das recomendações de suplementos por objetivo.
+
+    Cada suplemento disponível vira um vetor de características (tipo,
+    categoria, palavras-chave dos benefícios e faixa de preço) e cada
+    combinação de objetivo e nível de plano, um vetor de pesos. Uma única
+    multiplicação de matrizes pontua todo o catálogo para todos os perfis,
+    e as listas dos melhores suplementos ficam em uma única entrada de
+    cache, marcada com a versão do catálogo usada no cálculo.
+
+    Quando o catálogo muda, as listas anteriores continuam sendo servidas
+    enquanto um único recálculo roda em segundo plano; apenas com o cache
+    vazio a requisição aguarda o cálculo.
+    """
+
+    MUSCLE_GAIN = 'muscle_gain'
+    WEIGHT_LOSS = 'weight_loss'
+    ENDURANCE = 'endurance'
+    STRENGTH = 'strength'
+    HEALTH = 'health'
+
+    GOAL_LABELS = {
+        MUSCLE_GAIN: 'Ganho de massa muscular',
+        WEIGHT_LOSS: 'Emagrecimento',
+        ENDURANCE: 'Resistência',
+        STRENGTH: 'Força',
+        HEALTH: 'Saúde e bem-estar',
+    }
+
+    # Termos (sem acentos) de `UserProfile.fitness_goal` associados a cada objetivo
+    GOAL_ALIASES = {
+        MUSCLE_GAIN: ('hipertrof', 'massa', 'ganhar', 'ganho', 'muscul', 'bulking'),
+        WEIGHT_LOSS: ('emagrec', 'perder', 'perda', 'definicao', 'gordura', 'secar', 'cutting'),
+        ENDURANCE: ('resist', 'endurance', 'corrida', 'maratona', 'ciclismo', 'triatlo', 'cardio'),
+        STRENGTH: ('forca', 'powerlifting', 'levantamento', 'crossfit'),
+        HEALTH: ('saude', 'bem-estar', 'bem estar', 'qualidade de vida', 'imunidade'),
+    }
+
+    # Palavras-chave procuradas no nome, benefícios e ingredientes
+    KEYWORDS = (
+        'massa', 'muscul', 'hipertrof', 'recupera', 'proteina', 'energia', 'foco',
+        'disposi', 'queima', 'gordura', 'termog', 'metabol', 'resist', 'fadiga',
+        'hidrat', 'forca', 'potencia', 'imun', 'vitamina', 'saude', 'articula', 'sono',
+    )
+
+    GOAL_PROFILES = {
+        MUSCLE_GAIN: {
+            'types': {'protein': 1.0, 'creatine': 0.7, 'bcaa': 0.6, 'pre_workout': 0.3},
+            'keywords': {'massa': 1.0, 'muscul': 1.0, 'hipertrof': 1.0, 'proteina': 0.8, 'recupera': 0.6},
+        },
+        WEIGHT_LOSS: {
+            'types': {'protein': 0.5, 'pre_workout': 0.4, 'vitamins': 0.3, 'other': 0.3},
+            'keywords': {'queima': 1.0, 'gordura': 1.0, 'termog': 1.0, 'metabol': 0.8, 'energia': 0.4},
+        },
+        ENDURANCE: {
+            'types': {'bcaa': 0.8, 'pre_workout': 0.6, 'vitamins': 0.4, 'other': 0.3},
+            'keywords': {'resist': 1.0, 'fadiga': 0.9, 'hidrat': 0.8, 'energia': 0.7, 'recupera': 0.6},
+        },
+        STRENGTH: {
+            'types': {'creatine': 1.0, 'pre_workout': 0.7, 'protein': 0.6},
+            'keywords': {'forca': 1.0, 'potencia': 1.0, 'foco': 0.4, 'disposi': 0.4, 'recupera': 0.4},
+        },
+        HEALTH: {
+            'types': {'vitamins': 1.0, 'protein': 0.3, 'other': 0.4},
+            'keywords': {'imun': 1.0, 'vitamina': 0.9, 'saude': 0.9, 'articula': 0.6, 'sono': 0.6},
+        },
+    }
+
+    # Preferência de cada nível de plano pelas faixas de preço (da mais barata à mais cara)
+    PRICE_BANDS = 4
+    TIER_PRICE_WEIGHTS = {
+        'basic': (0.6, 0.3, 0.0, -0.3),
+        'pro': (0.2, 0.4, 0.3, 0.0),
+        'elite': (0.0, 0.2, 0.4, 0.6),
+    }
+    DEFAULT_TIER = 'basic'
+
+    # Peso de cada bloco de características na pontuação
+    TYPE_WEIGHT = 1.0
+    CATEGORY_WEIGHT = 0.5
+    KEYWORD_WEIGHT = 1.0
+    PRICE_WEIGHT = 0.5
+
+    TOP_N = getattr(settings, 'SUPPLEMENT_RECOMMENDATION_SIZE', 20)
+    CACHE_KEY = 'supplements:recommended'
+    CACHE_TIMEOUT = 60 * 60 * 24
+    LOCK_KEY = 'supplements:recommended:lock'
+    LOCK_TIMEOUT = 300
+
+    @staticmethod
+    def list_key(goal, tier):
+        return f'{goal}:{tier}'
+
+    @staticmethod
+    def profiles():
+        """Combinações (objetivo, nível) pontuadas, na ordem das colunas de pesos"""
+        return [
+            (goal, tier)
+            for goal in SupplementRecommendationService.GOAL_PROFILES
+            for tier in SupplementRecommendationService.TIER_PRICE_WEIGHTS
+        ]
+
+    @staticmethod
+    def keyword_vectors(texts):
+        """
+        Marca a presença de cada palavra-chave nos textos.
+
+        Args:
+            texts (list): Textos já normalizados.
+
+        Returns:
+            ndarray: Matriz (textos x palavras-chave) com linhas de norma 1.
+        """
+        keywords = SupplementRecommendationService.KEYWORDS
+        matrix = np.array(
+            [[keyword in text for keyword in keywords] for text in texts],
+            dtype=np.float32
+        ).reshape(len(texts), len(keywords))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    @staticmethod
+    def build_features():
+        """
+        Monta a matriz de características dos suplementos disponíveis.
+
+        Returns:
+            tuple: IDs dos suplementos, matriz de características e
+            vetores de palavras-chave das categorias.
+        """
+        service = SupplementRecommendationService
+        rows = list(
+            Supplement.objects.filter(available=True).order_by('id').values_list(
+                'id', 'type', 'category_id', 'price', 'name', 'benefits', 'ingredients'
+            )
+        )
+        categories = list(SupplementCategory.objects.order_by('id').values_list('id', 'name', 'description'))
+        category_index = {category_id: index for index, (category_id, _, _) in enumerate(categories)}
+        type_index = {value: index for index, value in enumerate(Supplement.SupplementType.values)}
+
+        count = len(rows)
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+
+        types = np.zeros((count, len(type_index)), dtype=np.float32)
+        types[np.arange(count), [type_index[row[1]] for row in rows]] = 1.0
+
+        category_features = np.zeros((count, len(categories)), dtype=np.float32)
+        category_features[np.arange(count), [category_index[row[2]] for row in rows]] = 1.0
+
+        keywords = service.keyword_vectors([
+            normalize_text(' '.join((name, benefits, ingredients)))
+            for _, _, _, _, name, benefits, ingredients in rows
+        ])
+
+        prices = np.array([float(row[3]) for row in rows], dtype=np.float64)
+        price_bands = np.zeros((count, service.PRICE_BANDS), dtype=np.float32)
+        if count:
+            edges = np.quantile(prices, np.linspace(0, 1, service.PRICE_BANDS + 1)[1:-1])
+            price_bands[np.arange(count), np.searchsorted(edges, prices, side='right')] = 1.0
+
+        features = np.hstack([types, category_features, keywords, price_bands])
+        category_keywords = service.keyword_vectors([
+            normalize_text(f'{name} {description}') for _, name, description in categories
+        ])
+        return ids, features, category_keywords
+
+    @staticmethod
+    def build_weights(category_keywords):
+        """
+        Monta a matriz de pesos (características x perfis).
+
+        O peso de uma categoria para um objetivo é a afinidade entre as
+        palavras-chave do nome da categoria e as do objetivo.
+
+        Args:
+            category_keywords (ndarray): Vetores de palavras-chave das categorias.
+
+        Returns:
+            ndarray: Uma coluna por combinação de `profiles()`.
+        """
+        service = SupplementRecommendationService
+        types = Supplement.SupplementType.values
+        columns = []
+        for goal, tier in service.profiles():
+            profile = service.GOAL_PROFILES[goal]
+            type_weights = np.array([profile['types'].get(value, 0.0) for value in types], dtype=np.float32)
+            keyword_weights = np.array(
+                [profile['keywords'].get(keyword, 0.0) for keyword in service.KEYWORDS], dtype=np.float32
+            )
+            columns.append(np.concatenate([
+                service.TYPE_WEIGHT * type_weights,
+                service.CATEGORY_WEIGHT * (category_keywords @ keyword_weights),
+                service.KEYWORD_WEIGHT * keyword_weights,
+                service.PRICE_WEIGHT * np.array(service.TIER_PRICE_WEIGHTS[tier], dtype=np.float32),
+            ]))
+        return np.stack(columns, axis=1)
+
+    @staticmethod
+    def rank(ids, features, weights, top_n):
+        """
+        Pontua todos os suplementos para todos os perfis de uma vez.
+
+        Returns:
+            dict: IDs dos `top_n` melhores suplementos por (objetivo, nível).
+        """
+        if not len(ids):
+            return {profile: [] for profile in SupplementRecommendationService.profiles()}
+
+        scores = features @ weights
+        # Ordenação estável: em caso de empate, o suplemento mais antigo primeiro
+        order = np.argsort(-scores, axis=0, kind='stable')[:top_n]
+        return {
+            profile: ids[order[:, column]].tolist()
+            for column, profile in enumerate(SupplementRecommendationService.profiles())
+        }
+
+    @staticmethod
+    def rebuild(version=None):
+        """
+        Recalcula e grava em cache as recomendações de todos os perfis.
+
+        Args:
+            version (str): Versão do catálogo (padrão: a atual). Deve ser lida
+                antes do cálculo, para que uma alteração feita durante ele
+                dispare um novo recálculo.
+
+        Returns:
+            dict: IDs recomendados por (objetivo, nível).
+        """
+        service = SupplementRecommendationService
+        version = version or CatalogVersion.get()
+        ids, features, category_keywords = service.build_features()
+        recommendations = service.rank(ids, features, service.build_weights(category_keywords), service.TOP_N)
+        cache.set(
+            service.CACHE_KEY,
+            {
+                'version': version,
+                'lists': {
+                    service.list_key(goal, tier): supplement_ids
+                    for (goal, tier), supplement_ids in recommendations.items()
+                },
+            },
+            timeout=service.CACHE_TIMEOUT
+        )
+        return recommendations
+
+    @staticmethod
+    def schedule_rebuild(version):
+        """
+        Inicia o recálculo em segundo plano, se nenhum outro estiver em andamento.
+
+        A trava usa `cache.add`, então vale entre workers com um cache
+        compartilhado.
+
+        Returns:
+            bool: Se o recálculo foi iniciado.
+        """
+        service = SupplementRecommendationService
+        if not cache.add(service.LOCK_KEY, version, timeout=service.LOCK_TIMEOUT):
+            return False
+
+        thread = threading.Thread(target=service.rebuild_in_background, args=(version,), daemon=True)
+        thread.start()
+        return True
+
+    @staticmethod
+    def rebuild_in_background(version):
+        """Recalcula as recomendações e libera a trava do recálculo"""
+        service = SupplementRecommendationService
+        try:
+            service.rebuild(version)
+        except Exception as e:
+            LoggerManager.get_instance().error(f"Erro ao recalcular as recomendações de suplementos: {e}")
+        finally:
+            cache.delete(service.LOCK_KEY)
+            # A conexão pertence à thread do recálculo e não seria reaproveitada
+            connection.close()
+
+    @staticmethod
+    def get_recommendations(goal, tier):
+        """
+        Retorna os IDs recomendados para um objetivo e nível de plano.
+
+        Se o catálogo mudou desde o último cálculo, retorna as listas
+        anteriores e agenda o recálculo.
+
+        Args:
+            goal (str): Objetivo de `GOAL_PROFILES`.
+            tier (str): Nível de `TIER_PRICE_WEIGHTS`.
+
+        Returns:
+            list: IDs dos suplementos, do mais ao menos indicado.
+        """
+        service = SupplementRecommendationService
+        version = CatalogVersion.get()
+        entry = cache.get(service.CACHE_KEY)
+        if entry is None:
+            return service.rebuild(version)[(goal, tier)]
+
+        if entry['version'] != version:
+            service.schedule_rebuild(version)
+        return entry['lists'][service.list_key(goal, tier)]
+
+    @staticmethod
+    def resolve_goal(fitness_goal, height=None, weight=None):
+        """
+        Converte o objetivo informado no perfil em um objetivo conhecido.
+
+        Sem objetivo reconhecível, usa o IMC calculado pela altura (cm) e
+        peso (kg): acima de 27 sugere emagrecimento e abaixo de 20, ganho
+        de massa.
+
+        Returns:
+            str: Objetivo de `GOAL_PROFILES`.
+        """
+        service = SupplementRecommendationService
+        text = normalize_text(fitness_goal)
+        for goal, aliases in service.GOAL_ALIASES.items():
+            if any(alias in text for alias in aliases):
+                return goal
+
+        if height and weight and height > 0:
+            bmi = Decimal(weight) / (Decimal(height) / 100) ** 2
+            if bmi >= 27:
+                return service.WEIGHT_LOSS
+            if bmi < 20:
+                return service.MUSCLE_GAIN
+        return service.HEALTH
+
+    @staticmethod
+    def resolve_tier(user):
+        """
+        Retorna o nível do plano da assinatura ativa do usuário.
+
+        Returns:
+            str: Nível de `TIER_PRICE_WEIGHTS`.
+        """
+        # Importação local: o app de assinaturas depende do app de suplementos
+        from subscription_plans.services import SubscriptionService
+
+        subscription = SubscriptionService.get_user_active_subscription(user)
+        if subscription is None:
+            return SupplementRecommendationService.DEFAULT_TIER
+
+        tier = subscription.plan.plan_type
+        if tier not in SupplementRecommendationService.TIER_PRICE_WEIGHTS:
+            return SupplementRecommendationService.DEFAULT_TIER
+        return tier
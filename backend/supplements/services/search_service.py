@@ -0,0 +1,149 @@
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connections
+from django.db.models import F, Func, Value
+
+from supplements.models import Supplement
+
+
+# Tabela de remoção de acentos usada tanto no banco (translate) quanto no
+# Python, dispensando a extensão unaccent do PostgreSQL
+ACCENTED = 'áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ'
+PLAIN = 'aaaaaeeeeiiiiooooouuuucnAAAAAEEEEIIIIOOOOOUUUUCN'
+UNACCENT_TABLE = str.maketrans(ACCENTED, PLAIN)
+
+
+class Unaccent(Func):
+    """Remove os acentos de uma expressão de texto com `translate`"""
+    function = 'translate'
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, Value(ACCENTED), Value(PLAIN), **extra)
+
+
+class SupplementSearchService:
+    """
+    Classe de serviço da busca textual do catálogo de suplementos.
+
+    O vetor de busca é ponderado (nome > marca > benefícios >
+    ingredientes > descrição), sem acentos e com o dicionário português,
+    e fica gravado em `Supplement.search_vector`, indexado por GIN.
+    """
+
+    CONFIG = 'portuguese'
+
+    WEIGHTED_FIELDS = (
+        ('name', 'A'),
+        ('brand', 'B'),
+        ('benefits', 'C'),
+        ('ingredients', 'D'),
+        ('description', 'D'),
+    )
+
+    @staticmethod
+    def is_supported(queryset):
+        """Indica se o banco do queryset suporta a busca textual"""
+        return connections[queryset.db].vendor == 'postgresql'
+
+    @staticmethod
+    def unaccent(text):
+        return text.translate(UNACCENT_TABLE)
+
+    @staticmethod
+    def build_vector():
+        """
+        Monta a expressão do vetor de busca a partir das colunas do suplemento.
+        """
+        vector = None
+        for field, weight in SupplementSearchService.WEIGHTED_FIELDS:
+            part = SearchVector(
+                Unaccent(F(field)),
+                weight=weight,
+                config=SupplementSearchService.CONFIG
+            )
+            vector = part if vector is None else vector + part
+        return vector
+
+    @staticmethod
+    def needs_update(supplement, created=False, update_fields=None):
+        """
+        Indica se o vetor de busca de um suplemento salvo deve ser recalculado.
+
+        Apenas criações e alterações em algum dos campos indexados exigem
+        o recálculo; edições de preço ou disponibilidade não.
+
+        Args:
+            supplement (Supplement): Suplemento salvo.
+            created (bool): Se o suplemento acabou de ser criado.
+            update_fields (frozenset, opcional): Campos gravados, se limitados.
+
+        Returns:
+            bool: True se algum texto indexado pode ter mudado.
+        """
+        if created:
+            return True
+        if update_fields is not None and not set(update_fields) & set(Supplement.SEARCH_FIELDS):
+            return False
+
+        loaded = getattr(supplement, '_loaded_search_text', {})
+        return any(
+            field not in loaded or loaded[field] != getattr(supplement, field)
+            for field in Supplement.SEARCH_FIELDS
+        )
+
+    @staticmethod
+    def update_vectors(queryset=None):
+        """
+        Recalcula o vetor de busca com um único UPDATE.
+
+        Args:
+            queryset (QuerySet, opcional): Suplementos a atualizar. Por padrão, todos.
+
+        Returns:
+            int: Número de suplementos atualizados.
+        """
+        queryset = Supplement.objects.all() if queryset is None else queryset
+        if not SupplementSearchService.is_supported(queryset):
+            return 0
+        return queryset.update(search_vector=SupplementSearchService.build_vector())
+
+    @staticmethod
+    def search(queryset, term):
+        """
+        Filtra o queryset pelo termo, ordenando pela relevância.
+
+        Cada resultado recebe `search_rank` e `search_headline`, um trecho
+        da descrição com os termos encontrados destacados.
+
+        Args:
+            queryset (QuerySet): Suplementos a pesquisar.
+            term (str): Termo de busca, na sintaxe de busca web.
+
+        Returns:
+            QuerySet: Suplementos encontrados, do mais ao menos relevante.
+        """
+        config = SupplementSearchService.CONFIG
+        query = SearchQuery(
+            SupplementSearchService.unaccent(term),
+            config=config,
+            search_type='websearch'
+        )
+        # O destaque é aplicado ao texto original, acentuado
+        headline_query = query | SearchQuery(term, config=config, search_type='websearch')
+
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+            search_headline=SearchHeadline(
+                'description',
+                headline_query,
+                config=config,
+                start_sel='<mark>',
+                stop_sel='</mark>',
+                max_words=30,
+                min_words=10
+            )
+        ).order_by('-search_rank', 'id')
@@ -0,0 +1,204 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.db_connection import LoggerManager
+from supplements.models import Supplement, SupplementCategory
+from supplements.services.catalog_version import CatalogVersion
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+
+class CatalogSnapshotService:
+    """
+    Classe de serviço do snapshot completo do catálogo em NDJSON compactado.
+
+    O snapshot é gerado a partir de um cursor no servidor e gravado em
+    disco uma vez por versão do catálogo e compactação; enquanto a versão
+    não muda, as requisições apenas enviam o arquivo pronto (com
+    `sendfile` do servidor WSGI ou `X-Accel-Redirect` do proxy).
+
+    Cada linha é um objeto com `entity` (`category` ou `supplement`); as
+    categorias vêm antes dos suplementos, ambos em ordem de ID.
+    """
+
+    GZIP = 'gzip'
+    ZSTD = 'zstd'
+
+    EXTENSIONS = {GZIP: 'gz', ZSTD: 'zst'}
+    CONTENT_TYPES = {GZIP: 'application/gzip', ZSTD: 'application/zstd'}
+
+    SUPPLEMENT_FIELDS = (
+        'id', 'name', 'description', 'brand', 'price', 'available', 'image',
+        'category_id', 'type', 'serving_size', 'ingredients', 'benefits',
+        'usage_instructions', 'created_at', 'updated_at',
+    )
+    CATEGORY_FIELDS = ('id', 'name', 'description', 'created_at', 'updated_at')
+
+    CHUNK_SIZE = 2000
+    LOCK_TIMEOUT = 300
+    WAIT_TIMEOUT = 60
+    POLL_INTERVAL = 0.2
+
+    @staticmethod
+    def get_directory():
+        return getattr(
+            settings, 'CATALOG_SNAPSHOT_DIR', os.path.join(settings.BASE_DIR, 'catalog_snapshots')
+        )
+
+    @staticmethod
+    def codecs():
+        """Compactações disponíveis (zstd depende do pacote `zstandard`)"""
+        if zstandard is None:
+            return (CatalogSnapshotService.GZIP,)
+        return (CatalogSnapshotService.GZIP, CatalogSnapshotService.ZSTD)
+
+    @staticmethod
+    def get_filename(version, codec):
+        return f'catalog-{version}.ndjson.{CatalogSnapshotService.EXTENSIONS[codec]}'
+
+    @staticmethod
+    def iter_lines(chunk_size=CHUNK_SIZE):
+        """
+        Percorre o catálogo e gera as linhas NDJSON.
+
+        Yields:
+            bytes: Uma linha por categoria ou suplemento.
+        """
+        sources = (
+            ('category', SupplementCategory.objects.order_by('id').values(
+                *CatalogSnapshotService.CATEGORY_FIELDS
+            )),
+            ('supplement', Supplement.objects.order_by('id').values(
+                *CatalogSnapshotService.SUPPLEMENT_FIELDS
+            )),
+        )
+        for entity, queryset in sources:
+            for row in queryset.iterator(chunk_size=chunk_size):
+                row['entity'] = entity
+                yield json.dumps(
+                    row, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')
+                ).encode('utf-8') + b'\n'
+
+    @staticmethod
+    def open_writer(raw, codec):
+        """Abre o compactador que grava no arquivo `raw`"""
+        if codec == CatalogSnapshotService.ZSTD:
+            return zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0)
+
+    @staticmethod
+    def generate(version, codec):
+        """
+        Grava o snapshot de uma versão do catálogo.
+
+        O arquivo é escrito em um temporário e movido para o nome final em
+        uma operação atômica, então leitores nunca veem um arquivo parcial.
+        Snapshots de versões anteriores são removidos.
+
+        Returns:
+            str: Caminho do snapshot.
+        """
+        service = CatalogSnapshotService
+        directory = service.get_directory()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, service.get_filename(version, codec))
+
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.catalog-', suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as raw:
+                with service.open_writer(raw, codec) as writer:
+                    for line in service.iter_lines():
+                        writer.write(line)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        service.remove_stale(version)
+        return path
+
+    @staticmethod
+    def remove_stale(version):
+        """
+        Remove os snapshots de outras versões do catálogo gravados antes
+        dos desta versão (um processo mais lento não apaga os mais novos).
+        """
+        service = CatalogSnapshotService
+        directory = service.get_directory()
+        current = {service.get_filename(version, codec) for codec in service.EXTENSIONS}
+        newest = max(
+            (
+                os.path.getmtime(os.path.join(directory, name))
+                for name in current if os.path.exists(os.path.join(directory, name))
+            ),
+            default=None
+        )
+        if newest is None:
+            return
+
+        for name in os.listdir(directory):
+            if not name.startswith('catalog-') or name in current:
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getmtime(path) <= newest:
+                    os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def get_snapshot(codec=GZIP):
+        """
+        Retorna o snapshot da versão atual do catálogo, gerando-o se preciso.
+
+        Apenas um processo gera o arquivo de cada versão; os demais
+        aguardam até ele aparecer.
+
+        Args:
+            codec (str): `gzip` ou `zstd`.
+
+        Returns:
+            tuple: Caminho do arquivo e versão do catálogo.
+
+        Raises:
+            ValueError: Se a compactação não estiver disponível.
+        """
+        service = CatalogSnapshotService
+        if codec not in service.codecs():
+            raise ValueError(f"Compactação inválida. Opções: {', '.join(service.codecs())}.")
+
+        version = CatalogVersion.get()
+        path = os.path.join(service.get_directory(), service.get_filename(version, codec))
+        if os.path.exists(path):
+            return path, version
+
+        lock_key = f'supplements:catalog_snapshot:{version}:{codec}:lock'
+        if cache.add(lock_key, 1, timeout=service.LOCK_TIMEOUT):
+            try:
+                started = time.monotonic()
+                path = service.generate(version, codec)
+                LoggerManager.get_instance().info(
+                    f"Snapshot do catálogo {version} ({codec}) gerado em "
+                    f"{time.monotonic() - started:.2f}s"
+                )
+                return path, version
+            finally:
+                cache.delete(lock_key)
+
+        deadline = time.monotonic() + service.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(service.POLL_INTERVAL)
+            if os.path.exists(path):
+                return path, version
+
+        return service.generate(version, codec), version
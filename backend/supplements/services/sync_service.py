@@ -0,0 +1,180 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+
+from core.pagination import encode_cursor, decode_cursor
+from supplements.models import Supplement, SupplementCategory, CatalogTombstone
+
+
+class CatalogSyncService:
+    """
+    Classe de serviço da sincronização incremental do catálogo.
+
+    O cursor guarda a última posição (`updated_at`, `id`) vista de cada
+    fluxo: categorias, suplementos e remoções. Cada chamada retorna apenas
+    o que mudou depois dessas posições, pelos índices (`updated_at`, `id`).
+
+    Linhas alteradas há menos de `SETTLE_DELAY` ficam para a próxima
+    chamada: uma transação pode gravar um `updated_at` anterior ao de
+    outra que fez commit antes, e o cursor não deve passar por ela.
+    Cursores mais antigos que a retenção das remoções expiram e o cliente
+    deve baixar o catálogo completo novamente.
+    """
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 1000
+    SETTLE_DELAY = timedelta(seconds=5)
+    TOMBSTONE_RETENTION = timedelta(days=30)
+
+    CURSOR_KEYS = {'categories': 'c', 'supplements': 's', 'deleted': 't'}
+
+    @staticmethod
+    def record_deletion(entity, object_id):
+        """
+        Registra a remoção de um suplemento ou categoria.
+
+        Args:
+            entity (str): `CatalogTombstone.SUPPLEMENT` ou `CatalogTombstone.CATEGORY`.
+            object_id (int): ID do objeto removido.
+        """
+        CatalogTombstone.objects.create(entity=entity, object_id=object_id)
+
+    @staticmethod
+    def purge_tombstones():
+        """
+        Remove os registros de remoção mais antigos que a retenção.
+
+        Returns:
+            int: Número de registros removidos.
+        """
+        deleted, _ = CatalogTombstone.objects.filter(
+            deleted_at__lt=timezone.now() - CatalogSyncService.TOMBSTONE_RETENTION
+        ).delete()
+        return deleted
+
+    @staticmethod
+    def decode(encoded):
+        """
+        Decodifica o cursor de sincronização.
+
+        Args:
+            encoded (str): Cursor recebido em `since`.
+
+        Returns:
+            dict: Posição (`updated_at`, `id`) de cada fluxo.
+
+        Raises:
+            NotFound: Se o cursor for inválido.
+        """
+        payload = decode_cursor(encoded)
+        positions = {}
+        for stream, key in CatalogSyncService.CURSOR_KEYS.items():
+            value = payload.get(key)
+            if not isinstance(value, list) or len(value) != 2 or not isinstance(value[1], int):
+                raise NotFound('Cursor inválido')
+            moment = parse_datetime(str(value[0]))
+            if moment is None:
+                raise NotFound('Cursor inválido')
+            positions[stream] = (moment, value[1])
+        return positions
+
+    @staticmethod
+    def encode(positions):
+        """Codifica as posições de cada fluxo em um cursor"""
+        return encode_cursor({
+            CatalogSyncService.CURSOR_KEYS[stream]: [moment.isoformat(), last_id]
+            for stream, (moment, last_id) in positions.items()
+        })
+
+    @staticmethod
+    def is_expired(positions):
+        """
+        Indica se o cursor é mais antigo que a retenção das remoções,
+        que podem já ter sido descartadas.
+        """
+        moment, _ = positions['deleted']
+        return moment < timezone.now() - CatalogSyncService.TOMBSTONE_RETENTION
+
+    @staticmethod
+    def initial_positions():
+        """
+        Posições de uma sincronização completa: todo o catálogo e apenas
+        as remoções feitas a partir de agora.
+        """
+        start = (timezone.now() - timedelta(days=365 * 100), 0)
+        return {
+            'categories': start,
+            'supplements': start,
+            'deleted': (timezone.now() - CatalogSyncService.SETTLE_DELAY, 0),
+        }
+
+    @staticmethod
+    def _after(queryset, field, position, settled_before, limit):
+        moment, last_id = position
+        return list(
+            queryset.filter(
+                Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': last_id}),
+                **{f'{field}__lt': settled_before}
+            ).order_by(field, 'id')[:limit + 1]
+        )
+
+    @staticmethod
+    def get_changes(positions, limit):
+        """
+        Retorna as alterações do catálogo posteriores às posições do cursor.
+
+        Args:
+            positions (dict): Posição de cada fluxo.
+            limit (int): Quantidade máxima de linhas por fluxo.
+
+        Returns:
+            dict: Categorias e suplementos alterados, IDs removidos por
+            entidade, novas posições e se ainda há alterações pendentes.
+        """
+        settled_before = timezone.now() - CatalogSyncService.SETTLE_DELAY
+        after = CatalogSyncService._after
+
+        categories = after(
+            SupplementCategory.objects.all(), 'updated_at',
+            positions['categories'], settled_before, limit
+        )
+        supplements = after(
+            Supplement.objects.select_related('category'), 'updated_at',
+            positions['supplements'], settled_before, limit
+        )
+        tombstones = after(
+            CatalogTombstone.objects.all(), 'deleted_at',
+            positions['deleted'], settled_before, limit
+        )
+
+        # Um fluxo completo avança até o limite das linhas estáveis; um fluxo
+        # truncado, até a última linha retornada
+        next_positions = {}
+        has_more = False
+        streams = (
+            ('categories', categories, 'updated_at'),
+            ('supplements', supplements, 'updated_at'),
+            ('deleted', tombstones, 'deleted_at'),
+        )
+        for stream, rows, field in streams:
+            if len(rows) > limit:
+                del rows[limit:]
+                next_positions[stream] = (getattr(rows[-1], field), rows[-1].id)
+                has_more = True
+            else:
+                next_positions[stream] = (settled_before, 0)
+
+        deleted = {CatalogTombstone.CATEGORY: [], CatalogTombstone.SUPPLEMENT: []}
+        for tombstone in tombstones:
+            deleted[tombstone.entity].append(tombstone.object_id)
+
+        return {
+            'categories': categories,
+            'supplements': supplements,
+            'deleted': deleted,
+            'positions': next_positions,
+            'has_more': has_more,
+        }
@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from supplements.models import Supplement, SupplementCategory, CatalogTombstone
+from supplements.services import (
+    CatalogVersion,
+    CatalogSyncService,
+    SupplementAutocompleteIndex,
+    SupplementImageService,
+    SupplementSearchService,
+)
+
+
+@receiver(post_save, sender=Supplement)
+def update_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Recalcula o vetor de busca do suplemento salvo se algum texto indexado mudou.
+    """
+    if not SupplementSearchService.needs_update(instance, created, update_fields):
+        return
+
+    SupplementSearchService.update_vectors(Supplement.objects.filter(pk=instance.pk))
+    instance._loaded_search_text = {
+        field: getattr(instance, field) for field in Supplement.SEARCH_FIELDS
+    }
+
+
+@receiver(post_save, sender=Supplement)
+@receiver(post_delete, sender=Supplement)
+@receiver(post_save, sender=SupplementCategory)
+@receiver(post_delete, sender=SupplementCategory)
+def bump_catalog_version(sender, **kwargs):
+    """
+    Invalida os resultados derivados do catálogo quando ele muda.
+    """
+    CatalogVersion.bump()
+
+
+@receiver(post_save, sender=Supplement)
+def generate_image_variants(sender, instance, **kwargs):
+    """
+    Agenda a geração das variantes quando a imagem do suplemento muda.
+    """
+    SupplementImageService.schedule_variants(instance)
+
+
+@receiver(post_delete, sender=Supplement)
+def record_supplement_deletion(sender, instance, **kwargs):
+    """
+    Registra a remoção para os clientes que sincronizam o catálogo.
+    """
+    CatalogSyncService.record_deletion(CatalogTombstone.SUPPLEMENT, instance.pk)
+
+
+@receiver(post_delete, sender=SupplementCategory)
+def record_category_deletion(sender, instance, **kwargs):
+    """
+    Registra a remoção para os clientes que sincronizam o catálogo.
+    """
+    CatalogSyncService.record_deletion(CatalogTombstone.CATEGORY, instance.pk)
+
+
+@receiver(post_save, sender=Supplement)
+def update_autocomplete_index(sender, instance, **kwargs):
+    """
+    Atualiza o índice do autocompletar deste processo após o commit.
+    """
+    transaction.on_commit(lambda: SupplementAutocompleteIndex.get_instance().update(instance))
+
+
+@receiver(post_delete, sender=Supplement)
+def remove_from_autocomplete_index(sender, instance, **kwargs):
+    """
+    Remove o suplemento do índice do autocompletar deste processo após o commit.
+    """
+    supplement_id = instance.pk
+    transaction.on_commit(lambda: SupplementAutocompleteIndex.get_instance().remove(supplement_id))
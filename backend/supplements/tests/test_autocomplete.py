@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from subscription_plans.models import SupplementUsageRollup
+from users.models import User
+from ..models import Supplement, SupplementCategory
+from ..services import SupplementAutocompleteIndex
+
+
+class SupplementAutocompleteTests(TestCase):
+    """Testes para o índice em memória do autocompletar."""
+    
+    url = '/api/v1/supplements/supplements/autocomplete/'
+    
+    def setUp(self):
+        cache.clear()
+        # Índice novo a cada teste: o singleton guarda o estado do processo
+        SupplementAutocompleteIndex._instance = None
+        self.addCleanup(setattr, SupplementAutocompleteIndex, '_instance', None)
+        
+        self.category = SupplementCategory.objects.create(name='Proteína')
+        self.whey = self.create_supplement('Whey Protein Isolado', 'Growth')
+        self.beta = self.create_supplement('Beta-Alanina', 'Max Titanium')
+        self.creatine = self.create_supplement('Creatina Monohidratada', 'Growth')
+        self.index = SupplementAutocompleteIndex.get_instance()
+    
+    def create_supplement(self, name, brand, available=True):
+        return Supplement.objects.create(
+            name=name, description=name, brand=brand, price='50.00', available=available,
+            type=Supplement.SupplementType.OTHER, category=self.category
+        )
+    
+    def ids(self, query, limit=SupplementAutocompleteIndex.DEFAULT_LIMIT):
+        return [row['id'] for row in self.index.search(query, limit)]
+    
+    def test_build_keys(self):
+        """Teste das chaves geradas a partir de cada palavra."""
+        self.assertEqual(
+            SupplementAutocompleteIndex.build_keys('Beta-Alanina Pó', 'Max'),
+            {'beta alanina po', 'alanina po', 'po', 'max'}
+        )
+    
+    def test_prefix_matching(self):
+        """Teste da busca pelo início de qualquer palavra do nome ou da marca."""
+        self.assertEqual(self.ids('prot'), [self.whey.pk])
+        self.assertEqual(self.ids('ISOL'), [self.whey.pk])
+        self.assertEqual(self.ids('creátina mono'), [self.creatine.pk])
+        self.assertEqual(self.ids('titan'), [self.beta.pk])
+        self.assertEqual(sorted(self.ids('growth')), sorted([self.whey.pk, self.creatine.pk]))
+        self.assertEqual(self.ids('hidratada'), [])
+        self.assertEqual(self.ids('  -- '), [])
+    
+    def test_hyphenated_names(self):
+        """Teste dos nomes com hífen, buscados com ou sem a pontuação."""
+        for query in ('beta-al', 'beta al', 'alan'):
+            with self.subTest(query=query):
+                self.assertEqual(self.ids(query), [self.beta.pk])
+    
+    def test_incremental_update_and_remove(self):
+        """Teste da atualização do índice ao salvar e remover suplementos."""
+        self.assertEqual(self.ids('whey'), [self.whey.pk])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.whey.name = 'Whey Concentrado'
+            self.whey.save()
+            glutamine = self.create_supplement('Glutamina', 'Integral')
+        self.assertEqual(self.ids('isol'), [])
+        self.assertEqual(self.ids('concen'), [self.whey.pk])
+        self.assertEqual(self.ids('glut'), [glutamine.pk])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.creatine.available = False
+            self.creatine.save()
+            self.beta.delete()
+        self.assertEqual(self.ids('creat'), [])
+        self.assertEqual(self.ids('beta'), [])
+    
+    def test_changes_from_other_processes(self):
+        """Teste das alterações sem sinal, aplicadas quando a versão muda."""
+        self.assertEqual(self.ids('whey'), [self.whey.pk])
+        
+        Supplement.objects.filter(pk=self.whey.pk).update(name='Whey Hidrolisado', updated_at=timezone.now())
+        Supplement.objects.filter(pk=self.beta.pk).delete()
+        cache.clear()
+        
+        self.assertEqual(self.ids('hidrol'), [self.whey.pk])
+        self.assertEqual(self.ids('beta'), [])
+    
+    def test_orders_by_popularity(self):
+        """Teste da ordem pelos resgates recentes, com o nome como desempate."""
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        SupplementUsageRollup.objects.bulk_create([
+            SupplementUsageRollup(
+                granularity=SupplementUsageRollup.DAY, period_start=today - timedelta(days=1),
+                supplement=self.creatine, redemptions=5
+            ),
+            SupplementUsageRollup(
+                granularity=SupplementUsageRollup.DAY, period_start=today - timedelta(days=60),
+                supplement=self.whey, redemptions=50
+            ),
+        ])
+        
+        self.assertEqual(self.ids('growth'), [self.creatine.pk, self.whey.pk])
+        self.assertEqual(self.ids('growth', limit=1), [self.creatine.pk])
+    
+    def test_endpoint(self):
+        """Teste do endpoint com os rótulos e o limite."""
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+        
+        response = client.get(self.url, {'q': 'whey'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['results'],
+            [{'id': self.whey.pk, 'name': 'Whey Protein Isolado', 'brand': 'Growth'}]
+        )
+        self.assertEqual(client.get(self.url, {'q': 'whey', 'limit': 'x'}).status_code, 400)
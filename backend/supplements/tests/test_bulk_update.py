@@ -0,0 +1,128 @@
+import io
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import Supplement, SupplementCategory, SupplementPriceHistory
+from ..parsers import CSVParser
+from ..services import CatalogVersion, SupplementBulkUpdateService
+
+
+class SupplementBulkUpdateTests(TestCase):
+    """Testes para a atualização em lote de preço e disponibilidade."""
+    
+    url = '/api/v1/supplements/supplements/bulk-update/'
+    
+    def setUp(self):
+        cache.clear()
+        category = SupplementCategory.objects.create(name='Proteína')
+        self.whey, self.casein, self.albumin = (
+            Supplement.objects.create(
+                name=name, description=name, brand='Growth', price=price,
+                type=Supplement.SupplementType.PROTEIN, category=category
+            )
+            for name, price in (('Whey', '99.90'), ('Casein', '120.00'), ('Albumin', '45.50'))
+        )
+        self.admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+    
+    def test_writes_only_changed_rows(self):
+        """Teste da gravação apenas das linhas alteradas, com histórico de preços."""
+        version = CatalogVersion.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = SupplementBulkUpdateService.apply([
+                {'id': self.whey.pk, 'price': Decimal('89.90')},
+                {'id': self.casein.pk, 'available': False},
+                {'id': self.albumin.pk, 'price': Decimal('45.50'), 'available': True},
+                {'id': 9999, 'price': Decimal('1.00')},
+            ], user=self.admin, chunk_size=1)
+        
+        self.assertEqual(result, {
+            'received': 4,
+            'updated': 2,
+            'price_changes': 1,
+            'unchanged': 1,
+            'not_found': [9999],
+        })
+        self.whey.refresh_from_db()
+        self.casein.refresh_from_db()
+        self.assertEqual(self.whey.price, Decimal('89.90'))
+        self.assertFalse(self.casein.available)
+        self.assertEqual(self.casein.price, Decimal('120.00'))
+        
+        history = SupplementPriceHistory.objects.get()
+        self.assertEqual(
+            (history.supplement_id, history.old_price, history.new_price, history.changed_by),
+            (self.whey.pk, Decimal('99.90'), Decimal('89.90'), self.admin)
+        )
+        self.assertNotEqual(CatalogVersion.get(), version)
+    
+    def test_unchanged_batch_keeps_catalog_version(self):
+        """Teste do lote sem alterações, que não invalida o catálogo."""
+        version = CatalogVersion.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = SupplementBulkUpdateService.apply([
+                {'id': self.whey.pk, 'price': Decimal('99.90')},
+                {'id': self.whey.pk, 'available': True},
+            ])
+        
+        self.assertEqual(result['received'], 1)
+        self.assertEqual(result['updated'], 0)
+        self.assertEqual(CatalogVersion.get(), version)
+    
+    def test_csv_upload(self):
+        """Teste do envio em CSV, com células vazias mantendo o valor atual."""
+        body = f'id,price,available\n{self.whey.pk},79.90,\n{self.casein.pk},,false\n'
+        response = self.client.post(self.url, body, content_type='text/csv')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], 2)
+        self.whey.refresh_from_db()
+        self.casein.refresh_from_db()
+        self.assertEqual((self.whey.price, self.whey.available), (Decimal('79.90'), True))
+        self.assertEqual((self.casein.price, self.casein.available), (Decimal('120.00'), False))
+    
+    def test_invalid_rows_and_permissions(self):
+        """Teste das linhas inválidas e do acesso restrito a administradores."""
+        response = self.client.post(self.url, {'items': [
+            {'id': self.whey.pk, 'price': '10.00'},
+            {'id': self.casein.pk},
+            {'id': self.albumin.pk, 'price': '-1'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(response.json()['errors']), ['1', '2'])
+        self.assertFalse(SupplementPriceHistory.objects.exists())
+        self.assertEqual(self.client.post(self.url, [], format='json').status_code, 400)
+        
+        self.client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+        self.assertEqual(
+            self.client.post(self.url, [{'id': self.whey.pk, 'price': '1.00'}], format='json').status_code,
+            403
+        )
+    
+    def test_csv_parser(self):
+        """Teste da leitura do CSV pelo parser."""
+        parser = CSVParser()
+        rows = parser.parse(io.BytesIO(' id , price \n1, 10.00 \n2,\n'.encode('utf-8')))
+        self.assertEqual(rows, [{'id': '1', 'price': '10.00'}, {'id': '2'}])
+        
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO('id,price\n1,\xe9\n'.encode('latin-1')))
+    
+    def test_locks_rows_in_id_order(self):
+        """Teste do travamento das linhas em ordem de ID."""
+        with CaptureQueriesContext(connection) as queries:
+            SupplementBulkUpdateService.apply([
+                {'id': self.albumin.pk, 'price': Decimal('40.00')},
+                {'id': self.whey.pk, 'price': Decimal('90.00')},
+            ])
+        
+        select = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT'))
+        self.assertIn('ORDER BY "supplements_supplement"."id" ASC', select)
@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from users.models import User
+from ..models import Supplement, SupplementCategory
+from ..services import CatalogReadModel
+from ..viewsets import SupplementViewSet
+
+
+class CatalogReadModelTests(TestCase):
+    """Testes para a listagem respondida pelo modelo de leitura em memória."""
+    
+    url = '/api/v1/supplements/supplements/'
+    
+    def setUp(self):
+        cache.clear()
+        self.protein = SupplementCategory.objects.create(name='Proteína')
+        self.vitamins = SupplementCategory.objects.create(name='Vitaminas')
+        for name, brand, type_, category, price, available in (
+            ('Whey', 'Growth', Supplement.SupplementType.PROTEIN, self.protein, '99.90', True),
+            ('Casein', 'Growth', Supplement.SupplementType.PROTEIN, self.protein, '120.00', False),
+            ('Albumin', 'Max', Supplement.SupplementType.PROTEIN, self.protein, '45.50', True),
+            ('Vitamin C', 'Vitafor', Supplement.SupplementType.VITAMINS, self.vitamins, '30.00', True),
+        ):
+            Supplement.objects.create(
+                name=name, description=f'{name} importado', brand=brand, price=price,
+                type=type_, category=category, available=available
+            )
+        self.user = User.objects.create(username='cliente', email='cliente@example.com')
+    
+    def database_ids(self, query_string):
+        """IDs da listagem pelos filtros do banco"""
+        request = Request(APIRequestFactory().get(self.url, QueryDict(query_string)))
+        request.user = self.user
+        view = SupplementViewSet(request=request, action='list', format_kwarg=None, kwargs={})
+        return list(view.filter_queryset(view.get_queryset()).values_list('id', flat=True))
+    
+    def test_matches_database_filters_and_ordering(self):
+        """Teste da equivalência com os filtros e a ordenação do banco."""
+        model = CatalogReadModel.get_instance()
+        for query_string in (
+            '',
+            'available=true',
+            'available=false',
+            f'category={self.protein.pk}',
+            'type=vitamins',
+            'brand=Growth',
+            'ordering=-price',
+            'ordering=price',
+            'ordering=-created_at',
+            f'available=true&category={self.protein.pk}&ordering=-price',
+            'brand=Desconhecida',
+            'page=1',
+        ):
+            with self.subTest(query_string=query_string):
+                self.assertEqual(
+                    model.list_ids(QueryDict(query_string)),
+                    self.database_ids(query_string)
+                )
+    
+    def test_other_params_use_database(self):
+        """Teste dos parâmetros que o modelo de leitura não responde."""
+        model = CatalogReadModel.get_instance()
+        for query_string in ('search=Whey', 'page_size=1', 'category=abc', 'type=invalido', 'category=9999'):
+            with self.subTest(query_string=query_string):
+                self.assertIsNone(model.list_ids(QueryDict(query_string)))
+        
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(self.url, {'search': 'Whey'})
+        self.assertEqual([row['name'] for row in response.json()['results']], ['Whey'])
+    
+    def test_sees_saved_changes(self):
+        """Teste da atualização da cópia após alterações no catálogo."""
+        model = CatalogReadModel.get_instance()
+        self.assertEqual(len(model.list_ids(QueryDict('available=true'))), 3)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            supplement = Supplement.objects.get(name='Whey')
+            supplement.available = False
+            supplement.save()
+            Supplement.objects.get(name='Albumin').delete()
+        
+        self.assertEqual(
+            model.list_ids(QueryDict('available=true')),
+            self.database_ids('available=true')
+        )
+        self.assertEqual(len(self.database_ids('available=true')), 1)
+    
+    def test_name_ordering_ignores_accents_and_case(self):
+        """Teste da mesma ordenação por nome, com acentos e maiúsculas, no banco e em memória."""
+        for name in ('ácido Fólico', 'Beta-Alanina', 'beta alanina', 'Ômega 3', 'omega 3', 'Zinco', 'ZMA'):
+            Supplement.objects.create(
+                name=name, description=name, brand='Marca', price='10.00', category=self.vitamins
+            )
+        model = CatalogReadModel.get_instance()
+        
+        for query_string in ('', 'ordering=name', 'ordering=-name', 'ordering=-name,price'):
+            with self.subTest(query_string=query_string):
+                self.assertEqual(
+                    model.list_ids(QueryDict(query_string)),
+                    self.database_ids(query_string)
+                )
+        
+        by_id = dict(Supplement.objects.values_list('id', 'name'))
+        ordered = [by_id[pk] for pk in model.list_ids(QueryDict(''))]
+        self.assertEqual(ordered[:2], ['ácido Fólico', 'Albumin'])
+        self.assertLess(ordered.index('Ômega 3'), ordered.index('Vitamin C'))
+        
+        # O nome normalizado acompanha as alterações feitas com `update_fields`
+        supplement = Supplement.objects.get(name='Zinco')
+        supplement.name = 'Água'
+        supplement.save(update_fields=['name'])
+        self.assertEqual(Supplement.objects.get(pk=supplement.pk).sort_name, 'agua')
@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import Supplement, SupplementCategory
+from ..services import SupplementFacetService
+
+
+class SupplementFacetTests(TestCase):
+    """Testes para as contagens por faceta do catálogo."""
+    
+    url = '/api/v1/supplements/supplements/'
+    
+    def setUp(self):
+        cache.clear()
+        self.protein = SupplementCategory.objects.create(name='Proteína')
+        self.vitamins = SupplementCategory.objects.create(name='Vitaminas')
+        for name, brand, type_, category, available in (
+            ('Whey', 'Growth', Supplement.SupplementType.PROTEIN, self.protein, True),
+            ('Caseína', 'Growth', Supplement.SupplementType.PROTEIN, self.protein, False),
+            ('Vitamina C', 'Vitafor', Supplement.SupplementType.VITAMINS, self.vitamins, True),
+        ):
+            Supplement.objects.create(
+                name=name, description=name, brand=brand, price='50.00',
+                type=type_, category=category, available=available
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+    
+    def test_counts_every_facet(self):
+        """Teste das contagens de cada faceta."""
+        facets = SupplementFacetService.count_facets(Supplement.objects.all())
+        
+        self.assertEqual(
+            [(row['value'], row['count']) for row in facets['available']],
+            [(False, 1), (True, 2)]
+        )
+        self.assertEqual(
+            [(row['value'], row['label'], row['count']) for row in facets['category']],
+            [(self.protein.pk, 'Proteína', 2), (self.vitamins.pk, 'Vitaminas', 1)]
+        )
+        self.assertEqual(
+            {row['value']: row['label'] for row in facets['type']},
+            {'protein': 'Proteína', 'vitamins': 'Vitaminas'}
+        )
+        self.assertEqual([row['count'] for row in facets['brand']], [2, 1])
+    
+    def test_decodes_grouping_bits(self):
+        """Teste da identificação da faceta pelo GROUPING(...) de cada linha."""
+        # Colunas: available, category_id, category__name, type, brand
+        empty = (None,) * 5
+        rows = {
+            'available': ((True,) + empty[1:], 0b0111),
+            'category': ((None, 7, 'Proteína', None, None), 0b1011),
+            'type': ((None, None, None, 'protein', None), 0b1101),
+            'brand': ((None, None, None, None, 'Growth'), 0b1110),
+        }
+        for name, (values, grouping) in rows.items():
+            facet, value = SupplementFacetService.decode_grouping_row(values + (grouping, 3))
+            self.assertEqual(facet, name)
+            self.assertEqual(value['count'], 3)
+        
+        self.assertEqual(
+            SupplementFacetService.decode_grouping_row(rows['category'][0] + (0b1011, 1))[1],
+            {'value': 7, 'label': 'Proteína', 'count': 1}
+        )
+        self.assertIsNone(SupplementFacetService.decode_grouping_row(empty + (0b1111, 3)))
+    
+    def test_listing_facets_follow_filters_and_catalog_version(self):
+        """Teste das facetas filtradas e do cache por versão do catálogo."""
+        response = self.client.get(self.url, {'facets': 'true', 'available': 'true'})
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            [(row['value'], row['count']) for row in response.data['facets']['available']],
+            [(True, 2)]
+        )
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Supplement.objects.create(
+                name='Creatina', description='Creatina', brand='Growth', price='40.00',
+                type=Supplement.SupplementType.CREATINE, category=self.protein
+            )
+        
+        response = self.client.get(self.url, {'facets': 'true', 'available': 'true'})
+        self.assertEqual(response.data['facets']['available'][0]['count'], 3)
@@ -0,0 +1,91 @@
+import io
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import Supplement, SupplementCategory
+from ..services import SupplementImageService
+
+
+def png_header(width, height):
+    """PNG com apenas o cabeçalho: as dimensões declaradas não são decodificadas"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', ihdr) + chunk(b'IEND', b'')
+
+
+class SupplementImageUploadTests(TestCase):
+    """Testes para o upload em streaming da imagem dos suplementos."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            FILE_UPLOAD_TEMP_DIR=self.media_root,
+            SUPPLEMENT_IMAGE_MAX_UPLOAD_SIZE=64 * 1024
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        category = SupplementCategory.objects.create(name='Proteína')
+        self.supplements = [
+            Supplement.objects.create(
+                name=name, description=name, brand='Marca', price='99.90', category=category
+            )
+            for name in ('Whey', 'Caseína')
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        )
+    
+    def upload(self, supplement, content, name='imagem.png'):
+        return self.client.post(
+            f'/api/v1/supplements/supplements/{supplement.pk}/image/',
+            {'image': SimpleUploadedFile(name, content, content_type='image/png')},
+            format='multipart'
+        )
+    
+    def test_identical_images_are_stored_once(self):
+        """Teste do armazenamento único de imagens idênticas."""
+        output = io.BytesIO()
+        Image.new('RGB', (32, 32), (10, 120, 10)).save(output, 'PNG')
+        
+        with self.captureOnCommitCallbacks(execute=False):
+            responses = [self.upload(supplement, output.getvalue()) for supplement in self.supplements]
+        
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+        names = {Supplement.objects.get(pk=supplement.pk).image.name for supplement in self.supplements}
+        self.assertEqual(len(names), 1)
+        originals = os.path.join(self.media_root, SupplementImageService.ORIGINALS_DIR)
+        self.assertEqual(len(os.listdir(originals)), 1)
+    
+    def test_rejects_files_over_size_limit(self):
+        """Teste do limite de tamanho do upload."""
+        response = self.upload(self.supplements[0], b'\0' * (65 * 1024))
+        
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Supplement.objects.get(pk=self.supplements[0].pk).image)
+    
+    def test_rejects_decompression_bomb_header(self):
+        """Teste da imagem cujo cabeçalho declara dimensões gigantes."""
+        response = self.upload(self.supplements[0], png_header(20000, 20000))
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('dimensões', response.json()['error'])
+    
+    def test_rejects_files_that_are_not_images(self):
+        """Teste do upload de um arquivo que não é imagem."""
+        response = self.upload(self.supplements[0], b'texto qualquer', name='imagem.txt')
+        
+        self.assertEqual(response.status_code, 400)
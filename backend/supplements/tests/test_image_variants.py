@@ -0,0 +1,89 @@
+import io
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from ..models import Supplement, SupplementCategory
+from ..services import CatalogVersion, SupplementImageService
+from ..services.image_service import VARIANT_FORMATS, render_variants
+
+
+def make_image(width, height, image_format='PNG'):
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(output, image_format)
+    return output.getvalue()
+
+
+class SupplementImageVariantTests(TestCase):
+    """Testes para as variantes de imagem dos suplementos."""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        
+        self.supplement = Supplement.objects.create(
+            name='Whey', description='Whey protein', brand='Marca', price='99.90',
+            category=SupplementCategory.objects.create(name='Proteína')
+        )
+    
+    def test_renders_widths_up_to_original(self):
+        """Teste das larguras geradas sem ampliar a imagem original."""
+        variants = render_variants(make_image(500, 250))
+        
+        widths = sorted({width for width, _, _, _ in variants})
+        self.assertEqual(widths, [160, 320, 500])
+        self.assertEqual(len(variants), len(widths) * len(VARIANT_FORMATS))
+        for width, height, extension, content in variants:
+            self.assertEqual(height, width // 2)
+            with Image.open(io.BytesIO(content)) as image:
+                self.assertEqual((image.format.lower(), image.width), (extension, width))
+    
+    def test_stores_variants_with_content_names(self):
+        """Teste do registro das variantes e da reutilização do mesmo conteúdo."""
+        source = make_image(400, 400)
+        self.supplement.image.save('whey.png', ContentFile(source), save=False)
+        Supplement.objects.filter(pk=self.supplement.pk).update(image=self.supplement.image.name)
+        
+        version = CatalogVersion.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            stored = SupplementImageService.store_variants(
+                self.supplement.pk, self.supplement.image.name, source, render_variants(source)
+            )
+        # As listagens em cache passam a incluir o `srcset`
+        self.assertNotEqual(CatalogVersion.get(), version)
+        
+        again = SupplementImageService.store_variants(
+            self.supplement.pk, self.supplement.image.name, source, render_variants(source)
+        )
+        
+        self.assertEqual(again, stored)
+        self.supplement.refresh_from_db()
+        self.assertEqual(self.supplement.image_variants, stored)
+        self.assertFalse(SupplementImageService.needs_variants(self.supplement))
+        
+        srcsets = SupplementImageService.build_srcsets(stored, lambda name: f'/media/{name}')
+        self.assertEqual(len(srcsets['webp'].split(', ')), 3)
+        self.assertTrue(srcsets['thumbnail'].endswith('-160w.webp'))
+    
+    def test_ignores_variants_of_replaced_image(self):
+        """Teste do descarte de variantes geradas para uma imagem já trocada."""
+        source = make_image(200, 200)
+        Supplement.objects.filter(pk=self.supplement.pk).update(image='supplements/nova.png')
+        version = CatalogVersion.get()
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            SupplementImageService.store_variants(
+                self.supplement.pk, 'supplements/antiga.png', source, render_variants(source)
+            )
+        
+        self.supplement.refresh_from_db()
+        self.assertEqual(self.supplement.image_variants, {})
+        self.assertEqual(CatalogVersion.get(), version)
@@ -0,0 +1,184 @@
+import io
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from partner_stores.models import PartnerStore
+from subscription_plans.factories import BasicPlanFactory
+from subscription_plans.models import Subscription
+from subscription_plans.services import SubscriptionService
+from users.models import User
+from ..models import StoreInventory, StoreReservation, Supplement, SupplementCategory
+from ..services import StoreInventoryService
+
+
+class StoreInventoryTests(TestCase):
+    """Testes para a busca de lojas para retirada e as reservas de estoque."""
+    
+    def setUp(self):
+        self.owner = User.objects.create(username='lojista', email='lojista@example.com')
+        self.customer = User.objects.create(username='cliente', email='cliente@example.com')
+        self.supplement = Supplement.objects.create(
+            name='Whey', description='Whey', brand='Growth', price='99.90',
+            type=Supplement.SupplementType.PROTEIN,
+            category=SupplementCategory.objects.create(name='Proteína')
+        )
+        # Paulista (perto), Pinheiros (~4 km) e Campinas (~85 km)
+        self.near = self.create_store('Loja Paulista', '11.111.111/0001-11', '-23.561414', '-46.655881')
+        self.middle = self.create_store('Loja Pinheiros', '22.222.222/0001-22', '-23.566700', '-46.693900')
+        self.far = self.create_store('Loja Campinas', '33.333.333/0001-33', '-22.905600', '-47.060800')
+        self.pending = self.create_store(
+            'Loja Pendente', '44.444.444/0001-44', '-23.561000', '-46.656000', status='pending'
+        )
+        for store in (self.near, self.middle, self.far, self.pending):
+            StoreInventoryService.set_quantity(store.pk, self.supplement.pk, 3)
+        
+        plan = BasicPlanFactory()
+        self.subscription = Subscription.objects.create(
+            user=self.customer,
+            plan=plan,
+            status=Subscription.ACTIVE,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=30),
+            remaining_supplements=10,
+            price_paid=plan.price
+        )
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+    
+    def create_store(self, name, cnpj, latitude, longitude, status='approved'):
+        return PartnerStore.objects.create(
+            name=name, cnpj=cnpj, owner=self.owner, address='São Paulo', phone='11999999999',
+            email='loja@example.com', status=status, latitude=latitude, longitude=longitude
+        )
+    
+    def stock(self, store):
+        return StoreInventory.objects.get(store=store, supplement=self.supplement).quantity
+    
+    def reserve(self, store, quantity=1):
+        return self.client.post(
+            '/api/v1/supplements/inventory/reserve/',
+            {'store': store.pk, 'supplement': self.supplement.pk, 'quantity': quantity},
+            format='json'
+        )
+    
+    def stores_url(self, supplement_id=None):
+        return f'/api/v1/supplements/supplements/{supplement_id or self.supplement.pk}/stores/'
+    
+    def test_pickup_stores_by_distance(self):
+        """Teste das lojas aprovadas com estoque, da mais próxima à mais distante."""
+        StoreInventoryService.set_quantity(self.middle.pk, self.supplement.pk, 0)
+        params = {'lat': -23.5614, 'lng': -46.6559}
+        
+        response = self.client.get(self.stores_url(), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([store['id'] for store in response.json()['results']], [self.near.pk])
+        
+        StoreInventoryService.set_quantity(self.middle.pk, self.supplement.pk, 2)
+        results = self.client.get(self.stores_url(), params).json()['results']
+        self.assertEqual([store['id'] for store in results], [self.near.pk, self.middle.pk])
+        self.assertLess(results[0]['distance_km'], 0.1)
+        self.assertEqual(results[1]['quantity'], 2)
+        
+        wide = self.client.get(self.stores_url(), {**params, 'radius_km': 500}).json()
+        self.assertEqual(wide['radius_km'], StoreInventoryService.MAX_RADIUS_KM)
+        self.assertEqual([store['id'] for store in wide['results']], [self.near.pk, self.middle.pk, self.far.pk])
+    
+    def test_pickup_stores_validation(self):
+        """Teste dos parâmetros inválidos e do suplemento inexistente."""
+        self.assertEqual(self.client.get(self.stores_url(), {'lat': 100, 'lng': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.stores_url(), {'lat': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.stores_url(9999), {'lat': 0, 'lng': 0}).status_code, 404)
+    
+    def test_customer_reserves_at_approved_store(self):
+        """Teste da reserva feita por um assinante até o fim do estoque."""
+        response = self.reserve(self.near, 2)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['quantity'], 1)
+        reservation = StoreReservation.objects.get(pk=response.json()['reservation']['id'])
+        self.assertEqual(
+            (reservation.subscription_id, reservation.quantity, reservation.status),
+            (self.subscription.pk, 2, StoreReservation.ACTIVE)
+        )
+        self.assertEqual(self.reserve(self.near, 2).status_code, 409)
+        self.assertEqual(self.stock(self.near), 1)
+    
+    def test_reserve_requires_subscription_balance(self):
+        """Teste das reservas limitadas à assinatura ativa e ao saldo dela."""
+        limit = StoreInventoryService.MAX_RESERVATION_QUANTITY
+        self.assertEqual(self.reserve(self.near, limit + 1).status_code, 400)
+        
+        Subscription.objects.filter(pk=self.subscription.pk).update(remaining_supplements=2)
+        self.assertEqual(self.reserve(self.near, 2).status_code, 201)
+        self.assertEqual(self.reserve(self.middle, 1).status_code, 409)
+        self.assertEqual(self.stock(self.middle), 3)
+        
+        Subscription.objects.filter(pk=self.subscription.pk).update(status=Subscription.CANCELLED)
+        self.assertEqual(self.reserve(self.middle, 1).status_code, 403)
+    
+    def test_redeeming_consumes_reservation(self):
+        """Teste do resgate que consome a reserva sem retirar o suplemento do estoque outra vez."""
+        reservation_id = self.reserve(self.near, 2).json()['reservation']['id']
+        self.assertEqual(self.stock(self.near), 1)
+        
+        for _ in range(2):
+            SubscriptionService.use_supplement(self.subscription, supplement=self.supplement, store=self.near)
+        
+        self.assertEqual(self.stock(self.near), 1)
+        reservation = StoreReservation.objects.get(pk=reservation_id)
+        self.assertEqual((reservation.quantity, reservation.status), (0, StoreReservation.CONSUMED))
+        
+        # Sem reserva, o resgate retira a unidade do estoque
+        SubscriptionService.use_supplement(self.subscription, supplement=self.supplement, store=self.near)
+        self.assertEqual(self.stock(self.near), 0)
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.remaining_supplements, 7)
+    
+    def test_release_and_expiry_return_stock(self):
+        """Teste da devolução ao estoque das reservas canceladas e expiradas."""
+        released_id = self.reserve(self.near, 2).json()['reservation']['id']
+        url = f'/api/v1/supplements/reservations/{released_id}/release/'
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], StoreReservation.RELEASED)
+        self.assertEqual(self.client.post(url).status_code, 409)
+        self.assertEqual(self.stock(self.near), 3)
+        
+        # Reservas de outros usuários não são visíveis
+        expired_id = self.reserve(self.middle, 1).json()['reservation']['id']
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(
+            self.client.post(f'/api/v1/supplements/reservations/{expired_id}/release/').status_code, 404
+        )
+        
+        StoreReservation.objects.filter(pk=expired_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+        call_command('expire_store_reservations', stdout=io.StringIO())
+        self.assertEqual(StoreReservation.objects.get(pk=expired_id).status, StoreReservation.EXPIRED)
+        self.assertEqual(self.stock(self.middle), 3)
+        self.assertEqual(StoreInventoryService.expire_reservations(), 0)
+    
+    def test_reserve_scope(self):
+        """Teste das reservas recusadas em lojas não aprovadas e suplementos indisponíveis."""
+        url = '/api/v1/supplements/inventory/reserve/'
+        response = self.client.post(url, {'store': self.pending.pk, 'supplement': self.supplement.pk}, format='json')
+        self.assertEqual(response.status_code, 404)
+        
+        Supplement.objects.filter(pk=self.supplement.pk).update(available=False)
+        response = self.client.post(url, {'store': self.near.pk, 'supplement': self.supplement.pk}, format='json')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_inventory_management_restricted_to_owner(self):
+        """Teste do estoque visível e alterável apenas pelo proprietário."""
+        url = '/api/v1/supplements/inventory/'
+        self.assertEqual(self.client.get(url).json()['count'], 0)
+        response = self.client.post(
+            url, {'store': self.near.pk, 'supplement': self.supplement.pk, 'quantity': 10}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.get(url).json()['count'], 4)
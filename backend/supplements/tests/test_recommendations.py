@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import Supplement, SupplementCategory
+from ..services import SupplementRecommendationService
+
+
+class SupplementRecommendationTests(TestCase):
+    """Testes para as recomendações de suplementos por objetivo."""
+    
+    url = '/api/v1/supplements/supplements/recommended/'
+    service = SupplementRecommendationService
+    
+    def setUp(self):
+        cache.clear()
+        category = SupplementCategory.objects.create(name='Suplementos')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.whey = self.create_supplement(
+                'Whey', Supplement.SupplementType.PROTEIN, 'Ganho de massa muscular', category
+            )
+            self.vitamin = self.create_supplement(
+                'Vitamina C', Supplement.SupplementType.VITAMINS, 'Imunidade e saúde', category
+            )
+        
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+    
+    def create_supplement(self, name, type_, benefits, category):
+        return Supplement.objects.create(
+            name=name, description=name, brand='Growth', price='50.00',
+            type=type_, benefits=benefits, category=category
+        )
+    
+    def test_ranks_by_goal(self):
+        """Teste da ordem das listas pelo objetivo."""
+        self.assertEqual(
+            self.service.get_recommendations(self.service.MUSCLE_GAIN, 'basic')[0], self.whey.pk
+        )
+        self.assertEqual(
+            self.service.get_recommendations(self.service.HEALTH, 'basic')[0], self.vitamin.pk
+        )
+        
+        response = self.client.get(self.url, {'goal': self.service.MUSCLE_GAIN, 'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.whey.pk])
+        self.assertEqual(self.client.get(self.url, {'goal': 'invalido'}).status_code, 400)
+    
+    @mock.patch('supplements.services.recommendation_service.threading.Thread')
+    def test_catalog_change_serves_previous_lists_while_rebuilding(self, thread):
+        """Teste do recálculo único em segundo plano após alterar o catálogo."""
+        previous = self.service.get_recommendations(self.service.HEALTH, 'basic')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vitamin.available = False
+            self.vitamin.save()
+        
+        with mock.patch.object(self.service, 'build_features', wraps=self.service.build_features) as build:
+            self.assertEqual(self.service.get_recommendations(self.service.HEALTH, 'basic'), previous)
+            self.service.get_recommendations(self.service.STRENGTH, 'pro')
+            build.assert_not_called()
+        
+        # Apenas a primeira requisição inicia o recálculo
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+        version = thread.call_args.kwargs['args'][0]
+        
+        self.service.rebuild_in_background(version)
+        self.assertNotIn(self.vitamin.pk, self.service.get_recommendations(self.service.HEALTH, 'basic'))
+        self.assertIsNone(cache.get(self.service.LOCK_KEY))
+    
+    def test_unavailable_supplements_hidden_from_previous_lists(self):
+        """Teste das listas anteriores sem os suplementos indisponíveis."""
+        self.service.rebuild()
+        Supplement.objects.filter(pk=self.vitamin.pk).update(available=False)
+        
+        response = self.client.get(self.url, {'goal': self.service.HEALTH})
+        self.assertNotIn(self.vitamin.pk, [row['id'] for row in response.json()['results']])
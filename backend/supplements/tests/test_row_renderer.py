@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import Supplement, SupplementCategory
+
+
+class SupplementRowRendererTests(TestCase):
+    """Testes para a listagem renderizada por linhas com JSON em cache."""
+    
+    url = '/api/v1/supplements/supplements/'
+    
+    def setUp(self):
+        cache.clear()
+        self.category = SupplementCategory.objects.create(name='Proteína')
+        self.supplements = [
+            Supplement.objects.create(
+                name=name, description=f'{name} em pó', brand='Marca', price=price,
+                category=self.category, image_variants={'source': None, 'variants': [
+                    {'name': f'supplements/variants/{name}-160w.webp', 'width': 160, 'height': 160, 'format': 'webp'},
+                ]}
+            )
+            for name, price in (('Whey', '99.90'), ('Caseína', '120.00'))
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+    
+    def test_rows_match_serializer_output(self):
+        """Teste da equivalência com o SupplementSerializer."""
+        listed = self.client.get(self.url).json()['results']
+        
+        for row in listed:
+            detail = self.client.get(f"{self.url}{row['id']}/").json()
+            self.assertEqual(row, detail)
+        self.assertEqual([row['name'] for row in listed], ['Caseína', 'Whey'])
+    
+    def test_changed_rows_are_rendered_again(self):
+        """Teste da chave de cache por linha, suplemento e categoria."""
+        self.client.get(self.url)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            supplement = Supplement.objects.get(pk=self.supplements[0].pk)
+            supplement.price = '89.90'
+            supplement.save()
+        listed = {row['id']: row for row in self.client.get(self.url).json()['results']}
+        self.assertEqual(listed[supplement.pk]['price'], '89.90')
+        self.assertEqual(listed[self.supplements[1].pk]['price'], '120.00')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Proteínas'
+            self.category.save()
+        listed = self.client.get(self.url).json()['results']
+        self.assertEqual({row['category_name'] for row in listed}, {'Proteínas'})
+    
+    def test_page_envelope_wraps_cached_rows(self):
+        """Teste do envelope de paginação em torno das linhas."""
+        response = self.client.get(self.url, {'page': 1})
+        
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = response.json()
+        self.assertEqual(list(body), ['count', 'next', 'previous', 'results'])
+        self.assertEqual(body['count'], 2)
+        self.assertEqual(len(body['results']), 2)
+        self.assertEqual(self.client.get(self.url, {'page': 2}).status_code, 404)
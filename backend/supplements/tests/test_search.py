@@ -0,0 +1,65 @@
+from unittest import skipUnless
+
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+from django.test import TestCase
+
+from ..models import Supplement, SupplementCategory
+from ..services import SupplementSearchService
+
+
+class SupplementSearchVectorTests(TestCase):
+    """Testes para o vetor de busca textual dos suplementos."""
+    
+    def setUp(self):
+        self.supplement = Supplement.objects.create(
+            name='Whey Protéico', description='Proteína do soro do leite', brand='Marca',
+            price='99.90', benefits='Recuperação muscular',
+            category=SupplementCategory.objects.create(name='Proteína')
+        )
+    
+    def test_vector_weights_follow_indexed_fields(self):
+        """Teste dos pesos de cada campo no vetor de busca."""
+        vector = SupplementSearchService.build_vector()
+        parts = [expression for expression in vector.flatten() if isinstance(expression, SearchVector)]
+        
+        self.assertEqual(
+            [part.weight.value for part in parts],
+            [weight for _, weight in SupplementSearchService.WEIGHTED_FIELDS]
+        )
+        self.assertEqual(
+            {field for field, _ in SupplementSearchService.WEIGHTED_FIELDS},
+            set(Supplement.SEARCH_FIELDS)
+        )
+    
+    def test_only_indexed_text_changes_need_update(self):
+        """Teste do recálculo apenas quando um texto indexado muda."""
+        supplement = Supplement.objects.get(pk=self.supplement.pk)
+        self.assertTrue(SupplementSearchService.needs_update(supplement, created=True))
+        
+        supplement.price = '79.90'
+        supplement.available = False
+        self.assertFalse(SupplementSearchService.needs_update(supplement))
+        
+        supplement.benefits = 'Ganho de massa'
+        self.assertTrue(SupplementSearchService.needs_update(supplement))
+        self.assertFalse(SupplementSearchService.needs_update(
+            supplement, update_fields=frozenset({'price', 'updated_at'})
+        ))
+    
+    @skipUnless(connection.vendor == 'postgresql', 'Busca textual requer PostgreSQL')
+    def test_search_ignores_accents_and_skips_price_edits(self):
+        """Teste da busca sem acentos e do vetor preservado em edições de preço."""
+        queryset = Supplement.objects.all()
+        self.assertEqual(list(SupplementSearchService.search(queryset, 'proteico')), [self.supplement])
+        
+        Supplement.objects.filter(pk=self.supplement.pk).update(search_vector=None)
+        supplement = Supplement.objects.get(pk=self.supplement.pk)
+        supplement.price = '79.90'
+        supplement.save()
+        supplement.refresh_from_db()
+        self.assertIsNone(supplement.search_vector)
+        
+        supplement.name = 'Whey Isolado'
+        supplement.save()
+        self.assertEqual(list(SupplementSearchService.search(queryset, 'isolado')), [self.supplement])
@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import Supplement, SupplementCategory
+from ..services import CatalogSnapshotService, CatalogVersion, snapshot_service
+
+
+class CatalogSnapshotTests(TestCase):
+    """Testes para o snapshot completo do catálogo."""
+    
+    url = '/api/v1/supplements/supplements/snapshot/'
+    
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings_override = override_settings(CATALOG_SNAPSHOT_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        self.category = SupplementCategory.objects.create(name='Proteína')
+        for name in ('Whey', 'Casein'):
+            Supplement.objects.create(
+                name=name, description=name, brand='Growth', price='99.90',
+                type=Supplement.SupplementType.PROTEIN, category=self.category
+            )
+        
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+    
+    def read_lines(self, path):
+        with gzip.open(path, 'rb') as snapshot_file:
+            return [json.loads(line) for line in snapshot_file]
+    
+    def bump_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            CatalogVersion.bump()
+    
+    def test_generates_once_per_version(self):
+        """Teste da geração do arquivo, reaproveitado enquanto a versão não muda."""
+        path, version = CatalogSnapshotService.get_snapshot()
+        
+        lines = self.read_lines(path)
+        self.assertEqual([line['entity'] for line in lines], ['category', 'supplement', 'supplement'])
+        self.assertEqual([line['name'] for line in lines[1:]], ['Whey', 'Casein'])
+        self.assertEqual(lines[1]['price'], '99.90')
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(path)])
+        
+        with mock.patch.object(CatalogSnapshotService, 'generate') as generate:
+            self.assertEqual(CatalogSnapshotService.get_snapshot(), (path, version))
+            generate.assert_not_called()
+        
+        self.bump_version()
+        new_path, new_version = CatalogSnapshotService.get_snapshot()
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(new_path)])
+    
+    def test_etag_and_not_modified(self):
+        """Teste do ETag e da resposta 304 para a versão atual."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        body = b''.join(response.streaming_content)
+        self.assertEqual(len(gzip.decompress(body).splitlines()), 3)
+        etag = response['ETag']
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        for header in (f'"outra", W/{etag}', '*'):
+            with self.subTest(header=header):
+                self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=header).status_code, 304)
+        
+        # Apenas a comparação exata de cada tag vale
+        for header in (etag[1:-1], etag[:10] + '"', f'"x{etag[1:]}'):
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, 200)
+                response.close()
+        
+        self.bump_version()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response.close()
+    
+    def test_retries_when_file_replaced(self):
+        """Teste da nova consulta quando o arquivo some antes de ser aberto."""
+        path, version = CatalogSnapshotService.get_snapshot()
+        missing = os.path.join(self.directory, CatalogSnapshotService.get_filename('antiga', 'gzip'))
+        
+        with mock.patch.object(
+            CatalogSnapshotService, 'get_snapshot', side_effect=[(missing, 'antiga'), (path, version)]
+        ):
+            response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'"{version}-gzip"')
+        self.assertIn(os.path.basename(path), response['Content-Disposition'])
+        response.close()
+    
+    @override_settings(CATALOG_SNAPSHOT_ACCEL_PREFIX='/protected/snapshots/')
+    def test_accel_redirect(self):
+        """Teste do envio delegado ao proxy."""
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['X-Accel-Redirect'].startswith('/protected/snapshots/catalog-'))
+        self.assertEqual(response.content, b'')
+    
+    def test_invalid_codec(self):
+        """Teste da compactação inválida."""
+        self.assertEqual(self.client.get(self.url, {'compress': 'bzip2'}).status_code, 400)
+        
+        with mock.patch.object(snapshot_service, 'zstandard', None):
+            self.assertEqual(self.client.get(self.url, {'compress': 'zstd'}).status_code, 400)
+    
+    @unittest.skipIf(snapshot_service.zstandard is None, 'zstandard não instalado')
+    def test_zstd_snapshot(self):
+        """Teste do snapshot compactado com zstd."""
+        path, _ = CatalogSnapshotService.get_snapshot(CatalogSnapshotService.ZSTD)
+        
+        with open(path, 'rb') as snapshot_file:
+            reader = snapshot_service.zstandard.ZstdDecompressor().stream_reader(snapshot_file)
+            self.assertEqual(len(reader.read().splitlines()), 3)
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from ..models import CatalogTombstone, Supplement, SupplementCategory
+from ..services import CatalogSyncService
+
+
+class CatalogSyncTests(TestCase):
+    """Testes para a sincronização incremental do catálogo."""
+    
+    url = '/api/v1/supplements/supplements/changes/'
+    
+    def setUp(self):
+        # Relógio controlado: gravações e consultas usam o mesmo `timezone.now`
+        self.clock = timezone.now()
+        patcher = mock.patch('django.utils.timezone.now', side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.category = SupplementCategory.objects.create(name='Proteína')
+        self.supplements = [
+            Supplement.objects.create(
+                name=name, description=name, brand='Growth', price='50.00',
+                type=Supplement.SupplementType.PROTEIN, category=self.category
+            )
+            for name in ('Whey', 'Casein', 'Albumin')
+        ]
+        
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='cliente', email='cliente@example.com'))
+    
+    def advance(self, seconds):
+        self.clock += timedelta(seconds=seconds)
+    
+    def sync(self, since=None, **params):
+        if since:
+            params['since'] = since
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+    
+    def test_full_sync_then_changes_only(self):
+        """Teste da carga completa seguida apenas das alterações."""
+        self.advance(10)
+        full = self.sync()
+        self.assertEqual(len(full['supplements']), 3)
+        self.assertEqual([row['name'] for row in full['categories']], ['Proteína'])
+        self.assertFalse(full['has_more'])
+        
+        self.advance(1)
+        self.supplements[0].price = '45.00'
+        self.supplements[0].save()
+        deleted_id = self.supplements[1].pk
+        self.supplements[1].delete()
+        self.advance(10)
+        changes = self.sync(full['next'])
+        
+        self.assertEqual([row['id'] for row in changes['supplements']], [self.supplements[0].pk])
+        self.assertEqual(changes['categories'], [])
+        self.assertEqual(changes['deleted'][CatalogTombstone.SUPPLEMENT], [deleted_id])
+        self.assertEqual(changes['deleted'][CatalogTombstone.CATEGORY], [])
+        
+        self.advance(10)
+        unchanged = self.sync(changes['next'])
+        self.assertEqual(unchanged['supplements'], [])
+        self.assertEqual(unchanged['deleted'][CatalogTombstone.SUPPLEMENT], [])
+    
+    def test_unsettled_rows_wait_for_next_call(self):
+        """Teste das linhas recentes adiadas até o fim do atraso."""
+        self.advance(10)
+        cursor = self.sync()['next']
+        
+        self.supplements[2].available = False
+        self.supplements[2].save()
+        self.advance(1)
+        early = self.sync(cursor)
+        self.assertEqual(early['supplements'], [])
+        
+        self.advance(CatalogSyncService.SETTLE_DELAY.total_seconds())
+        settled = self.sync(early['next'])
+        self.assertEqual([row['id'] for row in settled['supplements']], [self.supplements[2].pk])
+    
+    def test_has_more_pages_through_stream(self):
+        """Teste da paginação por `limit` sem repetir nem perder linhas."""
+        self.advance(10)
+        seen, cursor = [], None
+        for _ in range(5):
+            page = self.sync(cursor, limit=1)
+            seen.extend(row['id'] for row in page['supplements'])
+            cursor = page['next']
+            if not page['has_more']:
+                break
+        
+        self.assertFalse(page['has_more'])
+        self.assertEqual(sorted(seen), sorted(supplement.pk for supplement in self.supplements))
+    
+    def test_expired_and_invalid_cursors(self):
+        """Teste do cursor expirado (410) e do cursor inválido (404)."""
+        self.advance(10)
+        cursor = self.sync()['next']
+        
+        self.advance(CatalogSyncService.TOMBSTONE_RETENTION.total_seconds() + 60)
+        self.assertEqual(self.client.get(self.url, {'since': cursor}).status_code, 410)
+        self.assertEqual(self.client.get(self.url, {'since': 'invalido'}).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'limit': 'abc'}).status_code, 400)
+    
+    def test_purge_removes_only_expired_tombstones(self):
+        """Teste da remoção dos registros além da retenção."""
+        # A categoria leva junto os três suplementos: quatro registros antigos
+        self.category.delete()
+        self.advance(CatalogSyncService.TOMBSTONE_RETENTION.total_seconds() + 60)
+        Supplement.objects.create(
+            name='Creatina', description='Creatina', brand='Max', price='30.00',
+            type=Supplement.SupplementType.CREATINE,
+            category=SupplementCategory.objects.create(name='Creatinas')
+        ).delete()
+        
+        self.assertEqual(CatalogSyncService.purge_tombstones(), 4)
+        self.assertEqual(
+            list(CatalogTombstone.objects.values_list('entity', flat=True)),
+            [CatalogTombstone.SUPPLEMENT]
+        )
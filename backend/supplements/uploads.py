@@ -0,0 +1,95 @@
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+
+class HashedUploadedFile(UploadedFile):
+    """
+    Arquivo enviado gravado em disco, com o hash SHA-256 do conteúdo.
+    """
+
+    def __init__(self, file, name, content_type, size, charset, sha256):
+        super().__init__(file, name, content_type, size, charset)
+        self.sha256 = sha256
+
+    def temporary_file_path(self):
+        # Permite que o FileSystemStorage mova o arquivo em vez de copiá-lo
+        return self.file.name
+
+    def close(self):
+        """Fecha e remove o arquivo temporário, se ainda não foi movido"""
+        try:
+            self.file.close()
+        except FileNotFoundError:
+            pass
+        try:
+            os.unlink(self.file.name)
+        except FileNotFoundError:
+            # O arquivo temporário já foi movido para o destino
+            pass
+
+
+class StreamingHashUploadHandler(FileUploadHandler):
+    """
+    Grava cada pedaço do upload diretamente em disco, calculando o hash
+    incrementalmente e interrompendo o arquivo que exceder o limite.
+
+    Arquivos descartados ficam em `rejected`, para que a view informe o motivo.
+    """
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size or getattr(
+            settings, 'SUPPLEMENT_IMAGE_MAX_UPLOAD_SIZE', 10 * 1024 * 1024
+        )
+        self.rejected = {}
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        self.file = tempfile.NamedTemporaryFile(
+            suffix='.upload',
+            dir=settings.FILE_UPLOAD_TEMP_DIR,
+            delete=False
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self._discard()
+            self.rejected[self.field_name] = (
+                f'O arquivo excede o limite de {self.max_size / (1024 * 1024):g} MB.'
+            )
+            raise SkipFile()
+
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        self.file.flush()
+        self.file.seek(0)
+        return HashedUploadedFile(
+            file=self.file,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=self.size,
+            charset=self.charset,
+            sha256=self.hasher.hexdigest()
+        )
+
+    def upload_interrupted(self):
+        if getattr(self, 'file', None) is not None:
+            self._discard()
+
+    def _discard(self):
+        self.file.close()
+        try:
+            os.unlink(self.file.name)
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,22 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from supplements.viewsets import SupplementViewSet, SupplementCategoryViewSet
+from supplements.viewsets import (
+    SupplementViewSet,
+    SupplementCategoryViewSet,
+    SupplementImageView,
+    StoreInventoryViewSet,
+    StoreReservationViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'supplements', SupplementViewSet, basename='supplement')
 router.register(r'categories', SupplementCategoryViewSet, basename='supplement-category')
+router.register(r'inventory', StoreInventoryViewSet, basename='store-inventory')
+router.register(r'reservations', StoreReservationViewSet, basename='store-reservation')
 
 app_name = 'supplements'
 
 urlpatterns = [
+    path('images/<path:name>', SupplementImageView.as_view(), name='supplement-image'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
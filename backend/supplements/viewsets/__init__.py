@@ -1 +1,3 @@
-from .supplement_viewsets import SupplementViewSet, SupplementCategoryViewSet
\ No newline at end of file
+from .supplement_viewsets import SupplementViewSet, SupplementCategoryViewSet
+from .image_views import SupplementImageView
+from .inventory_views import StoreInventoryViewSet, StoreReservationViewSet
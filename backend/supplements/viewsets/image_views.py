@@ -0,0 +1,31 @@
+import mimetypes
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from rest_framework import permissions
+from rest_framework.views import APIView
+
+from supplements.services import SupplementImageService
+
+
+class SupplementImageView(APIView):
+    """
+    Serve as variantes de imagem dos suplementos com cache de longa duração.
+    
+    Os nomes derivam do conteúdo, então um mesmo nome nunca muda de conteúdo
+    e pode ser marcado como imutável.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    
+    CACHE_CONTROL = 'public, max-age=31536000, immutable'
+    
+    def get(self, request, name, *args, **kwargs):
+        prefix = SupplementImageService.VARIANTS_DIR + '/'
+        if not name.startswith(prefix) or '..' in name or not default_storage.exists(name):
+            raise Http404
+        
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        response = FileResponse(default_storage.open(name, 'rb'), content_type=content_type)
+        response['Cache-Control'] = self.CACHE_CONTROL
+        return response
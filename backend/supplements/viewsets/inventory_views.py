@@ -0,0 +1,116 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+
+from subscription_plans.services import SubscriptionService
+from supplements.models import StoreInventory, StoreReservation
+from supplements.serializers import (
+    StoreInventorySerializer,
+    StoreReservationRequestSerializer,
+    StoreReservationSerializer,
+)
+from supplements.services import StoreInventoryService
+
+
+class StoreInventoryViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet do estoque de suplementos nas lojas parceiras.
+    
+    Proprietários veem e alteram apenas o estoque das próprias lojas;
+    administradores, o de todas. Reservas são feitas pelos assinantes e
+    valem para qualquer loja aprovada com o suplemento disponível.
+    """
+    serializer_class = StoreInventorySerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['store', 'supplement']
+    
+    def get_queryset(self):
+        queryset = StoreInventory.objects.order_by('store_id', 'supplement_id')
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(store__owner=self.request.user)
+    
+    def get_reservable_queryset(self):
+        """Estoques que qualquer usuário autenticado pode reservar"""
+        return StoreInventory.objects.filter(store__status='approved', supplement__available=True)
+    
+    @action(detail=False, methods=['post'])
+    def reserve(self, request, *args, **kwargs):
+        """
+        Reserva unidades de um suplemento no estoque de uma loja.
+        
+        A reserva fica vinculada à assinatura ativa do usuário, limitada ao
+        saldo dela, e expira em `StoreInventoryService.RESERVATION_TTL`.
+        
+        Args:
+            request: Requisição HTTP com `store`, `supplement` e `quantity`.
+            
+        Returns:
+            Response: Reserva criada e quantidade restante em estoque, 403 sem
+            assinatura ativa ou 409 se o saldo ou o estoque não forem suficientes.
+        """
+        serializer = StoreReservationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        subscription = SubscriptionService.get_user_active_subscription(request.user)
+        if subscription is None:
+            return Response({
+                'error': 'Você não possui uma assinatura ativa.'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if not self.get_reservable_queryset().filter(
+            store_id=data['store'], supplement_id=data['supplement']
+        ).exists():
+            return Response({
+                'error': 'Estoque não encontrado para esta loja e suplemento.'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            reservation, remaining = StoreInventoryService.create_reservation(
+                subscription, data['store'], data['supplement'], data['quantity']
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        
+        return Response({
+            'reservation': StoreReservationSerializer(reservation).data,
+            'quantity': remaining,
+        }, status=status.HTTP_201_CREATED)
+
+
+class StoreReservationViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet das reservas do usuário nas lojas parceiras.
+    
+    Lista as reservas das assinaturas do usuário e permite cancelar as
+    ativas, devolvendo as unidades ao estoque.
+    """
+    serializer_class = StoreReservationSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'store', 'supplement']
+    
+    def get_queryset(self):
+        return StoreReservation.objects.filter(subscription__user=self.request.user)
+    
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None, *args, **kwargs):
+        """
+        Cancela uma reserva ativa.
+        
+        Args:
+            request: Requisição HTTP.
+            pk: ID da reserva.
+            
+        Returns:
+            Response: Reserva cancelada, ou 409 se ela já não estava ativa.
+        """
+        reservation = self.get_object()
+        
+        if not StoreInventoryService.release_reservation(reservation):
+            return Response({
+                'error': 'A reserva não está ativa.'
+            }, status=status.HTTP_409_CONFLICT)
+        
+        return Response(self.get_serializer(reservation).data)
@@ -1,7 +1,38 @@
-from rest_framework import viewsets, filters
+import os
+
+from rest_framework import viewsets, filters, permissions, status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.response import Response
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
-from supplements.models import Supplement, SupplementCategory
-from supplements.serializers import SupplementSerializer, SupplementCategorySerializer
+from supplements.models import Supplement, SupplementCategory, SupplementPriceHistory
+from supplements.filters import SupplementFullTextSearchFilter, SupplementOrderingFilter
+from supplements.serializers import (
+    SupplementSerializer,
+    SupplementCategorySerializer,
+    SupplementSearchResultSerializer,
+    SupplementRowRenderer,
+    SupplementBulkUpdateItemSerializer,
+    PickupStoresQuerySerializer,
+)
+from supplements.services import (
+    SupplementSearchService,
+    SupplementFacetService,
+    SupplementImageService,
+    CatalogReadModel,
+    CatalogSyncService,
+    SupplementRecommendationService,
+    SupplementBulkUpdateService,
+    SupplementAutocompleteIndex,
+    StoreInventoryService,
+    CatalogSnapshotService,
+)
+from supplements.parsers import CSVParser
+from supplements.uploads import StreamingHashUploadHandler
+from users.models import UserProfile
 
 
 class SupplementCategoryViewSet(viewsets.ModelViewSet):
@@ -18,10 +49,363 @@ class SupplementCategoryViewSet(viewsets.ModelViewSet):
 class SupplementViewSet(viewsets.ModelViewSet):
     """
     ViewSet para visualização e edição de suplementos.
+    
+    O parâmetro `search` usa a busca textual ponderada do PostgreSQL,
+    ordenada por relevância e com trechos destacados. Com `facets=true`
+    a listagem inclui as contagens por valor de cada faceta.
     """
-    queryset = Supplement.objects.all()
+    queryset = Supplement.objects.select_related('category')
     serializer_class = SupplementSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SupplementFullTextSearchFilter, SupplementOrderingFilter]
     filterset_fields = ['available', 'category', 'type', 'brand']
     search_fields = ['name', 'description', 'brand', 'ingredients', 'benefits']
-    ordering_fields = ['name', 'price', 'created_at']
\ No newline at end of file
+    ordering_fields = ['name', 'price', 'created_at']
+    
+    def get_serializer_class(self):
+        if (
+            self.action == 'list'
+            and self.request.query_params.get('search', '').strip()
+            and SupplementSearchService.is_supported(self.queryset)
+        ):
+            return SupplementSearchResultSerializer
+        return super().get_serializer_class()
+    
+    # Parâmetros que não alteram o conjunto filtrado
+    FACET_IGNORED_PARAMS = ('page', 'page_size', 'ordering', 'facets', 'format')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Lista os suplementos e, com `facets=true`, as contagens por faceta.
+        
+        As contagens consideram todos os filtros aplicados e ficam em cache
+        por combinação de filtros até a próxima alteração do catálogo.
+        """
+        if request.query_params.get('facets', '').lower() not in ('1', 'true', 'yes'):
+            if self.can_render_rows():
+                return self.list_rows(request)
+            return super().list(request, *args, **kwargs)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        params = {
+            key: request.query_params.getlist(key)
+            for key in request.query_params
+            if key not in self.FACET_IGNORED_PARAMS
+        }
+        facets = SupplementFacetService.get_facets(queryset, params)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+            response.data['facets'] = facets
+            return response
+        
+        return Response({
+            'results': self.get_serializer(queryset, many=True).data,
+            'facets': facets,
+        })
+    
+    def perform_update(self, serializer):
+        """
+        Salva o suplemento e registra a alteração de preço no histórico.
+        """
+        old_price = serializer.instance.price
+        supplement = serializer.save()
+        if supplement.price != old_price:
+            SupplementPriceHistory.objects.create(
+                supplement=supplement,
+                old_price=old_price,
+                new_price=supplement.price,
+                changed_by=self.request.user
+            )
+    
+    def can_render_rows(self):
+        """
+        Indica se a listagem pode usar a renderização rápida por linhas.
+        
+        A busca textual acrescenta campos calculados e a API navegável
+        precisa dos dados serializados, então ambas seguem pelo serializer.
+        """
+        return (
+            self.get_serializer_class() is SupplementSerializer
+            and getattr(self.request.accepted_renderer, 'format', None) == 'json'
+        )
+    
+    def list_rows(self, request):
+        """
+        Lista os suplementos a partir de `.values()`, sem instanciar modelos.
+        
+        Filtros, ordenação e paginação são respondidos pelo modelo de
+        leitura em memória, e apenas as linhas da página são lidas do banco.
+        O JSON de cada suplemento fica em cache até a próxima alteração
+        dele ou da sua categoria; apenas as linhas novas são serializadas.
+        """
+        renderer = SupplementRowRenderer(request)
+        ids = CatalogReadModel.get_instance().list_ids(
+            request.query_params, tuple(Supplement._meta.ordering)
+        )
+        if ids is None:
+            queryset = self.filter_queryset(self.get_queryset()).values(
+                *SupplementRowRenderer.VALUE_FIELDS
+            )
+            page = self.paginate_queryset(queryset)
+            rows = list(queryset) if page is None else page
+        else:
+            page = self.paginate_queryset(ids)
+            page_ids = ids if page is None else list(page)
+            rows_by_id = {
+                row['id']: row
+                for row in Supplement.objects.filter(id__in=page_ids).values(
+                    *SupplementRowRenderer.VALUE_FIELDS
+                )
+            }
+            # Suplementos removidos depois da última atualização da cópia são ignorados
+            rows = [rows_by_id[pk] for pk in page_ids if pk in rows_by_id]
+        
+        if page is None:
+            body = b'[' + b','.join(renderer.render_rows(rows)) + b']'
+        else:
+            envelope = self.paginator.get_paginated_response([]).data
+            envelope.pop('results')
+            body = renderer.render_page(envelope, rows)
+        return HttpResponse(body, content_type='application/json')
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request, *args, **kwargs):
+        """
+        Sugere suplementos pelo início de uma palavra do nome ou da marca.
+        
+        Parâmetros: `q` (texto digitado) e `limit`. Os resultados vêm do
+        índice em memória, dos mais aos menos resgatados.
+        """
+        index = SupplementAutocompleteIndex
+        try:
+            limit = int(request.query_params.get('limit', index.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'error': 'limit deve ser um número inteiro.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(max(limit, 1), index.MAX_LIMIT)
+        
+        results = index.get_instance().search(request.query_params.get('q', ''), limit)
+        return Response({'results': results})
+    
+    @action(detail=False, methods=['get'])
+    def snapshot(self, request, *args, **kwargs):
+        """
+        Baixa o catálogo completo em NDJSON compactado (`compress=gzip|zstd`).
+        
+        O arquivo é gerado uma vez por versão do catálogo e enviado pronto
+        nas demais requisições; com `If-None-Match` igual à versão atual a
+        resposta é 304, sem corpo.
+        """
+        codec = request.query_params.get('compress', CatalogSnapshotService.GZIP)
+        try:
+            path, version = CatalogSnapshotService.get_snapshot(codec)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        etag = f'"{version}-{codec}"'
+        client_etags = [
+            tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))
+        ]
+        if '*' in client_etags or etag in client_etags:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+        
+        filename = os.path.basename(path)
+        content_type = CatalogSnapshotService.CONTENT_TYPES[codec]
+        accel_prefix = getattr(settings, 'CATALOG_SNAPSHOT_ACCEL_PREFIX', '')
+        if accel_prefix:
+            # O proxy envia o arquivo; a aplicação devolve apenas os cabeçalhos
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        else:
+            try:
+                snapshot_file = open(path, 'rb')
+            except FileNotFoundError:
+                # Substituído por uma versão mais nova entre a consulta e a abertura
+                path, version = CatalogSnapshotService.get_snapshot(codec)
+                etag = f'"{version}-{codec}"'
+                filename = os.path.basename(path)
+                snapshot_file = open(path, 'rb')
+            # FileResponse usa o `wsgi.file_wrapper` (sendfile) quando disponível
+            response = FileResponse(
+                snapshot_file, as_attachment=True, filename=filename, content_type=content_type
+            )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request, *args, **kwargs):
+        """
+        Retorna as alterações do catálogo desde o cursor `since`.
+        
+        Sem `since` retorna o catálogo completo, em páginas de `limit`
+        linhas por fluxo. A resposta traz categorias e suplementos criados
+        ou alterados, os IDs removidos e o cursor da próxima chamada;
+        enquanto `has_more` for verdadeiro há alterações pendentes.
+        """
+        try:
+            limit = int(request.query_params.get('limit', CatalogSyncService.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'error': 'limit deve ser um número inteiro.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(max(limit, 1), CatalogSyncService.MAX_LIMIT)
+        
+        since = request.query_params.get('since')
+        if since:
+            positions = CatalogSyncService.decode(since)
+            if CatalogSyncService.is_expired(positions):
+                return Response({
+                    'error': 'Cursor expirado. Sincronize o catálogo completo novamente.'
+                }, status=status.HTTP_410_GONE)
+        else:
+            positions = CatalogSyncService.initial_positions()
+        
+        changes = CatalogSyncService.get_changes(positions, limit)
+        context = self.get_serializer_context()
+        return Response({
+            'categories': SupplementCategorySerializer(changes['categories'], many=True, context=context).data,
+            'supplements': SupplementSerializer(changes['supplements'], many=True, context=context).data,
+            'deleted': changes['deleted'],
+            'next': CatalogSyncService.encode(changes['positions']),
+            'has_more': changes['has_more'],
+        })
+    
+    @action(detail=False, methods=['get'])
+    def recommended(self, request, *args, **kwargs):
+        """
+        Recomenda suplementos pelo objetivo do perfil e pelo plano do usuário.
+        
+        O objetivo pode ser informado em `goal`; sem ele, vem de
+        `UserProfile.fitness_goal` (ou do IMC, se não houver objetivo).
+        As listas são pré-calculadas e `limit` define quantos itens retornar.
+        """
+        service = SupplementRecommendationService
+        goal = request.query_params.get('goal')
+        if goal is None:
+            profile = UserProfile.objects.filter(user=request.user).values(
+                'fitness_goal', 'height', 'weight'
+            ).first() or {}
+            goal = service.resolve_goal(
+                profile.get('fitness_goal'), profile.get('height'), profile.get('weight')
+            )
+        elif goal not in service.GOAL_PROFILES:
+            return Response({
+                'error': f'Objetivo inválido. Opções: {", ".join(service.GOAL_PROFILES)}.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), service.TOP_N)
+        except ValueError:
+            return Response({'error': 'limit deve ser um número inteiro.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        tier = service.resolve_tier(request.user)
+        supplement_ids = service.get_recommendations(goal, tier)
+        # As listas podem ser anteriores à última alteração do catálogo
+        rows_by_id = {
+            row['id']: row
+            for row in Supplement.objects.filter(id__in=supplement_ids, available=True).values(
+                *SupplementRowRenderer.VALUE_FIELDS
+            )
+        }
+        rows = [rows_by_id[pk] for pk in supplement_ids if pk in rows_by_id][:limit]
+        
+        body = SupplementRowRenderer(request).render_page({
+            'goal': goal,
+            'goal_label': service.GOAL_LABELS[goal],
+            'tier': tier,
+        }, rows)
+        return HttpResponse(body, content_type='application/json')
+    
+    @action(detail=True, methods=['get'])
+    def stores(self, request, pk=None, *args, **kwargs):
+        """
+        Lojas aprovadas próximas ao usuário com o suplemento em estoque.
+        
+        Parâmetros: `lat`, `lng` e `radius_km` (padrão de 10 km).
+        """
+        query = PickupStoresQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        radius_km = min(
+            query.validated_data.get('radius_km', StoreInventoryService.DEFAULT_RADIUS_KM),
+            StoreInventoryService.MAX_RADIUS_KM
+        )
+        
+        supplement = self.get_object()
+        stores = StoreInventoryService.find_pickup_stores(
+            supplement.pk,
+            query.validated_data['lat'],
+            query.validated_data['lng'],
+            radius_km
+        )
+        return Response({'supplement': supplement.pk, 'radius_km': radius_km, 'results': stores})
+    
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk-update',
+        parser_classes=[JSONParser, CSVParser],
+        permission_classes=[permissions.IsAdminUser]
+    )
+    def bulk_update(self, request, *args, **kwargs):
+        """
+        Atualiza preço e disponibilidade de vários suplementos de uma vez.
+        
+        Aceita JSON (lista ou `{"items": [...]}`) ou CSV (`text/csv`) com as
+        colunas `id`, `price` e `available`. Apenas as linhas que mudaram
+        são gravadas, e as alterações de preço entram no histórico.
+        """
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({
+                'error': 'Envie uma lista de itens com id, price e/ou available.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = SupplementBulkUpdateItemSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            errors = {
+                index: error for index, error in enumerate(serializer.errors) if error
+            }
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = SupplementBulkUpdateService.apply(serializer.validated_data, user=request.user)
+        return Response(result)
+    
+    @action(
+        detail=True,
+        methods=['post'],
+        url_path='image',
+        parser_classes=[MultiPartParser],
+        permission_classes=[permissions.IsAdminUser]
+    )
+    def upload_image(self, request, pk=None, *args, **kwargs):
+        """
+        Recebe a imagem do suplemento (campo `image`) em streaming.
+        
+        O arquivo é gravado em disco em pedaços, com hash incremental e
+        limite de tamanho; a imagem é validada pelo cabeçalho e imagens
+        idênticas são armazenadas uma única vez.
+        """
+        # Deve ser definido antes de qualquer leitura do corpo da requisição
+        handler = StreamingHashUploadHandler(request._request)
+        request._request.upload_handlers = [handler]
+        
+        supplement = self.get_object()
+        uploaded = request.FILES.get('image')
+        if uploaded is None:
+            error = handler.rejected.get('image', 'Envie a imagem no campo "image".')
+            code = (
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE if 'image' in handler.rejected
+                else status.HTTP_400_BAD_REQUEST
+            )
+            return Response({'error': error}, status=code)
+        
+        try:
+            supplement = SupplementImageService.replace_image(supplement, uploaded)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            uploaded.close()
+        
+        return Response(self.get_serializer(supplement).data)
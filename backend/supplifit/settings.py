@@ -91,6 +91,26 @@ DATABASES = {
     }
 }
 
+# Cache
+# Com REDIS_URL definido o cache passa a ser compartilhado entre os workers,
+# o que propaga invalidações (ex.: catálogo de planos) entre processos.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -129,6 +149,24 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'mediafiles')
 
+# Processos usados para gerar as variantes de imagem dos suplementos
+SUPPLEMENT_IMAGE_WORKERS = int(os.getenv('SUPPLEMENT_IMAGE_WORKERS', '2'))
+
+# Limites do upload em streaming das imagens de suplementos
+SUPPLEMENT_IMAGE_MAX_UPLOAD_SIZE = int(os.getenv('SUPPLEMENT_IMAGE_MAX_UPLOAD_SIZE', str(10 * 1024 * 1024)))
+SUPPLEMENT_IMAGE_MAX_PIXELS = int(os.getenv('SUPPLEMENT_IMAGE_MAX_PIXELS', '40000000'))
+
+# Segundos entre as verificações de alterações do catálogo em memória
+SUPPLEMENT_CATALOG_REFRESH_INTERVAL = float(os.getenv('SUPPLEMENT_CATALOG_REFRESH_INTERVAL', '5'))
+
+# Tamanho das listas pré-calculadas de suplementos recomendados por objetivo
+SUPPLEMENT_RECOMMENDATION_SIZE = int(os.getenv('SUPPLEMENT_RECOMMENDATION_SIZE', '20'))
+
+# Diretório dos snapshots do catálogo e, atrás de um nginx, o prefixo interno
+# (location `internal`) que aponta para ele, para servir via X-Accel-Redirect
+CATALOG_SNAPSHOT_DIR = os.getenv('CATALOG_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'catalog_snapshots'))
+CATALOG_SNAPSHOT_ACCEL_PREFIX = os.getenv('CATALOG_SNAPSHOT_ACCEL_PREFIX', '')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -153,6 +191,15 @@ REST_FRAMEWORK = {
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.NamespaceVersioning',
 }
 
+# Tamanho máximo de página aceito pela paginação por cursor (core.pagination)
+KEYSET_PAGINATION_MAX_PAGE_SIZE = int(os.getenv('KEYSET_PAGINATION_MAX_PAGE_SIZE', '500'))
+
+# Segundos até o resumo do painel administrativo ser recalculado (core.dashboard)
+ADMIN_DASHBOARD_CACHE_TTL = int(os.getenv('ADMIN_DASHBOARD_CACHE_TTL', '60'))
+
+# Segundos até o painel do proprietário de lojas ser recalculado (partner_stores)
+OWNER_DASHBOARD_CACHE_TTL = int(os.getenv('OWNER_DASHBOARD_CACHE_TTL', '300'))
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from core.dashboard import AdminDashboardView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -21,6 +22,8 @@ urlpatterns = [
         path('users/', include('users.urls')),
         path('subscription/', include('subscription_plans.urls')),
         path('supplements/', include('supplements.urls')),
+        path('partner-stores/', include('partner_stores.urls')),
+        path('dashboard/', AdminDashboardView.as_view(), name='admin-dashboard'),
         # Outros apps serão adicionados aqui
     ])),
 ]
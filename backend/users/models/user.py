@@ -33,6 +33,9 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'Usuário'
         verbose_name_plural = 'Usuários'
+        indexes = [
+            models.Index(fields=['-date_joined', 'id'], name='user_date_joined_id_idx'),
+        ]
 
 
 class UserProfile(models.Model):
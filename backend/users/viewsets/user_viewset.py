@@ -3,10 +3,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
 
+from core.pagination import KeysetPagination
 from users.models import User
 from users.serializers import UserSerializer
 
 
+class UserPagination(KeysetPagination):
+    """
+    Paginação por cursor na ordenação `-date_joined, id`.
+    """
+    
+    ordering_field = 'date_joined'
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de usuários.
@@ -17,6 +26,7 @@ class UserViewSet(viewsets.ModelViewSet):
     
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserPagination
     
     def get_permissions(self):
         """